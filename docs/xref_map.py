@@ -10,6 +10,8 @@ xref_map = {
 'Alignment': ('class', 'menpo.transform.base.alignment.Alignment'),
 'AlignmentAffine': ('class', 'menpo.transform.homogeneous.affine.AlignmentAffine'),
 'AlignmentSimilarity': ('class', 'menpo.transform.homogeneous.similarity.AlignmentSimilarity'),
+'batch_procrustes_alignment': ('function', 'menpo.transform.homogeneous.similarity.batch_procrustes_alignment'),
+'BatchGeneralizedProcrustesAnalysis': ('class', 'menpo.transform.groupalign.procrustes.BatchGeneralizedProcrustesAnalysis'),
 'BooleanImage': ('class', 'menpo.image.boolean.BooleanImage'),
 'CLM': ('class', 'menpo.fitmultilevel.clm.builder.CLM'),
 'circle_fit': ('function', 'menpo.math.circlefit.circle_fit'),
@@ -24,14 +26,19 @@ xref_map = {
 'from_vector': ('function', 'menpo.base.Vectorizable.from_vector'),
 'Fitter': ('class', 'menpo.fit.Fitter'),
 'FittingResult': ('class', 'menpo.fit.fittingresult.FittingResult'),
+'GeneralizedProcrustesAnalysis': ('class', 'menpo.transform.groupalign.procrustes.GeneralizedProcrustesAnalysis'),
 'GlobalPDM': ('class', 'menpo.model.modelinstance.GlobalPDM'),
 'GradientDescent': ('class', 'menpo.fit.gradientdescent.base.GradientDescent'),
 'Homogeneous': ('class', 'menpo.transform.homogeneous.Homogeneous'),
 'HomogFamilyAlignment': ('class', 'menpo.transform.homogeneous.HomogFamilyAlignment'),
+'incremental_principal_component_decomposition': ('function', 'menpo.math.decomposition.incremental_principal_component_decomposition'),
 'Image': ('class', 'menpo.image.base.Image'),
+'import_images': ('function', 'menpo.io.input.base.import_images'),
+'import_lazy_images': ('function', 'menpo.io.input.base.import_lazy_images'),
 'ImageBoundaryError': ('class', 'menpo.image.base.ImageBoundaryError'),
 'ImageFeatures': ('class', 'menpo.image.feature.base.ImageFeatures'),
 'Invertible': ('class', 'menpo.transform.base.invertible.Invertible'),
+'LazyImageList': ('class', 'menpo.io.input.lazy.LazyImageList'),
 'Landmarkable': ('class', 'menpo.landmark.base.Landmarkable'),
 'LandmarkGroup': ('class', 'menpo.landmark.base.LandmarkGroup'),
 'LandmarkManager': ('class', 'menpo.landmark.base.LandmarkManager'),
@@ -46,9 +53,12 @@ xref_map = {
 'PDM': ('class', 'menpo.model.modelinstance.PDM'),
 'PointCloud': ('class', 'menpo.shape.pointcloud.PointCloud'),
 'principal_component_decomposition': ('function', 'menpo.math.decomposition.principal_component_decomposition'),
+'randomized_principal_component_decomposition': ('function', 'menpo.math.decomposition.randomized_principal_component_decomposition'),
+'rasterize_triangles': ('function', 'menpo.image.rasterize.rasterize_triangles'),
 'Shape': ('class', 'menpo.shape.base.Shape'),
 'Similarity': ('class', 'menpo.transform.homogeneous.similarity.Similarity'),
 'Targetable': ('class', 'menpo.base.Targetable'),
+'TemplatePWA': ('class', 'menpo.transform.piecewiseaffine.base.TemplatePWA'),
 'Transform': ('class', 'menpo.transform.base.Transform'),
 'Translation': ('class', 'menpo.transform.homogeneous.translation.Translation'),
 'TransformChain': ('class', 'menpo.transform.base.composable.TransformChain'),
@@ -58,5 +68,6 @@ xref_map = {
 'view': ('function', 'menpo.visualize.base.Viewable.view'),
 'Viewable': ('class', 'menpo.visualize.base.Viewable'),
 'VComposable': ('class', 'menpo.transform.base.composable.VComposable'),
-'VInvertible': ('class', 'menpo.transform.base.invertible.VInvertible')
+'VInvertible': ('class', 'menpo.transform.base.invertible.VInvertible'),
+'WarpPlan': ('class', 'menpo.image.warp.WarpPlan')
 }
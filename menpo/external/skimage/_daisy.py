@@ -92,6 +92,130 @@ def _daisy(img, step=4, radius=15, rings=3, histograms=8, orientations=8,
            Transactions on 32.5 (2010): 815-830.
     .. [2] http://cvlab.epfl.ch/alumni/tola/daisy.html
     '''
+    hist = _orientation_histograms(img, orientations)
+
+    # Smooth orientation histograms for the centre and all rings.
+    sigmas = [sigmas[0]] + sigmas
+    hist_smooth = np.empty((rings + 1,) + hist.shape, dtype=float)
+    for i in range(rings + 1):
+        for j in range(orientations):
+            hist_smooth[i, j, :, :] = gaussian_filter(hist[j, :, :],
+                                                      sigma=sigmas[i])
+
+    # Assemble descriptor grid.
+    theta = [2 * pi * j / histograms for j in range(histograms)]
+    desc_dims = (rings * histograms + 1) * orientations
+    descs = np.empty((desc_dims, img.shape[0] - 2 * radius,
+                      img.shape[1] - 2 * radius))
+    descs[:orientations, :, :] = hist_smooth[0, :, radius:-radius,
+                                             radius:-radius]
+    idx = orientations
+    for i in range(rings):
+        for j in range(histograms):
+            y_min = radius + int(round(ring_radii[i] * sin(theta[j])))
+            y_max = descs.shape[1] + y_min
+            x_min = radius + int(round(ring_radii[i] * cos(theta[j])))
+            x_max = descs.shape[2] + x_min
+            descs[idx:idx + orientations, :, :] = hist_smooth[i + 1, :,
+                                                              y_min:y_max,
+                                                              x_min:x_max]
+            idx += orientations
+    descs = descs[:, ::step, ::step]
+    descs = descs.swapaxes(0, 1).swapaxes(1, 2)
+
+    _normalize_descriptors(descs, normalization, orientations)
+
+    # Change axes so that the channels go to the final axis
+    descs = np.ascontiguousarray(descs)
+
+    return descs
+
+
+def _daisy_at_points(img, points, radius=15, rings=3, histograms=8,
+                     orientations=8, normalization='l1', sigmas=None,
+                     ring_radii=None):
+    '''Extract DAISY feature descriptors at the given pixels only.
+
+    The descriptor of each pixel is equal (up to floating point rounding) to
+    the one that ``_daisy`` computes for it, but the Gaussian smoothing is
+    only evaluated at the pixels that the descriptors sample, and the
+    orientation histograms only in the part of the image they depend on.
+
+    Parameters
+    ----------
+    img : (M, N, C) array
+        Input image.
+    points : (P, 2) array of int
+        The (row, column) pixels to compute the descriptors at. Each must be
+        at least ``radius`` pixels away from the boundary of the image.
+    radius, rings, histograms, orientations, normalization, sigmas, ring_radii
+        As for ``_daisy`` (``sigmas`` and ``ring_radii`` must be given).
+
+    Returns
+    -------
+    descs : (P, R) array
+        The descriptor of each pixel, where
+            ``R = (rings * histograms + 1) * orientations``
+    '''
+    points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+    sigmas = [sigmas[0]] + sigmas
+    theta = [2 * pi * j / histograms for j in range(histograms)]
+    desc_dims = (rings * histograms + 1) * orientations
+    descs = np.empty((points.shape[0], desc_dims))
+    if points.shape[0] == 0:
+        return descs
+
+    # The offsets (from the descriptor centre) at which each ring is sampled
+    offsets = [np.zeros((1, 2), dtype=np.int64)]
+    for i in range(rings):
+        offsets.append(np.array(
+            [[int(round(ring_radii[i] * sin(t))),
+              int(round(ring_radii[i] * cos(t)))] for t in theta],
+            dtype=np.int64))
+    # The 1D Gaussian kernels of gaussian_filter (with its default truncation
+    # of 4 standard deviations)
+    kernels = []
+    for s in sigmas:
+        half = int(4.0 * s + 0.5)
+        kernel = exp(-0.5 * np.arange(-half, half + 1) ** 2 / float(s * s))
+        kernels.append(kernel / kernel.sum())
+
+    # The histograms are only computed in the part of the image the
+    # descriptors depend on (one more pixel so that the gradients at its
+    # boundary are not one sided)
+    reach = radius + max(len(k) // 2 for k in kernels) + 1
+    top, left = np.maximum(points.min(axis=0) - reach, 0)
+    bottom, right = np.minimum(points.max(axis=0) + reach + 1, img.shape[:2])
+    hist = _orientation_histograms(img[top:bottom, left:right], orientations)
+
+    def reflect(index, size):
+        # the 'reflect' boundary mode of gaussian_filter
+        index = np.mod(index, 2 * size)
+        return np.where(index >= size, 2 * size - index - 1, index)
+
+    for p, (y, x) in enumerate(points):
+        idx = 0
+        for offset, kernel in zip(offsets, kernels):
+            half = len(kernel) // 2
+            support = np.arange(-half, half + 1)
+            rows = reflect(y + offset[:, :1] + support, img.shape[0]) - top
+            cols = reflect(x + offset[:, 1:] + support, img.shape[1]) - left
+            # (orientations, samples, kernel rows, kernel columns)
+            window = hist[:, rows[:, :, None], cols[:, None, :]]
+            smooth = np.einsum('osab,a,b->so', window, kernel, kernel)
+            descs[p, idx:idx + smooth.size] = smooth.ravel()
+            idx += smooth.size
+
+    _normalize_descriptors(descs, normalization, orientations)
+    return descs
+
+
+def _orientation_histograms(img, orientations):
+    r"""
+    The contribution of the gradient of each pixel of a (M, N, C) image to
+    each orientation, as a (orientations, M, N) array. The gradient of each
+    pixel is the one with the highest magnitude over the channels.
+    """
     # Compute image derivatives.
     # Get number of input image's channels
     n_channels = img.shape[-1]
@@ -122,50 +246,21 @@ def _daisy(img, step=4, radius=15, rings=3, histograms=8, orientations=8,
         hist[i, :, :] = exp(orientation_kappa * cos(grad_ori - o))
         # Weigh bin contribution by the gradient magnitude
         hist[i, :, :] = np.multiply(hist[i, :, :], grad_mag)
+    return hist
 
-    # Smooth orientation histograms for the centre and all rings.
-    sigmas = [sigmas[0]] + sigmas
-    hist_smooth = np.empty((rings + 1,) + hist.shape, dtype=float)
-    for i in range(rings + 1):
-        for j in range(orientations):
-            hist_smooth[i, j, :, :] = gaussian_filter(hist[j, :, :],
-                                                      sigma=sigmas[i])
 
-    # Assemble descriptor grid.
-    theta = [2 * pi * j / histograms for j in range(histograms)]
-    desc_dims = (rings * histograms + 1) * orientations
-    descs = np.empty((desc_dims, img.shape[0] - 2 * radius,
-                      img.shape[1] - 2 * radius))
-    descs[:orientations, :, :] = hist_smooth[0, :, radius:-radius,
-                                             radius:-radius]
-    idx = orientations
-    for i in range(rings):
-        for j in range(histograms):
-            y_min = radius + int(round(ring_radii[i] * sin(theta[j])))
-            y_max = descs.shape[1] + y_min
-            x_min = radius + int(round(ring_radii[i] * cos(theta[j])))
-            x_max = descs.shape[2] + x_min
-            descs[idx:idx + orientations, :, :] = hist_smooth[i + 1, :,
-                                                              y_min:y_max,
-                                                              x_min:x_max]
-            idx += orientations
-    descs = descs[:, ::step, ::step]
-    descs = descs.swapaxes(0, 1).swapaxes(1, 2)
-
-    # Normalize descriptors.
+def _normalize_descriptors(descs, normalization, orientations):
+    r"""
+    Normalize (in place) descriptors that lie along the last axis of descs.
+    """
     if normalization != 'off':
         descs += 1e-10
         if normalization == 'l1':
-            descs /= np.sum(descs, axis=2)[:, :, np.newaxis]
+            descs /= np.sum(descs, axis=-1)[..., np.newaxis]
         elif normalization == 'l2':
-            descs /= sqrt(np.sum(descs ** 2, axis=2))[:, :, np.newaxis]
+            descs /= sqrt(np.sum(descs ** 2, axis=-1))[..., np.newaxis]
         elif normalization == 'daisy':
-            for i in range(0, desc_dims, orientations):
-                norms = sqrt(np.sum(descs[:, :, i:i + orientations] ** 2,
-                                    axis=2))
-                descs[:, :, i:i + orientations] /= norms[:, :, np.newaxis]
-
-    # Change axes so that the channels go to the final axis
-    descs = np.ascontiguousarray(descs)
-
-    return descs
+            for i in range(0, descs.shape[-1], orientations):
+                norms = sqrt(np.sum(descs[..., i:i + orientations] ** 2,
+                                    axis=-1))
+                descs[..., i:i + orientations] /= norms[..., np.newaxis]
@@ -5,10 +5,14 @@
 import numpy as np
 
 cimport numpy as cnp
+from libc.math cimport ceil, floor
 from .interpolation cimport (nearest_neighbour_interpolation,
                              bilinear_interpolation,
                              biquadratic_interpolation,
-                             bicubic_interpolation)
+                             bicubic_interpolation,
+                             quadratic_interpolation,
+                             cubic_interpolation,
+                             pixel_offset3d, round)
 
 
 cdef inline void _matrix_transform(double x, double y, double* H, double *x_,
@@ -121,3 +125,333 @@ def _warp_fast(cnp.ndarray image, cnp.ndarray H, output_shape=None,
 
     return np.asarray(out)
 
+
+
+cdef inline double _pixel_value(double* image, Py_ssize_t offset,
+                                Py_ssize_t d, double cval):
+    if offset < 0:
+        return cval
+    return image[offset + d]
+
+
+cdef inline void _nearest_neighbour_channels(double* image, Py_ssize_t rows,
+                                             Py_ssize_t cols, Py_ssize_t dims,
+                                             double r, double c, char mode,
+                                             double cval, double* out):
+    """Nearest neighbour interpolation of every channel at a given position.
+
+    Parameters
+    ----------
+    image : double array
+        Input (rows, cols, dims) C-ordered image.
+    rows, cols, dims : int
+        Shape of image.
+    r, c : double
+        Position at which to interpolate.
+    mode : {'C', 'W', 'R', 'N'}
+        Wrapping mode. Constant, Wrap, Reflect or Nearest.
+    cval : double
+        Constant value to use for constant mode.
+    out : double array
+        The (dims,) interpolated values are written here.
+
+    """
+    cdef Py_ssize_t d
+    cdef Py_ssize_t offset = pixel_offset3d(rows, cols, dims, round(r),
+                                            round(c), mode)
+    for d in range(dims):
+        out[d] = _pixel_value(image, offset, d, cval)
+
+
+cdef inline void _bilinear_channels(double* image, Py_ssize_t rows,
+                                    Py_ssize_t cols, Py_ssize_t dims,
+                                    double r, double c, char mode,
+                                    double cval, double* out):
+    """Bilinear interpolation of every channel at a given position. See
+    :func:`_nearest_neighbour_channels` for the parameters.
+    """
+    cdef double dr, dc, top, bottom
+    cdef Py_ssize_t minr, minc, maxr, maxc, d
+    cdef Py_ssize_t o_tl, o_tr, o_bl, o_br
+
+    minr = <Py_ssize_t>floor(r)
+    minc = <Py_ssize_t>floor(c)
+    maxr = <Py_ssize_t>ceil(r)
+    maxc = <Py_ssize_t>ceil(c)
+    dr = r - minr
+    dc = c - minc
+    # resolve the stencil once, then reuse it across all channels
+    o_tl = pixel_offset3d(rows, cols, dims, minr, minc, mode)
+    o_tr = pixel_offset3d(rows, cols, dims, minr, maxc, mode)
+    o_bl = pixel_offset3d(rows, cols, dims, maxr, minc, mode)
+    o_br = pixel_offset3d(rows, cols, dims, maxr, maxc, mode)
+    for d in range(dims):
+        top = (1 - dc) * _pixel_value(image, o_tl, d, cval) \
+              + dc * _pixel_value(image, o_tr, d, cval)
+        bottom = (1 - dc) * _pixel_value(image, o_bl, d, cval) \
+                 + dc * _pixel_value(image, o_br, d, cval)
+        out[d] = (1 - dr) * top + dr * bottom
+
+
+cdef inline void _biquadratic_channels(double* image, Py_ssize_t rows,
+                                       Py_ssize_t cols, Py_ssize_t dims,
+                                       double r, double c, char mode,
+                                       double cval, double* out):
+    """Biquadratic interpolation of every channel at a given position. See
+    :func:`_nearest_neighbour_channels` for the parameters.
+    """
+    cdef Py_ssize_t r0 = round(r)
+    cdef Py_ssize_t c0 = round(c)
+    if r < 0:
+        r0 -= 1
+    if c < 0:
+        c0 -= 1
+    # scale position to range [-1, 1]
+    cdef double xr = (r - r0) - 1
+    cdef double xc = (c - c0) - 1
+    if r == r0:
+        xr += 1
+    if c == c0:
+        xc += 1
+
+    cdef Py_ssize_t offsets[9]
+    cdef double fc[3]
+    cdef double fr[3]
+    cdef Py_ssize_t pr, pc, d
+
+    for pr in range(3):
+        for pc in range(3):
+            offsets[pr * 3 + pc] = pixel_offset3d(rows, cols, dims, r0 + pr,
+                                                  c0 + pc, mode)
+    for d in range(dims):
+        for pr in range(3):
+            for pc in range(3):
+                fc[pc] = _pixel_value(image, offsets[pr * 3 + pc], d, cval)
+            fr[pr] = quadratic_interpolation(xc, fc)
+        out[d] = quadratic_interpolation(xr, fr)
+
+
+cdef inline void _bicubic_channels(double* image, Py_ssize_t rows,
+                                   Py_ssize_t cols, Py_ssize_t dims,
+                                   double r, double c, char mode,
+                                   double cval, double* out):
+    """Bicubic interpolation of every channel at a given position. See
+    :func:`_nearest_neighbour_channels` for the parameters.
+    """
+    cdef Py_ssize_t r0 = <Py_ssize_t>r - 1
+    cdef Py_ssize_t c0 = <Py_ssize_t>c - 1
+    if r < 0:
+        r0 -= 1
+    if c < 0:
+        c0 -= 1
+    # scale position to range [0, 1]
+    cdef double xr = (r - r0) / 3
+    cdef double xc = (c - c0) / 3
+
+    cdef Py_ssize_t offsets[16]
+    cdef double fc[4]
+    cdef double fr[4]
+    cdef Py_ssize_t pr, pc, d
+
+    for pr in range(4):
+        for pc in range(4):
+            offsets[pr * 4 + pc] = pixel_offset3d(rows, cols, dims, r0 + pr,
+                                                  c0 + pc, mode)
+    for d in range(dims):
+        for pr in range(4):
+            for pc in range(4):
+                fc[pc] = _pixel_value(image, offsets[pr * 4 + pc], d, cval)
+            fr[pr] = cubic_interpolation(xc, fc)
+        out[d] = cubic_interpolation(xr, fr)
+
+
+def _warp_fast_multichannel(cnp.ndarray image, cnp.ndarray H,
+                            output_shape=None, int order=1, mode='constant',
+                            double cval=0, cnp.ndarray out=None):
+    """Projective transformation (homography) of a multi-channel image.
+
+    Behaves exactly as :func:`_warp_fast` applied to each channel in turn,
+    but each source coordinate is computed only once and all channels are
+    interpolated from it in a single pass.
+
+    Parameters
+    ----------
+    image : 3-D array
+        Input image of shape ``(rows, cols, n_channels)``.
+    H : array of shape ``(3, 3)``
+        Transformation matrix H that defines the homography.
+    output_shape : tuple (rows, cols), optional
+        Shape of the output image generated (default None).
+    order : {0, 1, 2, 3}, optional
+        Order of interpolation::
+        * 0: Nearest-neighbor
+        * 1: Bi-linear (default)
+        * 2: Bi-quadratic
+        * 3: Bi-cubic
+    mode : {'constant', 'reflect', 'wrap', 'nearest'}, optional
+        How to handle values outside the image borders (default is constant).
+    cval : string, optional (default 0)
+        Used in conjunction with mode 'C' (constant), the value
+        outside the image boundaries.
+    out : array of shape ``output_shape + (n_channels,)``, optional
+        C-contiguous double buffer that the result is written into. If not
+        provided, a new array is allocated.
+
+    Returns
+    -------
+    out : array of shape ``output_shape + (n_channels,)``
+        The warped image.
+
+    """
+    cdef double[:, :, ::1] img = np.ascontiguousarray(image, dtype=np.double)
+    cdef double[:, ::1] M = np.ascontiguousarray(H)
+
+    if mode not in ('constant', 'wrap', 'reflect', 'nearest'):
+        raise ValueError("Invalid mode specified.  Please use "
+                         "`constant`, `nearest`, `wrap` or `reflect`.")
+    if order not in (0, 1, 2, 3):
+        raise ValueError("Invalid order specified. Order must be one of "
+                         "0, 1, 2 or 3.")
+    cdef char mode_c = ord(mode[0].upper())
+
+    cdef Py_ssize_t out_r, out_c
+    if output_shape is None:
+        out_r = int(img.shape[0])
+        out_c = int(img.shape[1])
+    else:
+        out_r = int(output_shape[0])
+        out_c = int(output_shape[1])
+
+    cdef Py_ssize_t rows = img.shape[0]
+    cdef Py_ssize_t cols = img.shape[1]
+    cdef Py_ssize_t dims = img.shape[2]
+
+    if out is None:
+        out = np.empty((out_r, out_c, dims), dtype=np.double)
+    elif (out.dtype != np.double or not out.flags.c_contiguous or
+          (<object>out).shape != (out_r, out_c, dims)):
+        raise ValueError("out must be a C-contiguous double array of "
+                         "shape {}".format((out_r, out_c, dims)))
+    cdef double[:, :, ::1] result = out
+
+    cdef Py_ssize_t tfr, tfc
+    cdef double r, c
+
+    cdef void (*interp_func)(double*, Py_ssize_t, Py_ssize_t, Py_ssize_t,
+                             double, double, char, double, double*)
+    if order == 0:
+        interp_func = _nearest_neighbour_channels
+    elif order == 1:
+        interp_func = _bilinear_channels
+    elif order == 2:
+        interp_func = _biquadratic_channels
+    else:
+        interp_func = _bicubic_channels
+
+    if dims == 0 or out_r == 0 or out_c == 0:
+        return out
+
+    for tfr in range(out_r):
+        for tfc in range(out_c):
+            _matrix_transform(tfc, tfr, &M[0, 0], &c, &r)
+            interp_func(&img[0, 0, 0], rows, cols, dims, r, c, mode_c, cval,
+                        &result[tfr, tfc, 0])
+
+    return out
+
+
+def _sample_points_multichannel(cnp.ndarray image, cnp.ndarray points,
+                                int order=1, mode='constant', double cval=0,
+                                cnp.ndarray out=None):
+    """Interpolate every channel of an image at a set of arbitrary points.
+
+    The points are in ``(row, col)`` order, as for
+    ``scipy.ndimage.map_coordinates``. For orders 0 and 1 the result
+    matches ``map_coordinates`` in the ``'constant'`` and ``'nearest'``
+    modes - in particular, in ``'constant'`` mode every point that falls
+    outside of the image bounds takes the value ``cval``. Higher orders and
+    the ``'reflect'`` and ``'wrap'`` modes use the local stencils of
+    :func:`_warp_fast` rather than spline filtering.
+
+    Parameters
+    ----------
+    image : 3-D array
+        Input image of shape ``(rows, cols, n_channels)``.
+    points : array of shape ``(n_points, 2)``
+        The points to sample.
+    order : {0, 1, 2, 3}, optional
+        Order of interpolation::
+        * 0: Nearest-neighbor
+        * 1: Bi-linear (default)
+        * 2: Bi-quadratic
+        * 3: Bi-cubic
+    mode : {'constant', 'reflect', 'wrap', 'nearest'}, optional
+        How to handle values outside the image borders (default is constant).
+    cval : string, optional (default 0)
+        Used in conjunction with mode 'C' (constant), the value
+        outside the image boundaries.
+    out : array of shape ``(n_points, n_channels)``, optional
+        C-contiguous double buffer that the result is written into. If not
+        provided, a new array is allocated.
+
+    Returns
+    -------
+    out : array of shape ``(n_points, n_channels)``
+        The sampled values.
+
+    """
+    cdef double[:, :, ::1] img = np.ascontiguousarray(image, dtype=np.double)
+    cdef double[:, ::1] pts = np.ascontiguousarray(points, dtype=np.double)
+
+    if mode not in ('constant', 'wrap', 'reflect', 'nearest'):
+        raise ValueError("Invalid mode specified.  Please use "
+                         "`constant`, `nearest`, `wrap` or `reflect`.")
+    if order not in (0, 1, 2, 3):
+        raise ValueError("Invalid order specified. Order must be one of "
+                         "0, 1, 2 or 3.")
+    if pts.shape[1] != 2:
+        raise ValueError("points must be of shape (n_points, 2)")
+    cdef char mode_c = ord(mode[0].upper())
+
+    cdef Py_ssize_t rows = img.shape[0]
+    cdef Py_ssize_t cols = img.shape[1]
+    cdef Py_ssize_t dims = img.shape[2]
+    cdef Py_ssize_t n_points = pts.shape[0]
+
+    if out is None:
+        out = np.empty((n_points, dims), dtype=np.double)
+    elif (out.dtype != np.double or not out.flags.c_contiguous or
+          (<object>out).shape != (n_points, dims)):
+        raise ValueError("out must be a C-contiguous double array of "
+                         "shape {}".format((n_points, dims)))
+    cdef double[:, ::1] result = out
+
+    cdef Py_ssize_t i, d
+    cdef double r, c
+
+    cdef void (*interp_func)(double*, Py_ssize_t, Py_ssize_t, Py_ssize_t,
+                             double, double, char, double, double*)
+    if order == 0:
+        interp_func = _nearest_neighbour_channels
+    elif order == 1:
+        interp_func = _bilinear_channels
+    elif order == 2:
+        interp_func = _biquadratic_channels
+    else:
+        interp_func = _bicubic_channels
+
+    if dims == 0 or n_points == 0:
+        return out
+
+    for i in range(n_points):
+        r = pts[i, 0]
+        c = pts[i, 1]
+        if mode_c == 'C' and (r < 0 or r > rows - 1 or c < 0 or
+                              c > cols - 1 or r != r or c != c):
+            for d in range(dims):
+                result[i, d] = cval
+        else:
+            interp_func(&img[0, 0, 0], rows, cols, dims, r, c, mode_c, cval,
+                        &result[i, 0])
+
+    return out
@@ -330,4 +330,35 @@ cdef inline Py_ssize_t coord_map(Py_ssize_t dim, Py_ssize_t coord, char mode):
         elif coord > dim:
             return dim
 
-    return coord
\ No newline at end of file
+    return coord
+
+cdef inline Py_ssize_t pixel_offset3d(Py_ssize_t rows, Py_ssize_t cols,
+                                      Py_ssize_t dims, Py_ssize_t r,
+                                      Py_ssize_t c, char mode):
+    """Get the flat offset of the first channel of a pixel in a C-ordered
+    (rows, cols, dims) image, taking wrapping mode into consideration.
+
+    Parameters
+    ----------
+    rows, cols, dims : int
+        Shape of image.
+    r, c : int
+        Position of the pixel.
+    mode : {'C', 'W', 'R', 'N'}
+        Wrapping mode. Constant, Wrap, Reflect or Nearest.
+
+    Returns
+    -------
+    offset : int
+        Offset of channel 0 of the pixel, or -1 if the pixel falls outside
+        the image and mode is constant.
+
+    """
+    if mode == 'C':
+        if (r < 0) or (r > rows - 1) or (c < 0) or (c > cols - 1):
+            return -1
+        else:
+            return (r * cols + c) * dims
+    else:
+        return (coord_map(rows, r, mode) * cols
+                + coord_map(cols, c, mode)) * dims
@@ -1,3 +1,6 @@
 from .features import gradient, hog, lbp, es, igo, no_op, gaussian_filter, daisy
+from .features import (hog_at_points, lbp_at_points, igo_at_points,
+                       daisy_at_points)
 from .predefined import sparse_hog, double_igo
 from .base import ndfeature, imgfeature
+from .cache import FeatureCache, set_feature_cache, get_feature_cache
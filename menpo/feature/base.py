@@ -3,6 +3,7 @@ import numpy as np
 import wrapt
 from menpo.image import Image, MaskedImage, BooleanImage
 from menpo.transform import Translation, NonUniformScale
+from .cache import cached_feature_call
 
 
 def lm_centres_correction(centres):
@@ -49,6 +50,45 @@ def sample_mask_for_centres(mask, centres):
     return BooleanImage(mask[centres[..., 0], centres[..., 1]], copy=False)
 
 
+def feature_pixels(image):
+    r"""
+    The pixels that a feature is computed on: the pixels of an :map:`Image`
+    as `np.float64` (normalised if their normalisation is deferred, and
+    converted if they are stored as `np.float32`), or the given `ndarray`.
+    """
+    if isinstance(image, np.ndarray):
+        return image
+    return np.require(image._float_pixels(), dtype=np.float64)
+
+
+def sample_points(centres, sample_offsets=None):
+    r"""
+    The pixels that are sampled around a set of centres, as in
+    :meth:`Image.extract_patches`.
+
+    Parameters
+    ----------
+    centres : :map:`PointCloud`
+        The centres to sample around.
+    sample_offsets : :map:`PointCloud`, optional
+        The offsets from each centre to sample at. If ``None``, only the
+        centres are sampled.
+
+    Returns
+    -------
+    points : ``(n_centres * n_offsets, 2)`` `ndarray`
+        The pixel of each sample, with the samples of each centre together.
+    n_offsets : `int`
+        The number of samples of each centre.
+    """
+    if sample_offsets is None:
+        offsets = np.zeros([1, 2], dtype=np.int64)
+    else:
+        offsets = np.require(sample_offsets.points, dtype=np.int64)
+    points = centres.points[:, None, :] + offsets[None, :, :]
+    return points.astype(np.int64).reshape(-1, 2), offsets.shape[0]
+
+
 def rebuild_feature_image(image, f_pixels):
     shape_changed = f_pixels.shape[:-1] != image.shape
     if hasattr(image, 'mask'):
@@ -91,8 +131,11 @@ def imgfeature(wrapped, instance, args, kwargs):
         if isinstance(image, np.ndarray):
             # ndarray supplied to Image feature - build a
             # temp image for it and just return the pixels
-            image = Image(image, copy=False)
-            return wrapped(image, *args, **kwargs).pixels
+            def compute(pixels, *args, **kwargs):
+                return wrapped(Image(pixels, copy=False), *args,
+                               **kwargs).pixels
+            return cached_feature_call(wrapped, image, args, kwargs,
+                                       compute=compute)
         else:
             return wrapped(image, *args, **kwargs)
     return _execute(*args, **kwargs)
@@ -104,10 +147,11 @@ def ndfeature(wrapped, instance, args, kwargs):
         if not isinstance(image, np.ndarray):
             # Image supplied to ndarray feature -
             # extract pixels and go
-            feature = wrapped(image.pixels, *args, **kwargs)
+            feature = cached_feature_call(wrapped, feature_pixels(image),
+                                          args, kwargs)
             return rebuild_feature_image(image, feature)
         else:
-            return wrapped(image, *args, **kwargs)
+            return cached_feature_call(wrapped, image, args, kwargs)
     return _execute(*args, **kwargs)
 
 
@@ -117,10 +161,11 @@ def winitfeature(wrapped, instance, args, kwargs):
         if not isinstance(image, np.ndarray):
             # Image supplied to ndarray feature -
             # extract pixels and go
-            feature, centres = wrapped(image.pixels, *args, **kwargs)
+            feature, centres = cached_feature_call(
+                wrapped, feature_pixels(image), args, kwargs)
             return rebuild_feature_image_with_centres(image, feature, centres)
         else:
             # user just supplied ndarray - give them ndarray back
-            return wrapped(image, *args, **kwargs)[0]
+            return cached_feature_call(wrapped, image, args, kwargs)[0]
 
     return _execute(*args, **kwargs)
@@ -0,0 +1,400 @@
+import hashlib
+import inspect
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from numbers import Number
+from warnings import warn
+
+import numpy as np
+
+
+# The cache that features are currently looked up in (None when disabled)
+_active_cache = None
+# The features that are computed by another feature (e.g. the gradient of
+# igo) are not cached, only the outermost feature of each thread is
+_computing = threading.local()
+
+
+def set_feature_cache(cache):
+    r"""
+    Set the cache that the features of :mod:`menpo.feature` (and any
+    function decorated with :func:`ndfeature` or :func:`winitfeature`) are
+    looked up in and stored to. Functions decorated with :func:`imgfeature`
+    are only cached when they are called with an `ndarray`, as their result
+    for an :map:`Image` may depend on more than its pixels.
+
+    Parameters
+    ----------
+    cache : :map:`FeatureCache` or ``None``
+        The cache to use. If ``None``, features are no longer cached.
+
+    Returns
+    -------
+    previous : :map:`FeatureCache` or ``None``
+        The cache that was used before.
+    """
+    global _active_cache
+    previous = _active_cache
+    _active_cache = cache
+    return previous
+
+
+def get_feature_cache():
+    r"""
+    The cache that features are currently looked up in, or ``None`` if
+    features are not cached.
+
+    Returns
+    -------
+    cache : :map:`FeatureCache` or ``None``
+        The active feature cache.
+    """
+    return _active_cache
+
+
+class FeatureCache(object):
+    r"""
+    A content-addressed cache of computed features, so that computing the
+    same feature with the same options on the same pixels again (in this or
+    a later run) returns the stored result instead.
+
+    A feature is identified by the name of its function, a hash (SHA-1) of
+    the pixels it is computed on (including their shape and data type) and
+    its options (positional options are matched to their names and missing
+    options take their default values, so all the ways of calling a feature
+    with the same options share an entry). Note that all the options are
+    part of the key, including those that do not change the result, such as
+    ``verbose``. Only options that are numbers, strings, ``None``, arrays
+    or lists, tuples and dicts of these can be hashed - a feature called
+    with any other option (e.g. a :map:`PointCloud`) is computed without
+    the cache.
+
+    The most recently used features are kept in memory, up to `max_bytes`.
+    If a `path` is given, every computed feature is also written to disk
+    under it, and features that are not in memory are memory mapped from
+    there (copy-on-write), so the disk tier persists across runs and is
+    shared by the processes that use the same path. Features are stored per
+    version of menpo, so those written by another version are never used.
+    If the features can not be written (e.g. the path is read-only), a
+    warning is raised and they are only kept in memory.
+
+    The results are never shared with the cache: in-memory features are
+    returned as copies and disk features as copy-on-write maps, so they can
+    be modified in place.
+
+    A cache is used by features once it is activated with
+    :func:`set_feature_cache`, or within a ``with`` block::
+
+        with FeatureCache(path='/data/features') as cache:
+            features = hog(image)
+
+    Parameters
+    ----------
+    max_bytes : `int`, optional
+        The maximum total size (in bytes) of the features that are kept in
+        memory. If ``0``, features are only stored on disk.
+    path : `str`, optional
+        The directory the disk tier is stored in (it is created if it does
+        not exist). If ``None``, features are only kept in memory.
+        Features are stored in a subdirectory named after the version of
+        menpo.
+
+    Attributes
+    ----------
+    memory_hits : `int`
+        The number of features that were found in memory.
+    disk_hits : `int`
+        The number of features that were found on disk.
+    misses : `int`
+        The number of features that had to be computed.
+    """
+    def __init__(self, max_bytes=256 * 2 ** 20, path=None):
+        self.max_bytes = max_bytes
+        self.path = path
+        if path is not None and not os.path.isdir(path):
+            os.makedirs(path)
+        self._memory = OrderedDict()
+        self._n_bytes = 0
+        self._lock = threading.Lock()
+        self._previous = None
+        self.reset_stats()
+
+    def __enter__(self):
+        self._previous = set_feature_cache(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        set_feature_cache(self._previous)
+        self._previous = None
+
+    @property
+    def n_bytes(self):
+        r"""
+        The total size (in bytes) of the features kept in memory.
+
+        :type: `int`
+        """
+        return self._n_bytes
+
+    @property
+    def hits(self):
+        r"""
+        The number of features that were found in memory or on disk.
+
+        :type: `int`
+        """
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self):
+        r"""
+        The fraction of the features that were looked up that were found in
+        memory or on disk (``0`` if none were looked up).
+
+        :type: `float`
+        """
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups > 0 else 0.
+
+    def reset_stats(self):
+        r"""
+        Set the hit and miss counts to zero.
+        """
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def invalidate(self, feature=None):
+        r"""
+        Remove stored features, from memory and from disk (only those
+        stored by this version of menpo).
+
+        Parameters
+        ----------
+        feature : `callable` or `str`, optional
+            The feature function (or its name) whose results are removed. If
+            ``None``, all the features are removed.
+        """
+        name = None if feature is None else _feature_name(feature)
+        with self._lock:
+            for key in list(self._memory):
+                if name is None or key[0] == name:
+                    self._n_bytes -= _nbytes(self._memory.pop(key)[1])
+        if self.path is not None:
+            version_path = self._version_path()
+            if name is None:
+                shutil.rmtree(version_path, ignore_errors=True)
+            else:
+                shutil.rmtree(os.path.join(version_path, name),
+                              ignore_errors=True)
+
+    def clear(self):
+        r"""
+        Remove all the stored features, from memory and from disk.
+        """
+        self.invalidate()
+
+    def __call__(self, feature, pixels, args, kwargs, compute=None):
+        r"""
+        The result of ``feature(pixels, *args, **kwargs)``, from the cache if
+        it has been stored and computed (and stored) otherwise. If given,
+        ``compute(pixels, *args, **kwargs)`` computes the result instead.
+        """
+        if compute is None:
+            compute = feature
+        call_hash = _hash_call(feature, pixels, args, kwargs)
+        if call_hash is None:
+            # an option that can not be hashed
+            return _compute(compute, pixels, args, kwargs)
+        key = _feature_name(feature), call_hash
+        with self._lock:
+            entry = self._memory.pop(key, None)
+            if entry is not None:
+                # mark as the most recently used
+                self._memory[key] = entry
+                self.memory_hits += 1
+        if entry is not None:
+            is_tuple, arrays = entry
+            return _result(is_tuple, [np.array(a) for a in arrays])
+
+        entry = self._load(key)
+        if entry is not None:
+            with self._lock:
+                self.disk_hits += 1
+            is_tuple, arrays = entry
+        else:
+            with self._lock:
+                self.misses += 1
+            result = _compute(compute, pixels, args, kwargs)
+            is_tuple = isinstance(result, tuple)
+            arrays = list(result) if is_tuple else [result]
+            self._save(key, (is_tuple, arrays))
+        if _nbytes(arrays) <= self.max_bytes:
+            # the caller owns the arrays it is returned, so keep copies
+            self._remember(key, (is_tuple, [np.array(a) for a in arrays]))
+        return _result(is_tuple, arrays)
+
+    def _remember(self, key, entry):
+        size = _nbytes(entry[1])
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = entry
+            self._n_bytes += size
+            while self._n_bytes > self.max_bytes:
+                # drop the least recently used
+                dropped = self._memory.popitem(last=False)[1]
+                self._n_bytes -= _nbytes(dropped[1])
+
+    def _version_path(self):
+        import menpo  # not at the top, as menpo imports this module
+        return os.path.join(self.path, 'menpo-{}'.format(menpo.__version__))
+
+    def _entry_path(self, key):
+        return os.path.join(self._version_path(), key[0], key[1])
+
+    def _load(self, key):
+        if self.path is None:
+            return None
+        entry_path = self._entry_path(key)
+        if not os.path.isdir(entry_path):
+            return None
+        filenames = sorted(f for f in os.listdir(entry_path)
+                           if f.endswith('.npy'))
+        is_tuple = not os.path.exists(os.path.join(entry_path, 'single'))
+        try:
+            # plain arrays that are views of the (copy-on-write) maps
+            arrays = [np.asarray(np.load(os.path.join(entry_path, f),
+                                         mmap_mode='c'))
+                      for f in filenames]
+        except (IOError, ValueError):
+            return None
+        return is_tuple, arrays
+
+    def _save(self, key, entry):
+        if self.path is None:
+            return
+        is_tuple, arrays = entry
+        entry_path = self._entry_path(key)
+        feature_path = os.path.dirname(entry_path)
+        if not os.path.isdir(feature_path):
+            try:
+                os.makedirs(feature_path)
+            except OSError:
+                # created by another process in the meantime (or can not be
+                # created, which mkdtemp reports below)
+                pass
+        # written to a temporary directory that is then renamed, so that
+        # other processes never see a partially written feature
+        temp_path = None
+        try:
+            temp_path = tempfile.mkdtemp(dir=feature_path)
+            for i, a in enumerate(arrays):
+                np.save(os.path.join(temp_path, '{:03d}.npy'.format(i)), a)
+            if not is_tuple:
+                open(os.path.join(temp_path, 'single'), 'w').close()
+        except (IOError, OSError) as e:
+            if temp_path is not None:
+                shutil.rmtree(temp_path, ignore_errors=True)
+            warn('The feature could not be written to the cache at {} ({}), '
+                 'so it is only kept in memory.'.format(self.path, e))
+            return
+        try:
+            os.rename(temp_path, entry_path)
+        except OSError:
+            # stored by another process in the meantime
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+
+def cached_feature_call(feature, pixels, args, kwargs, compute=None):
+    r"""
+    The result of ``feature(pixels, *args, **kwargs)`` (or of ``compute``
+    with the same arguments), looked up in the active feature cache if there
+    is one.
+    """
+    if compute is None:
+        compute = feature
+    cache = _active_cache
+    if cache is None or getattr(_computing, 'active', False):
+        return compute(pixels, *args, **kwargs)
+    return cache(feature, pixels, args, kwargs, compute=compute)
+
+
+def _compute(compute, pixels, args, kwargs):
+    # the features computed by this feature are not cached
+    _computing.active = True
+    try:
+        return compute(pixels, *args, **kwargs)
+    finally:
+        _computing.active = False
+
+
+def _result(is_tuple, arrays):
+    return tuple(arrays) if is_tuple else arrays[0]
+
+
+def _nbytes(arrays):
+    return sum(a.nbytes for a in arrays)
+
+
+def _feature_name(feature):
+    if isinstance(feature, str):
+        return feature
+    return '{}.{}'.format(feature.__module__, feature.__name__)
+
+
+def _hash_call(feature, pixels, args, kwargs):
+    r"""
+    The SHA-1 hash of the pixels and options of a call to a feature, or
+    ``None`` if an option is not of a type that can be hashed by value.
+    """
+    h = hashlib.sha1()
+    if not _hash_value(h, pixels):
+        return None
+    try:
+        options = inspect.getcallargs(feature, pixels, *args, **kwargs)
+    except TypeError:
+        # let the feature raise the error
+        options = dict(enumerate(args), **kwargs)
+    else:
+        # the pixels are the first argument
+        del options[inspect.getargspec(feature).args[0]]
+    for name in sorted(options, key=str):
+        h.update(repr(name).encode('utf-8'))
+        if not _hash_value(h, options[name]):
+            return None
+    return h.hexdigest()
+
+
+# the types that are hashed by their repr, which is the same in every run
+_REPR_HASHED_TYPES = (type(None), bool, np.bool_, Number, bytes,
+                      type(u''))
+
+
+def _hash_value(h, value):
+    r"""
+    Update the hash with a value, returning ``False`` if the value is not of
+    a type that can be hashed (e.g. an object, whose repr is its address).
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            return False
+        h.update('{}{}'.format(value.dtype.str, value.shape).encode('utf-8'))
+        h.update(np.ascontiguousarray(value).view(np.uint8).data)
+    elif isinstance(value, (list, tuple)):
+        h.update('{}{}'.format(type(value).__name__,
+                               len(value)).encode('utf-8'))
+        return all(_hash_value(h, v) for v in value)
+    elif isinstance(value, dict):
+        h.update('dict{}'.format(len(value)).encode('utf-8'))
+        return all(_hash_value(h, k) and _hash_value(h, value[k])
+                   for k in sorted(value, key=str))
+    elif isinstance(value, _REPR_HASHED_TYPES):
+        h.update('{}{!r}'.format(type(value).__name__,
+                                 value).encode('utf-8'))
+    else:
+        return False
+    return True
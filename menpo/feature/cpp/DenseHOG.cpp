@@ -0,0 +1,407 @@
+#include "DenseHOG.h"
+#include <algorithm>
+#include <climits>
+
+// Floored division and modulo, as the groups of a phase may start before the
+// first window
+static inline int floorDivide(int a, int b) {
+    return (a >= 0) ? a / b : -((-a + b - 1) / b);
+}
+
+static inline int floorModulo(int a, int b) {
+    return a - b * floorDivide(a, b);
+}
+
+static unsigned int addPiece(AxisLayout &layout, int from, int to, int border) {
+    for (unsigned int i = 0; i < layout.pieces.size(); i++)
+        if (layout.pieces[i].from == from && layout.pieces[i].to == to &&
+            layout.pieces[i].border == border)
+            return i;
+    GroupPiece piece = {from, to, border};
+    layout.pieces.push_back(piece);
+    return layout.pieces.size() - 1;
+}
+
+DenseHOG::DenseHOG(ImageWindowIterator *iterator, HOG *hog) {
+    int rowCenter, columnCenter;
+    this->iterator = iterator;
+    this->hog = hog;
+    cellSize = hog->cellHeightAndWidthInPixels;
+    if (hog->method == 1) {
+        numberOfBins = hog->numberOfOrientationBins;
+        signedGradients = hog->enableSignedGradients ? 1 : 0;
+        binsSize = (1 + (signedGradients == 1)) * pi /
+                   hog->numberOfOrientationBins;
+    }
+    else {
+        numberOfBins = 18;
+        signedGradients = 1;
+        binsSize = 0;
+    }
+
+    // Weights with which a pixel (at each position of its group) adds to the
+    // histograms of the two cells of its group, as in DalalTriggsHOGdescriptor
+    // and ZhuRamananHOGdescriptor
+    weights[0].resize(cellSize);
+    weights[1].resize(cellSize);
+    for (unsigned int x = 0; x < (unsigned int)cellSize; x++) {
+        if (hog->method == 1) {
+            float Xc = (0 + 1 - 1.5) * hog->cellHeightAndWidthInPixels + 0.5;
+            weights[0][x] = (1-((x+1-Xc)/hog->cellHeightAndWidthInPixels));
+            weights[1][x] = (((x+1-Xc)/hog->cellHeightAndWidthInPixels));
+        }
+        else {
+            double xp = ((double)(x + cellSize / 2) + 0.5) /
+                        (double)cellSize - 0.5;
+            weights[0][x] = 1.0 - xp;
+            weights[1][x] = xp;
+        }
+    }
+
+    // All the windows lie in a (padded) frame that starts at the first window
+    iterator->windowLimits(0, 0, &rowOffset, &columnOffset, &rowCenter, &columnCenter);
+    paddedHeight = (iterator->_numberOfWindowsVertically - 1) * iterator->_windowStepVertical +
+                   iterator->_windowHeight;
+    paddedWidth = (iterator->_numberOfWindowsHorizontally - 1) * iterator->_windowStepHorizontal +
+                  iterator->_windowWidth;
+    verticalLayout = axisLayout(iterator->_windowHeight);
+    horizontalLayout = axisLayout(iterator->_windowWidth);
+    verticalPhases = windowsPerPhase(verticalLayout, iterator->_numberOfWindowsVertically,
+                                     iterator->_windowStepVertical);
+    horizontalPhases = windowsPerPhase(horizontalLayout, iterator->_numberOfWindowsHorizontally,
+                                       iterator->_windowStepHorizontal);
+}
+
+DenseHOG::~DenseHOG() {
+}
+
+
+AxisLayout DenseHOG::axisLayout(unsigned int windowSize) {
+    AxisLayout layout;
+    int numberOfCells = windowSize / cellSize, group;
+    if (hog->method == 1) {
+        // Each cell of pixels adds to its own and the next histogram. The
+        // gradients of the first and last pixels of a window are computed as
+        // if the window was zero padded.
+        layout.firstGroup = 0;
+        layout.groupOrigin = 0;
+        for (group = 0; group < numberOfCells; group++) {
+            std::vector<unsigned int> pieces;
+            bool first = group == 0, last = group == numberOfCells - 1;
+            pieces.push_back(addPiece(layout, 0, 1, first ? 1 : (last && cellSize == 1 ? 2 : 0)));
+            if (cellSize > 2)
+                pieces.push_back(addPiece(layout, 1, cellSize - 1, 0));
+            if (cellSize > 1)
+                pieces.push_back(addPiece(layout, cellSize - 1, cellSize, last ? 2 : 0));
+            layout.groupPieces.push_back(pieces);
+        }
+    }
+    else {
+        // The pixels between the centres of two cells add to both their
+        // histograms. The first and last pixels of a window are skipped.
+        layout.firstGroup = -1;
+        layout.groupOrigin = cellSize / 2;
+        for (group = -1; group < numberOfCells; group++) {
+            std::vector<unsigned int> pieces;
+            int start = layout.groupOrigin + group * cellSize;
+            int from = max(0, 1 - start);
+            int to = min(cellSize, (int)windowSize - 1 - start);
+            if (from < to)
+                pieces.push_back(addPiece(layout, from, to, 0));
+            layout.groupPieces.push_back(pieces);
+        }
+    }
+    return layout;
+}
+
+
+// Splits the windows along an axis by the position of their groups modulo the
+// cell size. All the windows of a phase share the same groups.
+std::vector<std::vector<unsigned int> > DenseHOG::windowsPerPhase(const AxisLayout &layout,
+        unsigned int numberOfWindows, unsigned int windowStep) {
+    std::vector<std::vector<unsigned int> > windows(cellSize), phases;
+    for (unsigned int i = 0; i < numberOfWindows; i++)
+        windows[floorModulo(i * windowStep + layout.groupOrigin, cellSize)].push_back(i);
+    for (int phase = 0; phase < cellSize; phase++)
+        if (!windows[phase].empty())
+            phases.push_back(windows[phase]);
+    return phases;
+}
+
+
+double DenseHOG::pixel(int y, int x, unsigned int z) {
+    // windows are zero padded outside of the image
+    if (y < 0 || x < 0 || y >= (int)iterator->_imageHeight || x >= (int)iterator->_imageWidth)
+        return 0;
+    return iterator->imagePixel(y, x, z);
+}
+
+
+// The binned gradient of a pixel of the padded frame, computed exactly as
+// DalalTriggsHOGdescriptor and ZhuRamananHOGdescriptor compute it for a window
+// pixel (which may be on the first or last row/column of the window)
+void DenseHOG::gradient(int y, int x, int borderY, int borderX, PixelGradient *g) {
+    y += rowOffset;
+    x += columnOffset;
+    if (hog->method == 1) {
+        float dx, dy, gradientMagnitude = 0, tempMagnitude, gradientOrientation = 0, Oc;
+        for (unsigned int z = 0; z < iterator->_numberOfChannels; z++) {
+            if (borderX == 1)
+                dx = pixel(y, x + 1, z);
+            else if (borderX == 2)
+                dx = -pixel(y, x - 1, z);
+            else
+                dx = pixel(y, x + 1, z) - pixel(y, x - 1, z);
+            if (borderY == 1)
+                dy = -pixel(y + 1, x, z);
+            else if (borderY == 2)
+                dy = pixel(y - 1, x, z);
+            else
+                dy = -pixel(y + 1, x, z) + pixel(y - 1, x, z);
+            // choose dominant channel based on magnitude
+            tempMagnitude = sqrt(dx * dx + dy * dy);
+            if (z == 0 || tempMagnitude > gradientMagnitude) {
+                gradientMagnitude = tempMagnitude;
+                gradientOrientation = atan2(dy, dx);
+            }
+        }
+        if (gradientOrientation < 0)
+            gradientOrientation += pi + (signedGradients == 1) * pi;
+        int bin1 = (gradientOrientation / binsSize) - 1;
+        unsigned int bin2 = bin1 + 1;
+        Oc = (bin1 + 1 + 1 - 1.5) * binsSize;
+        if (bin2 == hog->numberOfOrientationBins)
+            bin2 = 0;
+        if (bin1 < 0)
+            bin1 = hog->numberOfOrientationBins - 1;
+        g->magnitude = gradientMagnitude;
+        g->weight = (gradientOrientation - Oc) / binsSize;
+        g->bin1 = bin1;
+        g->bin2 = bin2;
+    }
+    else {
+        double dy = pixel(y + 1, x, 0) - pixel(y - 1, x, 0);
+        double dx = pixel(y, x + 1, 0) - pixel(y, x - 1, 0);
+        double v = dx * dx + dy * dy;
+        for (unsigned int z = 1; z < iterator->_numberOfChannels; z++) {
+            double dy2 = pixel(y + 1, x, z) - pixel(y - 1, x, z);
+            double dx2 = pixel(y, x + 1, z) - pixel(y, x - 1, z);
+            double v2 = dx2 * dx2 + dy2 * dy2;
+            // pick channel with strongest gradient
+            if (v2 > v) {
+                v = v2;
+                dx = dx2;
+                dy = dy2;
+            }
+        }
+        g->bin1 = ZhuRamananOrientation(dx, dy);
+        g->magnitude = sqrt(v);
+    }
+}
+
+
+void DenseHOG::computeGradients(unsigned int firstRow, unsigned int rowStep) {
+    for (int y = firstRow; y < paddedHeight; y += rowStep)
+        for (int x = 0; x < paddedWidth; x++)
+            gradient(y, x, 0, 0, &gradients[y * paddedWidth + x]);
+}
+
+
+// Computes the histograms that each piece of each group in a row of groups
+// (of a phase) adds to the four cells around it
+void DenseHOG::computeGroupRow(int groupRow, int phaseY, int phaseX, int firstColumn,
+        int lastColumn, double *histograms) {
+    const std::vector<GroupPiece> &piecesY = verticalLayout.pieces;
+    const std::vector<GroupPiece> &piecesX = horizontalLayout.pieces;
+    unsigned int regionLength = 4 * numberOfBins, py, px;
+    PixelGradient temporary;
+    const PixelGradient *g;
+    int column, p, q, x, y, dy, dx;
+    double *region, *histogram;
+
+    std::fill(histograms, histograms + (lastColumn - firstColumn + 1) * piecesY.size() *
+              piecesX.size() * regionLength, 0.0);
+    for (column = firstColumn; column <= lastColumn; column++) {
+        for (py = 0; py < piecesY.size(); py++) {
+            for (px = 0; px < piecesX.size(); px++) {
+                region = histograms + (((column - firstColumn) * piecesY.size() + py) *
+                                       piecesX.size() + px) * regionLength;
+                for (p = piecesY[py].from; p < piecesY[py].to; p++) {
+                    y = phaseY + groupRow * cellSize + p;
+                    for (q = piecesX[px].from; q < piecesX[px].to; q++) {
+                        x = phaseX + column * cellSize + q;
+                        if (piecesY[py].border == 0 && piecesX[px].border == 0 &&
+                            y >= 0 && x >= 0 && y < paddedHeight && x < paddedWidth)
+                            g = &gradients[y * paddedWidth + x];
+                        else {
+                            gradient(y, x, piecesY[py].border, piecesX[px].border, &temporary);
+                            g = &temporary;
+                        }
+                        for (dy = 0; dy < 2; dy++) {
+                            for (dx = 0; dx < 2; dx++) {
+                                histogram = region + (dy * 2 + dx) * numberOfBins;
+                                if (hog->method == 1) {
+                                    float w = (float)g->magnitude * (float)weights[dx][q] *
+                                              (float)weights[dy][p];
+                                    histogram[g->bin1] += w * (1-g->weight);
+                                    histogram[g->bin2] += w * g->weight;
+                                }
+                                else
+                                    histogram[g->bin1] += weights[dx][q] * weights[dy][p] *
+                                                          g->magnitude;
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+// Computes the windows of the given phases. Each phase is split in to
+// numberOfChunks chunks of rows of windows, which are numbered in order
+// (phase * numberOfChunks + chunk) and computed from firstChunk in steps of
+// chunkStep.
+void DenseHOG::applyToPhases(double *outputImage, int *windowsCenters,
+        unsigned int firstChunk, unsigned int chunkStep, unsigned int numberOfChunks) {
+    unsigned int numberOfWindowsHorizontally = iterator->_numberOfWindowsHorizontally;
+    unsigned int numberOfGroupsY = verticalLayout.groupPieces.size();
+    unsigned int numberOfGroupsX = horizontalLayout.groupPieces.size();
+    unsigned int regionLength = 4 * numberOfBins;
+    unsigned int groupLength = verticalLayout.pieces.size() * horizontalLayout.pieces.size() *
+                               regionLength;
+    unsigned int chunk, a, b, k, py, px, pieceY, pieceX, rowLength, windowIndex;
+    int cellsY = iterator->_windowHeight / cellSize, cellsX = iterator->_windowWidth / cellSize;
+    int hist1 = cellsY + 2, hist2 = cellsX + 2, blocks[2] = {cellsY, cellsX};
+    int rowFrom, columnFrom, rowCenter, columnCenter, phaseY, phaseX, firstColumn, lastColumn,
+        firstRow, groupColumn, row, slot, cellY, cellX, dy, dx;
+    double *groupRow, *region, *histogram, *cell, *descriptor;
+
+    // Histograms of the cells of a window, as in DalalTriggsHOGdescriptor and
+    // ZhuRamananHOGdescriptor
+    std::vector<double> cells(hog->method == 1 ? hist1 * hist2 * numberOfBins :
+                              cellsY * cellsX * numberOfBins);
+    // Histograms of the last numberOfGroupsY rows of groups
+    std::vector<double> histograms;
+    std::vector<int> bufferedRows(numberOfGroupsY);
+
+    for (chunk = firstChunk; chunk < verticalPhases.size() * horizontalPhases.size() * numberOfChunks;
+         chunk += chunkStep) {
+        unsigned int phase = chunk / numberOfChunks;
+        const std::vector<unsigned int> &windowRows = verticalPhases[phase / horizontalPhases.size()];
+        const std::vector<unsigned int> &windowColumns = horizontalPhases[phase % horizontalPhases.size()];
+        unsigned int firstWindowRow = (chunk % numberOfChunks) * windowRows.size() / numberOfChunks;
+        unsigned int lastWindowRow = (chunk % numberOfChunks + 1) * windowRows.size() / numberOfChunks;
+
+        phaseY = floorModulo(windowRows[0] * iterator->_windowStepVertical +
+                             verticalLayout.groupOrigin, cellSize);
+        phaseX = floorModulo(windowColumns[0] * iterator->_windowStepHorizontal +
+                             horizontalLayout.groupOrigin, cellSize);
+        // The columns of groups used by the windows of the phase
+        firstColumn = floorDivide(windowColumns.front() * iterator->_windowStepHorizontal +
+                                  horizontalLayout.groupOrigin, cellSize) +
+                      horizontalLayout.firstGroup;
+        lastColumn = floorDivide(windowColumns.back() * iterator->_windowStepHorizontal +
+                                 horizontalLayout.groupOrigin, cellSize) +
+                     horizontalLayout.firstGroup + numberOfGroupsX - 1;
+        rowLength = (lastColumn - firstColumn + 1) * groupLength;
+        histograms.resize(numberOfGroupsY * rowLength);
+        std::fill(bufferedRows.begin(), bufferedRows.end(), INT_MIN);
+
+        for (unsigned int windowRow = firstWindowRow; windowRow < lastWindowRow; windowRow++) {
+            unsigned int i = windowRows[windowRow];
+            firstRow = floorDivide(i * iterator->_windowStepVertical + verticalLayout.groupOrigin,
+                                   cellSize) + verticalLayout.firstGroup;
+            // Compute the rows of groups of the window that are not buffered
+            // (the windows are in order, so the oldest rows are replaced)
+            for (a = 0; a < numberOfGroupsY; a++) {
+                row = firstRow + a;
+                slot = floorModulo(row, numberOfGroupsY);
+                if (bufferedRows[slot] != row) {
+                    computeGroupRow(row, phaseY, phaseX, firstColumn, lastColumn,
+                                    &histograms[slot * rowLength]);
+                    bufferedRows[slot] = row;
+                }
+            }
+
+            for (unsigned int column = 0; column < windowColumns.size(); column++) {
+                unsigned int j = windowColumns[column];
+                groupColumn = floorDivide(j * iterator->_windowStepHorizontal +
+                                          horizontalLayout.groupOrigin, cellSize) +
+                              horizontalLayout.firstGroup - firstColumn;
+                // Sum the histograms of the pieces of each group in to its cells
+                std::fill(cells.begin(), cells.end(), 0.0);
+                for (a = 0; a < numberOfGroupsY; a++) {
+                    groupRow = &histograms[floorModulo(firstRow + a, numberOfGroupsY) * rowLength];
+                    for (b = 0; b < numberOfGroupsX; b++) {
+                        for (py = 0; py < verticalLayout.groupPieces[a].size(); py++) {
+                            pieceY = verticalLayout.groupPieces[a][py];
+                            for (px = 0; px < horizontalLayout.groupPieces[b].size(); px++) {
+                                pieceX = horizontalLayout.groupPieces[b][px];
+                                region = groupRow + (groupColumn + b) * groupLength +
+                                         (pieceY * horizontalLayout.pieces.size() + pieceX) *
+                                         regionLength;
+                                for (dy = 0; dy < 2; dy++) {
+                                    for (dx = 0; dx < 2; dx++) {
+                                        histogram = region + (dy * 2 + dx) * numberOfBins;
+                                        cellY = a + verticalLayout.firstGroup + dy;
+                                        cellX = b + horizontalLayout.firstGroup + dx;
+                                        if (hog->method == 1) {
+                                            cell = &cells[(cellY * hist2 + cellX) * numberOfBins];
+                                            for (k = 0; k < (unsigned int)numberOfBins; k++)
+                                                cell[k] += histogram[k];
+                                        }
+                                        else if (cellY >= 0 && cellY < cellsY &&
+                                                 cellX >= 0 && cellX < cellsX) {
+                                            cell = &cells[cellX * cellsY + cellY];
+                                            for (k = 0; k < (unsigned int)numberOfBins; k++)
+                                                cell[k * cellsY * cellsX] += histogram[k];
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+
+                // Compute descriptor of window straight in to the (row-major)
+                // output image
+                windowIndex = i * numberOfWindowsHorizontally + j;
+                descriptor = outputImage + windowIndex * hog->descriptorLengthPerWindow;
+                if (hog->method == 1)
+                    DalalTriggsBlockNormalisation(&cells[0], hist1, hist2, numberOfBins,
+                                                  hog->blockHeightAndWidthInCells,
+                                                  hog->l2normClipping, descriptor);
+                else
+                    ZhuRamananFeatures(&cells[0], blocks, descriptor);
+
+                // Store centre
+                iterator->windowLimits(i, j, &rowFrom, &columnFrom, &rowCenter, &columnCenter);
+                windowsCenters[2*windowIndex] = rowCenter;
+                windowsCenters[2*windowIndex+1] = columnCenter;
+            }
+        }
+    }
+}
+
+
+void DenseHOG::apply(double *outputImage, int *windowsCenters, unsigned int numberOfThreads) {
+    unsigned int numberOfPhases = verticalPhases.size() * horizontalPhases.size();
+    int threads = (int)std::max(numberOfThreads, 1u), t;
+    // The phases are independent, but if there are fewer phases than
+    // threads they are also split by rows of windows
+    unsigned int numberOfChunks = (threads + numberOfPhases - 1) / numberOfPhases;
+
+    // The gradients of the pixels that are not on the border of a window are
+    // the same for every window, so are computed once. Each (OpenMP) thread t
+    // takes every threads-th row of gradients and then of chunks.
+    gradients.resize(paddedHeight * paddedWidth);
+    #pragma omp parallel for num_threads(threads)
+    for (t = 0; t < threads; t++)
+        computeGradients(t, threads);
+    #pragma omp parallel for num_threads(threads)
+    for (t = 0; t < threads; t++)
+        applyToPhases(outputImage, windowsCenters, t, threads, numberOfChunks);
+    std::vector<PixelGradient>().swap(gradients);
+}
@@ -0,0 +1,59 @@
+#pragma once
+#include "HOG.h"
+#include "ImageWindowIterator.h"
+#include <vector>
+
+// A run of pixels [from, to) of a group of cells along one axis. The pixels
+// of a piece on the first (border = 1) or last (border = 2) row/column of a
+// window have their gradients computed as on the border of the window.
+struct GroupPiece {
+    int from, to, border;
+};
+
+// How a window is split in to groups of cellSize pixels (along one axis),
+// each group adding to the histograms of two neighbouring cells.
+struct AxisLayout {
+    int firstGroup, groupOrigin;
+    std::vector<GroupPiece> pieces;
+    std::vector<std::vector<unsigned int> > groupPieces;
+};
+
+// The gradient of a pixel, binned as by the HOG algorithm
+struct PixelGradient {
+    double magnitude, weight;
+    int bin1, bin2;
+};
+
+// Computes the HOG descriptors of all the windows of an ImageWindowIterator
+// (equivalent to applying HOG to every window), reusing the cells that
+// overlapping windows have in common. The gradients of the image are
+// computed once, and the histograms of each group of pixels are computed once
+// for all the windows whose cells are aligned. The descriptor of each window
+// is then assembled from the histograms of its groups and normalised.
+// The windows must be a whole number of cells.
+class DenseHOG {
+public:
+    DenseHOG(ImageWindowIterator *iterator, HOG *hog);
+    virtual ~DenseHOG();
+    void apply(double *outputImage, int *windowsCenters, unsigned int numberOfThreads = 1);
+private:
+    ImageWindowIterator *iterator;
+    HOG *hog;
+    int cellSize, numberOfBins, rowOffset, columnOffset, paddedHeight, paddedWidth;
+    unsigned int signedGradients;
+    double binsSize;
+    AxisLayout verticalLayout, horizontalLayout;
+    std::vector<std::vector<unsigned int> > verticalPhases, horizontalPhases;
+    std::vector<double> weights[2];
+    std::vector<PixelGradient> gradients;
+    AxisLayout axisLayout(unsigned int windowSize);
+    std::vector<std::vector<unsigned int> > windowsPerPhase(const AxisLayout &layout,
+            unsigned int numberOfWindows, unsigned int windowStep);
+    double pixel(int y, int x, unsigned int z);
+    void gradient(int y, int x, int borderY, int borderX, PixelGradient *g);
+    void computeGradients(unsigned int firstRow, unsigned int rowStep);
+    void computeGroupRow(int groupRow, int phaseY, int phaseX, int firstColumn,
+            int lastColumn, double *histograms);
+    void applyToPhases(double *outputImage, int *windowsCenters, unsigned int firstChunk,
+            unsigned int chunkStep, unsigned int numberOfChunks);
+};
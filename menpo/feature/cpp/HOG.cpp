@@ -76,12 +76,7 @@ void ZhuRamananHOGdescriptor(double *inputImage,
                              unsigned int imageHeight, unsigned int imageWidth,
                              unsigned int numberOfChannels,
                              double *descriptorMatrix) {
-    // unit vectors used to compute gradient orientation
-    double uu[9] = {1.0000, 0.9397, 0.7660, 0.500, 0.1736, -0.1736, -0.5000,
-                    -0.7660, -0.9397};
-    double vv[9] = {0.0000, 0.3420, 0.6428, 0.8660, 0.9848, 0.9848, 0.8660,
-                    0.6428, 0.3420};
-    int x, y, o;
+    int x, y;
 
     // memory for caching orientation histograms & their norms
     int blocks[2];
@@ -90,13 +85,6 @@ void ZhuRamananHOGdescriptor(double *inputImage,
     blocks[1] = (int)round((double)imageWidth /
                            (double)cellHeightAndWidthInPixels);
     double *hist = (double *)calloc(blocks[0] * blocks[1] * 18, sizeof(double));
-    double *norm = (double *)calloc(blocks[0] * blocks[1], sizeof(double));
-
-    // memory for HOG features
-    int out[3];
-    out[0] = max(blocks[0]-2, 0);
-    out[1] = max(blocks[1]-2, 0);
-    out[2] = 27+4;
 
     int visible[2];
     visible[0] = blocks[0] * cellHeightAndWidthInPixels;
@@ -126,19 +114,7 @@ void ZhuRamananHOGdescriptor(double *inputImage,
             }
 
             // snap to one of 18 orientations
-            double best_dot = 0;
-            int best_o = 0;
-            for (o = 0; o < 9; o++) {
-                double dot = uu[o] * dx + vv[o] * dy;
-                if (dot > best_dot) {
-                    best_dot = dot;
-                    best_o = o;
-                }
-                else if (-dot > best_dot) {
-                    best_dot = - dot;
-                    best_o = o + 9;
-                }
-            }
+            int best_o = ZhuRamananOrientation(dx, dy);
 
             // add to 4 histograms around pixel using linear interpolation
             double xp = ((double)x + 0.5) /
@@ -171,6 +147,48 @@ void ZhuRamananHOGdescriptor(double *inputImage,
         }
     }
 
+    ZhuRamananFeatures(hist, blocks, descriptorMatrix);
+    free(hist);
+}
+
+
+// Snaps a gradient to the closest of the 18 (signed) ZHU & RAMANAN
+// orientations
+int ZhuRamananOrientation(double dx, double dy) {
+    // unit vectors used to compute gradient orientation
+    double uu[9] = {1.0000, 0.9397, 0.7660, 0.500, 0.1736, -0.1736, -0.5000,
+                    -0.7660, -0.9397};
+    double vv[9] = {0.0000, 0.3420, 0.6428, 0.8660, 0.9848, 0.9848, 0.8660,
+                    0.6428, 0.3420};
+    double best_dot = 0;
+    int best_o = 0;
+    for (int o = 0; o < 9; o++) {
+        double dot = uu[o] * dx + vv[o] * dy;
+        if (dot > best_dot) {
+            best_dot = dot;
+            best_o = o;
+        }
+        else if (-dot > best_dot) {
+            best_dot = - dot;
+            best_o = o + 9;
+        }
+    }
+    return best_o;
+}
+
+
+// Computes the ZHU & RAMANAN features of a window from the (18 orientation)
+// histograms of its blocks[0] x blocks[1] cells
+void ZhuRamananFeatures(double *hist, int *blocks, double *descriptorMatrix) {
+    int x, y;
+    double *norm = (double *)calloc(blocks[0] * blocks[1], sizeof(double));
+
+    // memory for HOG features
+    int out[3];
+    out[0] = max(blocks[0]-2, 0);
+    out[1] = max(blocks[1]-2, 0);
+    out[2] = 27+4;
+
     // compute energy in each block by summing over orientations
     for (int o = 0; o < 9; o++) {
         double *src1 = hist + o * blocks[0] * blocks[1];
@@ -247,7 +265,6 @@ void ZhuRamananHOGdescriptor(double *inputImage,
             *dst = 0.2357 * t4;
         }
     }
-    free(hist);
     free(norm);
 }
 
@@ -284,16 +301,11 @@ void DalalTriggsHOGdescriptor(double *inputImage,
     float *dx = new float[numberOfChannels];
     float *dy = new float[numberOfChannels];
     float gradientOrientation, gradientMagnitude, tempMagnitude, 
-          Xc, Yc, Oc, blockNorm;
-    int x1 = 0, x2 = 0, y1 = 0, y2 = 0, bin1 = 0, descriptorIndex = 0;
-    unsigned int x, y, i, j, k, bin2;
+          Xc, Yc, Oc;
+    int x1 = 0, x2 = 0, y1 = 0, y2 = 0, bin1 = 0;
+    unsigned int bin2;
 
-    vector<vector<vector<double> > > h(hist1, vector<vector<double> >
-                                       (hist2, vector<double>
-                                        (numberOfOrientationBins, 0.0 ) ) );
-    vector<vector<vector<double> > > block(blockHeightAndWidthInCells, vector<vector<double> >
-                                           (blockHeightAndWidthInCells, vector<double>
-                                            (numberOfOrientationBins, 0.0) ) );
+    vector<double> h(hist1 * hist2 * numberOfOrientationBins, 0.0);
 
     //Calculate gradients (zero padding)
     for(unsigned int y = 0; y < imageHeight; y++) {
@@ -374,87 +386,112 @@ void DalalTriggsHOGdescriptor(double *inputImage,
             if (bin1 < 0)
                 bin1 = numberOfOrientationBins - 1;
 
-            h[y1][x1][bin1] = h[y1][x1][bin1] + gradientMagnitude *
-                              (1-((x+1-Xc)/cellHeightAndWidthInPixels)) *
-                              (1-((y+1-Yc)/cellHeightAndWidthInPixels)) *
-                              (1-((gradientOrientation-Oc)/binsSize));
-            h[y1][x1][bin2] = h[y1][x1][bin2] + gradientMagnitude *
-                              (1-((x+1-Xc)/cellHeightAndWidthInPixels)) *
-                              (1-((y+1-Yc)/cellHeightAndWidthInPixels)) *
-                              (((gradientOrientation-Oc)/binsSize));
-            h[y2][x1][bin1] = h[y2][x1][bin1] + gradientMagnitude *
-                              (1-((x+1-Xc)/cellHeightAndWidthInPixels)) *
-                              (((y+1-Yc)/cellHeightAndWidthInPixels)) *
-                              (1-((gradientOrientation-Oc)/binsSize));
-            h[y2][x1][bin2] = h[y2][x1][bin2] + gradientMagnitude *
-                              (1-((x+1-Xc)/cellHeightAndWidthInPixels)) *
-                              (((y+1-Yc)/cellHeightAndWidthInPixels)) *
-                              (((gradientOrientation-Oc)/binsSize));
-            h[y1][x2][bin1] = h[y1][x2][bin1] + gradientMagnitude *
-                              (((x+1-Xc)/cellHeightAndWidthInPixels)) *
-                              (1-((y+1-Yc)/cellHeightAndWidthInPixels)) *
-                              (1-((gradientOrientation-Oc)/binsSize));
-            h[y1][x2][bin2] = h[y1][x2][bin2] + gradientMagnitude *
-                              (((x+1-Xc)/cellHeightAndWidthInPixels)) *
-                              (1-((y+1-Yc)/cellHeightAndWidthInPixels)) *
-                              (((gradientOrientation-Oc)/binsSize));
-            h[y2][x2][bin1] = h[y2][x2][bin1] + gradientMagnitude *
-                              (((x+1-Xc)/cellHeightAndWidthInPixels)) *
-                              (((y+1-Yc)/cellHeightAndWidthInPixels)) *
-                              (1-((gradientOrientation-Oc)/binsSize));
-            h[y2][x2][bin2] = h[y2][x2][bin2] + gradientMagnitude *
-                              (((x+1-Xc)/cellHeightAndWidthInPixels)) *
-                              (((y+1-Yc)/cellHeightAndWidthInPixels)) *
-                              (((gradientOrientation-Oc)/binsSize));
+            double *h11 = &h[(y1 * hist2 + x1) * numberOfOrientationBins];
+            double *h12 = &h[(y1 * hist2 + x2) * numberOfOrientationBins];
+            double *h21 = &h[(y2 * hist2 + x1) * numberOfOrientationBins];
+            double *h22 = &h[(y2 * hist2 + x2) * numberOfOrientationBins];
+            h11[bin1] += gradientMagnitude *
+                         (1-((x+1-Xc)/cellHeightAndWidthInPixels)) *
+                         (1-((y+1-Yc)/cellHeightAndWidthInPixels)) *
+                         (1-((gradientOrientation-Oc)/binsSize));
+            h11[bin2] += gradientMagnitude *
+                         (1-((x+1-Xc)/cellHeightAndWidthInPixels)) *
+                         (1-((y+1-Yc)/cellHeightAndWidthInPixels)) *
+                         (((gradientOrientation-Oc)/binsSize));
+            h21[bin1] += gradientMagnitude *
+                         (1-((x+1-Xc)/cellHeightAndWidthInPixels)) *
+                         (((y+1-Yc)/cellHeightAndWidthInPixels)) *
+                         (1-((gradientOrientation-Oc)/binsSize));
+            h21[bin2] += gradientMagnitude *
+                         (1-((x+1-Xc)/cellHeightAndWidthInPixels)) *
+                         (((y+1-Yc)/cellHeightAndWidthInPixels)) *
+                         (((gradientOrientation-Oc)/binsSize));
+            h12[bin1] += gradientMagnitude *
+                         (((x+1-Xc)/cellHeightAndWidthInPixels)) *
+                         (1-((y+1-Yc)/cellHeightAndWidthInPixels)) *
+                         (1-((gradientOrientation-Oc)/binsSize));
+            h12[bin2] += gradientMagnitude *
+                         (((x+1-Xc)/cellHeightAndWidthInPixels)) *
+                         (1-((y+1-Yc)/cellHeightAndWidthInPixels)) *
+                         (((gradientOrientation-Oc)/binsSize));
+            h22[bin1] += gradientMagnitude *
+                         (((x+1-Xc)/cellHeightAndWidthInPixels)) *
+                         (((y+1-Yc)/cellHeightAndWidthInPixels)) *
+                         (1-((gradientOrientation-Oc)/binsSize));
+            h22[bin2] += gradientMagnitude *
+                         (((x+1-Xc)/cellHeightAndWidthInPixels)) *
+                         (((y+1-Yc)/cellHeightAndWidthInPixels)) *
+                         (((gradientOrientation-Oc)/binsSize));
         }
     }
 
+    DalalTriggsBlockNormalisation(&h[0], hist1, hist2,
+                                  numberOfOrientationBins,
+                                  blockHeightAndWidthInCells, l2normClipping,
+                                  descriptorVector);
+    delete[] dx;
+    delete[] dy;
+}
+
+
+// Computes the DALAL & TRIGGS descriptor of a window from the histograms of
+// its hist1 x hist2 cells (stored as h[(y * hist2 + x) * bins + bin]) by
+// normalising each block of cells
+void DalalTriggsBlockNormalisation(double *h, int hist1, int hist2,
+                                   unsigned int numberOfOrientationBins,
+                                   unsigned int blockHeightAndWidthInCells,
+                                   double l2normClipping,
+                                   double *descriptorVector) {
+    float blockNorm;
+    int descriptorIndex = 0;
+    unsigned int x, y, i, j, k;
+    double *cell, *blockCell;
+    vector<double> block(blockHeightAndWidthInCells *
+                         blockHeightAndWidthInCells *
+                         numberOfOrientationBins, 0.0);
+
     //Block normalization
     for(x = 1; x < hist2 - blockHeightAndWidthInCells; x++) {
         for (y = 1; y < hist1 - blockHeightAndWidthInCells; y++) {
             blockNorm = 0;
             for (i = 0; i < blockHeightAndWidthInCells; i++)
-                for(j = 0; j < blockHeightAndWidthInCells; j++)
+                for(j = 0; j < blockHeightAndWidthInCells; j++) {
+                    cell = h + ((y+i) * hist2 + x+j) * numberOfOrientationBins;
                     for(k = 0; k < numberOfOrientationBins; k++)
-                        blockNorm += h[y+i][x+j][k] * h[y+i][x+j][k];
+                        blockNorm += cell[k] * cell[k];
+                }
 
             blockNorm = sqrt(blockNorm);
             for (i = 0; i < blockHeightAndWidthInCells; i++) {
                 for(j = 0; j < blockHeightAndWidthInCells; j++) {
+                    cell = h + ((y+i) * hist2 + x+j) * numberOfOrientationBins;
+                    blockCell = &block[(i * blockHeightAndWidthInCells + j) *
+                                       numberOfOrientationBins];
                     for(k = 0; k < numberOfOrientationBins; k++) {
                         if (blockNorm > 0) {
-                            block[i][j][k] = h[y+i][x+j][k] / blockNorm;
-                            if (block[i][j][k] > l2normClipping)
-                                block[i][j][k] = l2normClipping;
+                            blockCell[k] = cell[k] / blockNorm;
+                            if (blockCell[k] > l2normClipping)
+                                blockCell[k] = l2normClipping;
                         } 
                         else {
-                            block[i][j][k] = 0;
+                            blockCell[k] = 0;
                         }
                     }
                 }
             }
 
             blockNorm = 0;
-            for (i = 0; i < blockHeightAndWidthInCells; i++)
-                for(j = 0; j < blockHeightAndWidthInCells; j++)
-                    for(k = 0; k < numberOfOrientationBins; k++)
-                        blockNorm += block[i][j][k] * block[i][j][k];
+            for (i = 0; i < block.size(); i++)
+                blockNorm += block[i] * block[i];
 
             blockNorm = sqrt(blockNorm);
-            for (i = 0; i < blockHeightAndWidthInCells; i++) {
-                for(j = 0; j < blockHeightAndWidthInCells; j++) {
-                    for(k = 0; k < numberOfOrientationBins; k++) {
-                        if (blockNorm > 0)
-                            descriptorVector[descriptorIndex] =
-                                block[i][j][k] / blockNorm;
-                        else
-                            descriptorVector[descriptorIndex] = 0.0;
-                        descriptorIndex++;
-                    }
-                }
+            for (i = 0; i < block.size(); i++) {
+                if (blockNorm > 0)
+                    descriptorVector[descriptorIndex] = block[i] / blockNorm;
+                else
+                    descriptorVector[descriptorIndex] = 0.0;
+                descriptorIndex++;
             }
         }
     }
-    delete[] dx;
-    delete[] dy;
 }
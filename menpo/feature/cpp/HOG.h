@@ -32,6 +32,7 @@ public:
 	unsigned int descriptorLengthPerBlock, numberOfBlocksPerWindowHorizontally,
 	             numberOfBlocksPerWindowVertically;
 private:
+    friend class DenseHOG;
     unsigned int method, numberOfOrientationBins, cellHeightAndWidthInPixels,
                  blockHeightAndWidthInCells, windowHeight, windowWidth,
                  numberOfChannels;
@@ -53,3 +54,10 @@ void DalalTriggsHOGdescriptor(double *inputImage,
                               unsigned int imageWidth,
                               unsigned int numberOfChannels,
                               double *descriptorVector);
+int ZhuRamananOrientation(double dx, double dy);
+void ZhuRamananFeatures(double *hist, int *blocks, double *descriptorMatrix);
+void DalalTriggsBlockNormalisation(double *h, int hist1, int hist2,
+                                   unsigned int numberOfOrientationBins,
+                                   unsigned int blockHeightAndWidthInCells,
+                                   double l2normClipping,
+                                   double *descriptorVector);
@@ -2,8 +2,13 @@
 #include <iostream>
 #include <math.h>
 #include <stdlib.h>
+#include <algorithm>
 
-ImageWindowIterator::ImageWindowIterator(double *image, unsigned int imageHeight, unsigned int imageWidth, unsigned int numberOfChannels,
+// The image is read in place, with any layout: pixel (i, j, k) is at
+// image[i*imageRowStride + j*imageColumnStride + k*imageChannelStride] and it
+// is multiplied by imageScale as it is read
+ImageWindowIterator::ImageWindowIterator(const double *image, unsigned int imageHeight, unsigned int imageWidth, unsigned int numberOfChannels,
+		long imageRowStride, long imageColumnStride, long imageChannelStride, double imageScale,
 		unsigned int windowHeight, unsigned int windowWidth, unsigned int windowStepHorizontal,
 		unsigned int windowStepVertical, bool enablePadding) {
     unsigned int numberOfWindowsHorizontally, numberOfWindowsVertically;
@@ -22,6 +27,10 @@ ImageWindowIterator::ImageWindowIterator(double *image, unsigned int imageHeight
 	this->_imageHeight = imageHeight;
 	this->_imageWidth = imageWidth;
 	this->_numberOfChannels = numberOfChannels;
+	this->_imageRowStride = imageRowStride;
+	this->_imageColumnStride = imageColumnStride;
+	this->_imageChannelStride = imageChannelStride;
+	this->_imageScale = imageScale;
 	this->_windowHeight = windowHeight;
 	this->_windowWidth = windowWidth;
 	this->_windowStepHorizontal = windowStepHorizontal;
@@ -35,63 +44,128 @@ ImageWindowIterator::~ImageWindowIterator() {
 }
 
 
-void ImageWindowIterator::apply(double *outputImage, int *windowsCenters, WindowFeature *windowFeature) {
-	int rowCenter, rowFrom, rowTo, columnCenter, columnFrom, columnTo, i, j, k;
-	unsigned int windowIndexHorizontal, windowIndexVertical, d;
+void ImageWindowIterator::windowLimits(unsigned int windowIndexVertical, unsigned int windowIndexHorizontal,
+        int *rowFrom, int *columnFrom, int *rowCenter, int *columnCenter) {
+    if (!_enablePadding) {
+        *rowFrom = windowIndexVertical*_windowStepVertical;
+        *rowCenter = *rowFrom + (int)round((double)_windowHeight / 2.0) - 1;
+        *columnFrom = windowIndexHorizontal*_windowStepHorizontal;
+        *columnCenter = *columnFrom + (int)round((double)_windowWidth / 2.0) - 1;
+    }
+    else {
+        *rowCenter = windowIndexVertical*_windowStepVertical;
+        *rowFrom = *rowCenter - (int)round((double)_windowHeight / 2.0) + 1;
+        *columnCenter = windowIndexHorizontal*_windowStepHorizontal;
+        *columnFrom = *columnCenter - (int)ceil((double)_windowWidth / 2.0) + 1;
+    }
+}
+
+
+// The items [0, numberOfItems) are split in to numberOfChunks contiguous
+// chunks (one per thread, and never empty), chunk c being
+// [chunkStart(c), chunkStart(c + 1))
+static int numberOfChunks(unsigned int numberOfItems, unsigned int numberOfThreads) {
+    return (int)std::max(1u, std::min(numberOfItems, numberOfThreads));
+}
+
+static unsigned int chunkStart(unsigned int numberOfItems, int numberOfChunks, int chunk) {
+    return chunk * (numberOfItems / numberOfChunks) +
+           std::min((unsigned int)chunk, numberOfItems % numberOfChunks);
+}
+
+
+void ImageWindowIterator::apply(double *outputImage, int *windowsCenters, WindowFeature *windowFeature,
+        unsigned int numberOfThreads) {
+    // Each window only depends on the image, so the rows of windows are split
+    // in to contiguous chunks that are computed in parallel with OpenMP (or in
+    // order, where it is not available). Every chunk has its own temporary
+    // matrices and writes to different parts of the output, so the result is
+    // identical to the serial one.
+    int chunks = numberOfChunks(_numberOfWindowsVertically, numberOfThreads), chunk;
+    #pragma omp parallel for num_threads(chunks)
+    for (chunk = 0; chunk < chunks; chunk++)
+        applyToRows(outputImage, windowsCenters, windowFeature,
+                    chunkStart(_numberOfWindowsVertically, chunks, chunk),
+                    chunkStart(_numberOfWindowsVertically, chunks, chunk + 1));
+}
+
+
+// Computes the descriptors of the windows centred at the given (row, column)
+// pixels only, which are placed as the windows of a padded iterator (so each
+// descriptor is equal to the one of a padded iterator with unit steps at the
+// same centre). The descriptors are written row-major to outputImage.
+void ImageWindowIterator::applyAtCentres(double *outputImage, const int *centres,
+        unsigned int numberOfCentres, WindowFeature *windowFeature, unsigned int numberOfThreads) {
+    int chunks = numberOfChunks(numberOfCentres, numberOfThreads), chunk;
+    #pragma omp parallel for num_threads(chunks)
+    for (chunk = 0; chunk < chunks; chunk++)
+        applyToCentres(outputImage, centres, windowFeature,
+                       chunkStart(numberOfCentres, chunks, chunk),
+                       chunkStart(numberOfCentres, chunks, chunk + 1));
+}
+
+
+void ImageWindowIterator::applyToCentres(double *outputImage, const int *centres, WindowFeature *windowFeature,
+        unsigned int firstCentre, unsigned int lastCentre) {
+    unsigned int c;
+    double* windowImage = new double[_windowHeight*_windowWidth*_numberOfChannels];
+    for (c = firstCentre; c < lastCentre; c++) {
+        copyWindow(centres[2*c] - (int)round((double)_windowHeight / 2.0) + 1,
+                   centres[2*c+1] - (int)ceil((double)_windowWidth / 2.0) + 1, windowImage);
+        windowFeature->apply(windowImage, outputImage + c*windowFeature->descriptorLengthPerWindow);
+    }
+    delete[] windowImage;
+}
+
+
+// Copies the window of the image with top left pixel (rowFrom, columnFrom)
+// in column-major order, with zeros outside of the image
+void ImageWindowIterator::copyWindow(int rowFrom, int columnFrom, double *windowImage) {
+	int rowTo = rowFrom + _windowHeight - 1, columnTo = columnFrom + _windowWidth - 1, i, j, k;
 	int imageHeight = (int)_imageHeight;
 	int imageWidth = (int)_imageWidth;
 	int numberOfChannels = (int)_numberOfChannels;
+	for (i = rowFrom; i <= rowTo; i++) {
+		for (j = columnFrom; j <= columnTo; j++) {
+			if (i < 0 || i > imageHeight-1 || j < 0 || j > imageWidth-1)
+				for (k = 0; k < numberOfChannels; k++)
+					windowImage[(i-rowFrom)+_windowHeight*((j-columnFrom)+_windowWidth*k)] = 0;
+			else
+				for (k=0; k < numberOfChannels; k++)
+					windowImage[(i-rowFrom)+_windowHeight*((j-columnFrom)+_windowWidth*k)] = imagePixel(i, j, k);
+		}
+	}
+}
 
-    // Initialize temporary matrices
+
+void ImageWindowIterator::applyToRows(double *outputImage, int *windowsCenters, WindowFeature *windowFeature,
+        unsigned int firstRow, unsigned int lastRow) {
+	int rowCenter, rowFrom, columnCenter, columnFrom;
+	unsigned int windowIndexHorizontal, windowIndexVertical, windowIndex;
+
+    // Initialize temporary matrix (the window is copied in column-major order)
 	double* windowImage = new double[_windowHeight*_windowWidth*_numberOfChannels];
-	double* descriptorVector = new double[windowFeature->descriptorLengthPerWindow];
 
     // Main loop
-    for (windowIndexVertical = 0; windowIndexVertical < _numberOfWindowsVertically; windowIndexVertical++) {
+    for (windowIndexVertical = firstRow; windowIndexVertical < lastRow; windowIndexVertical++) {
         for (windowIndexHorizontal = 0; windowIndexHorizontal < _numberOfWindowsHorizontally; windowIndexHorizontal++) {
             // Find window limits
-            if (!_enablePadding) {
-                rowFrom = windowIndexVertical*_windowStepVertical;
-                rowTo = rowFrom + _windowHeight - 1;
-                rowCenter = rowFrom + (int)round((double)_windowHeight / 2.0) - 1;
-                columnFrom = windowIndexHorizontal*_windowStepHorizontal;
-                columnTo = columnFrom + _windowWidth - 1;
-                columnCenter = columnFrom + (int)round((double)_windowWidth / 2.0) - 1;
-            }
-            else {
-                rowCenter = windowIndexVertical*_windowStepVertical;
-                rowFrom = rowCenter - (int)round((double)_windowHeight / 2.0) + 1;
-                rowTo = rowFrom + _windowHeight - 1;
-                columnCenter = windowIndexHorizontal*_windowStepHorizontal;
-                columnFrom = columnCenter - (int)ceil((double)_windowWidth / 2.0) + 1;
-                columnTo = columnFrom + _windowWidth - 1;
-            }
+            windowLimits(windowIndexVertical, windowIndexHorizontal, &rowFrom, &columnFrom,
+                         &rowCenter, &columnCenter);
 
             // Copy window image
-			for (i = rowFrom; i <= rowTo; i++) {
-				for (j = columnFrom; j <= columnTo; j++) {
-					if (i < 0 || i > imageHeight-1 || j < 0 || j > imageWidth-1)
-						for (k = 0; k < numberOfChannels; k++)
-							windowImage[(i-rowFrom)+_windowHeight*((j-columnFrom)+_windowWidth*k)] = 0;
-					else
-						for (k=0; k < numberOfChannels; k++)
-							windowImage[(i-rowFrom)+_windowHeight*((j-columnFrom)+_windowWidth*k)] = _image[i+imageHeight*(j+imageWidth*k)];
-				}
-			}
-
-            // Compute descriptor of window
-            windowFeature->apply(windowImage, descriptorVector);
-
-            // Store results
-            for (d = 0; d < windowFeature->descriptorLengthPerWindow; d++)
-            	outputImage[windowIndexVertical+_numberOfWindowsVertically*(windowIndexHorizontal+_numberOfWindowsHorizontally*d)] = descriptorVector[d];
-            windowsCenters[windowIndexVertical+_numberOfWindowsVertically*windowIndexHorizontal] = rowCenter;
-            windowsCenters[windowIndexVertical+_numberOfWindowsVertically*(windowIndexHorizontal+_numberOfWindowsHorizontally)] = columnCenter;
+            copyWindow(rowFrom, columnFrom, windowImage);
+
+            // Compute descriptor of window straight in to the (row-major)
+            // output image
+            windowIndex = windowIndexVertical*_numberOfWindowsHorizontally + windowIndexHorizontal;
+            windowFeature->apply(windowImage, outputImage + windowIndex*windowFeature->descriptorLengthPerWindow);
+            windowsCenters[2*windowIndex] = rowCenter;
+            windowsCenters[2*windowIndex+1] = columnCenter;
         }
     }
 
-    // Free temporary matrices
+    // Free temporary matrix
     delete[] windowImage;
-    delete[] descriptorVector;
 }
 
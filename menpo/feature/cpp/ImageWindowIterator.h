@@ -8,11 +8,28 @@ public:
     unsigned int _windowHeight, _windowWidth;
     unsigned int _windowStepHorizontal, _windowStepVertical;
     bool _enablePadding;
-	ImageWindowIterator(double *image, unsigned int imageHeight, unsigned int imageWidth, unsigned int numberOfChannels,
+	ImageWindowIterator(const double *image, unsigned int imageHeight, unsigned int imageWidth, unsigned int numberOfChannels,
+	        long imageRowStride, long imageColumnStride, long imageChannelStride, double imageScale,
 	        unsigned int windowHeight, unsigned int windowWidth, unsigned int windowStepHorizontal,
 			unsigned int windowStepVertical, bool enablePadding);
 	virtual ~ImageWindowIterator();
-	void apply(double *outputImage, int *windowsCenters, WindowFeature *windowFeature);
+	void apply(double *outputImage, int *windowsCenters, WindowFeature *windowFeature,
+	        unsigned int numberOfThreads = 1);
+	void applyAtCentres(double *outputImage, const int *centres, unsigned int numberOfCentres,
+	        WindowFeature *windowFeature, unsigned int numberOfThreads = 1);
+	void windowLimits(unsigned int windowIndexVertical, unsigned int windowIndexHorizontal,
+	        int *rowFrom, int *columnFrom, int *rowCenter, int *columnCenter);
 private:
-	double *_image;
+	friend class DenseHOG;
+	const double *_image;
+	long _imageRowStride, _imageColumnStride, _imageChannelStride;
+	double _imageScale;
+	double imagePixel(int row, int column, int channel) const {
+		return _image[row*_imageRowStride + column*_imageColumnStride + channel*_imageChannelStride] * _imageScale;
+	}
+	void applyToRows(double *outputImage, int *windowsCenters, WindowFeature *windowFeature,
+	        unsigned int firstRow, unsigned int lastRow);
+	void applyToCentres(double *outputImage, const int *centres, WindowFeature *windowFeature,
+	        unsigned int firstCentre, unsigned int lastCentre);
+	void copyWindow(int rowFrom, int columnFrom, double *windowImage);
 };
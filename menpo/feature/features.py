@@ -2,7 +2,7 @@ import itertools
 import numpy as np
 scipy_gaussian_filter = None  # expensive
 
-from .base import ndfeature, winitfeature
+from .base import ndfeature, winitfeature, feature_pixels, sample_points
 from .windowiterator import WindowIterator
 
 
@@ -57,7 +57,8 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
         cell_size=8, block_size=2, signed_gradient=True, l2_norm_clip=0.2,
         window_height=1, window_width=1, window_unit='blocks',
         window_step_vertical=1, window_step_horizontal=1,
-        window_step_unit='pixels', padding=True, verbose=False):
+        window_step_unit='pixels', padding=True, verbose=False,
+        n_threads=1, engine='windows'):
     r"""
     Computes a 2-dimensional HOG features image with k number of channels, of
     size `(M, N, C)` and data type `np.float`.
@@ -139,6 +140,24 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
     verbose : bool
         Flag to print HOG related information.
 
+    n_threads : int
+        The number of threads the windows are split across. The features are
+        identical for any number of threads.
+
+    engine : 'windows' or 'cells'
+        Specifies how the descriptors of the windows are computed.
+
+            ``windows`` : Each window is computed independently, as if it was
+            a separate image.
+
+            ``cells`` : The gradients of the image are computed once and the
+            histograms of the cells are reused by all the overlapping windows
+            that share them, which is much faster for small window steps.
+            The features are equal to those of ``windows`` up to floating
+            point rounding. The windows must be a whole number of cells.
+
+        Default: ``windows``
+
     Raises
     -------
     ValueError
@@ -165,20 +184,18 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
         Vertical window step must be > 0
     ValueError
         Window step unit must be either pixels or cells
+    ValueError
+        Number of threads must be > 0
+    ValueError
+        Engine must be either windows or cells
     """
     # Parse options
     if mode not in ['dense', 'sparse']:
         raise ValueError("HOG features mode must be either dense or sparse")
-    if algorithm not in ['dalaltriggs', 'zhuramanan']:
-        raise ValueError("Algorithm must be either dalaltriggs or zhuramanan")
-    if num_bins <= 0:
-        raise ValueError("Number of orientation bins must be > 0")
-    if cell_size <= 0:
-        raise ValueError("Cell size (in pixels) must be > 0")
-    if block_size <= 0:
-        raise ValueError("Block size (in cells) must be > 0")
-    if l2_norm_clip <= 0.0:
-        raise ValueError("Value for L2-norm clipping must be > 0.0")
+    _check_hog_options(algorithm, num_bins, cell_size, block_size,
+                       l2_norm_clip, n_threads)
+    if engine not in ['windows', 'cells']:
+        raise ValueError("Engine must be either windows or cells")
     if mode == 'dense':
         if window_unit not in ['pixels', 'blocks']:
             raise ValueError("Window unit must be either pixels or blocks")
@@ -202,10 +219,8 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
         if window_step_unit not in ['pixels', 'cells']:
             raise ValueError("Window step unit must be either pixels or cells")
 
-    # Correct input image_data
-    pixels = np.asfortranarray(pixels)
-    pixels *= 255.
-
+    # The iterator reads the pixels in place, scaled to the [0, 255] range
+    # that HOG is defined for
     # Dense case
     if mode == 'dense':
         # Iterator parameters
@@ -233,7 +248,8 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
                                                    cell_size)
         iterator = WindowIterator(pixels, window_height, window_width,
                                   window_step_horizontal,
-                                  window_step_vertical, padding)
+                                  window_step_vertical, padding,
+                                  imageScale=255.)
     # Sparse case
     else:
         # Create iterator
@@ -246,13 +262,15 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
             window_size = 3 * cell_size
             step = cell_size
         iterator = WindowIterator(pixels, window_size, window_size, step,
-                                  step, False)
+                                  step, False, imageScale=255.)
     # Print iterator's info
     if verbose:
         print(iterator)
     # Compute HOG
     return iterator.HOG(algorithm, num_bins, cell_size, block_size,
-                        signed_gradient, l2_norm_clip, verbose)
+                        signed_gradient, l2_norm_clip, verbose,
+                        n_threads=n_threads,
+                        reuseCells=(engine == 'cells'))
 
     # store parameters
     # hog_image.hog_parameters = {'mode': mode, 'algorithm': algorithm,
@@ -279,6 +297,121 @@ def hog(pixels, mode='dense', algorithm='dalaltriggs', num_bins=9,
     #                                 self._image.pixels.shape[2]}
 
 
+def hog_at_points(image, centres, sample_offsets=None,
+                  algorithm='dalaltriggs', num_bins=9, cell_size=8,
+                  block_size=2, signed_gradient=True, l2_norm_clip=0.2,
+                  window_height=1, window_width=1, window_unit='blocks',
+                  verbose=False, n_threads=1):
+    r"""
+    Computes HOG descriptors only at a set of centres (and optionally at
+    offsets around each of them), rather than a dense HOG features image.
+
+    The descriptor of each pixel is the one of a window centred on it, so it
+    is equal to the descriptor of the same pixel in the features image of
+    :map:`hog` with ``mode='dense'``, ``padding=True`` and unit window steps.
+    The pixels outside of the image are set to zero.
+
+    Parameters
+    ----------
+    image : :map:`Image` or `ndarray`
+        The image (or its pixels, where the last axis represents the number
+        of channels) to compute the descriptors on.
+
+    centres : :map:`PointCloud`
+        The centres to compute descriptors at.
+
+    sample_offsets : :map:`PointCloud`, optional
+        The offsets from each centre to compute descriptors at, as in
+        :meth:`Image.extract_patches`. If ``None``, only the centres are
+        used.
+
+    algorithm : 'dalaltriggs' or 'zhuramanan'
+        Specifies the algorithm used to compute HOGs.
+
+    num_bins, cell_size, block_size, signed_gradient, l2_norm_clip
+        The HOG options, as in :map:`hog`.
+
+    window_height, window_width, window_unit
+        The size of the window of each descriptor, as in :map:`hog`.
+
+    verbose : bool
+        Flag to print HOG related information.
+
+    n_threads : int
+        The number of threads the descriptors are split across. The
+        descriptors are identical for any number of threads.
+
+    Returns
+    -------
+    descriptors : ``(n_centres, n_offsets, descriptor_length)`` `ndarray`
+        The descriptor of each offset of each centre.
+
+    Raises
+    -------
+    ValueError
+        Algorithm must be either dalaltriggs or zhuramanan
+    ValueError
+        Number of orientation bins must be > 0
+    ValueError
+        Cell size (in pixels) must be > 0
+    ValueError
+        Block size (in cells) must be > 0
+    ValueError
+        Value for L2-norm clipping must be > 0.0
+    ValueError
+        Number of threads must be > 0
+    ValueError
+        Window unit must be either pixels or blocks
+    ValueError
+        Window height and width must be >= block size
+    """
+    _check_hog_options(algorithm, num_bins, cell_size, block_size,
+                       l2_norm_clip, n_threads)
+    if window_unit not in ['pixels', 'blocks']:
+        raise ValueError("Window unit must be either pixels or blocks")
+    if algorithm == 'dalaltriggs':
+        algorithm = 1
+        block_in_pixels = cell_size * block_size
+    else:
+        algorithm = 2
+        block_in_pixels = 3 * cell_size
+    if window_unit == 'blocks':
+        window_height = np.uint32(window_height * block_in_pixels)
+        window_width = np.uint32(window_width * block_in_pixels)
+    if (window_height < block_size * cell_size or
+            window_width < block_size * cell_size):
+        raise ValueError("Window height and width must be >= block size")
+
+    pixels = feature_pixels(image)
+    points, n_offsets = sample_points(centres, sample_offsets)
+    # The windows are placed as the ones of a padded iterator
+    iterator = WindowIterator(pixels, window_height, window_width, 1, 1, True,
+                              imageScale=255.)
+    if verbose:
+        print(iterator)
+    descriptors = iterator.HOG(algorithm, num_bins, cell_size, block_size,
+                               signed_gradient, l2_norm_clip, verbose,
+                               n_threads=n_threads, centres=points)[0]
+    return descriptors.reshape(centres.n_points, n_offsets,
+                               descriptors.shape[-1])
+
+
+def _check_hog_options(algorithm, num_bins, cell_size, block_size,
+                       l2_norm_clip, n_threads):
+    if algorithm not in ['dalaltriggs', 'zhuramanan']:
+        raise ValueError("Algorithm must be either dalaltriggs or zhuramanan")
+    if num_bins <= 0:
+        raise ValueError("Number of orientation bins must be > 0")
+    if cell_size <= 0:
+        raise ValueError("Cell size (in pixels) must be > 0")
+    if block_size <= 0:
+        raise ValueError("Block size (in cells) must be > 0")
+    if l2_norm_clip <= 0.0:
+        raise ValueError("Value for L2-norm clipping must be > 0.0")
+    if n_threads < 1:
+        raise ValueError("Number of threads must be > 0")
+
+
 @ndfeature
 def igo(pixels, double_angles=False, verbose=False):
     r"""
@@ -312,22 +445,10 @@ def igo(pixels, double_angles=False, verbose=False):
     if len(pixels.shape) != 3:
         raise ValueError('IGOs only work on 2D images. Expects image data '
                          'to be 3D, shape + channels.')
-    # feature channels per image channel
-    feat_channels = 2
-    if double_angles:
-        feat_channels = 4
     # compute gradients
     grad = gradient(pixels)
-    # compute angles
-    grad_orient = np.angle(grad[..., ::2] + 1j * grad[..., 1::2])
     # compute igo image
-    igo_pixels = np.empty((pixels.shape[0], pixels.shape[1],
-                           pixels.shape[-1] * feat_channels))
-    igo_pixels[..., ::feat_channels] = np.cos(grad_orient)
-    igo_pixels[..., 1::feat_channels] = np.sin(grad_orient)
-    if double_angles:
-        igo_pixels[..., 2::feat_channels] = np.cos(2 * grad_orient)
-        igo_pixels[..., 3::feat_channels] = np.sin(2 * grad_orient)
+    igo_pixels = _igo_from_gradient(grad, double_angles)
 
     # print information
     if verbose:
@@ -356,6 +477,89 @@ def igo(pixels, double_angles=False, verbose=False):
     #                                 self._image.pixels.shape[2]}
 
 
+def igo_at_points(image, centres, sample_offsets=None, double_angles=False):
+    r"""
+    Computes IGO features only at a set of centres (and optionally at
+    offsets around each of them), rather than a dense IGO features image.
+
+    The features of each pixel are equal to the ones of the same pixel in
+    the features image of :map:`igo`. The pixels outside of the image are
+    moved to the closest pixel of the image.
+
+    Parameters
+    ----------
+    image : :map:`Image` or `ndarray`
+        The 2D image (or its pixels, where the last axis represents the
+        number of channels) to compute the features on.
+
+    centres : :map:`PointCloud`
+        The centres to compute features at.
+
+    sample_offsets : :map:`PointCloud`, optional
+        The offsets from each centre to compute features at, as in
+        :meth:`Image.extract_patches`. If ``None``, only the centres are
+        used.
+
+    double_angles : bool
+        Whether the features include cos(2*phi) and sin(2*phi), as in
+        :map:`igo`.
+
+    Returns
+    -------
+    features : ``(n_centres, n_offsets, n_features)`` `ndarray`
+        The features of each offset of each centre.
+
+    Raises
+    -------
+    ValueError
+        Image has to be 2D in order to extract IGOs.
+    ValueError
+        Image has to be at least 2 pixels high and wide.
+    """
+    pixels = feature_pixels(image)
+    if len(pixels.shape) != 3:
+        raise ValueError('IGOs only work on 2D images. Expects image data '
+                         'to be 3D, shape + channels.')
+    if pixels.shape[0] < 2 or pixels.shape[1] < 2:
+        raise ValueError('IGOs need images that are at least 2 pixels high '
+                         'and wide.')
+    points, n_offsets = sample_points(centres, sample_offsets)
+    rows = np.clip(points[:, 0], 0, pixels.shape[0] - 1)
+    columns = np.clip(points[:, 1], 0, pixels.shape[1] - 1)
+    # the gradient of each pixel, as computed by np.gradient: central
+    # differences inside the image and one sided differences at its boundary
+    prev_rows = np.maximum(rows - 1, 0)
+    next_rows = np.minimum(rows + 1, pixels.shape[0] - 1)
+    prev_columns = np.maximum(columns - 1, 0)
+    next_columns = np.minimum(columns + 1, pixels.shape[1] - 1)
+    grad = np.empty((points.shape[0], 2 * pixels.shape[2]))
+    grad[:, ::2] = ((pixels[next_rows, columns] - pixels[prev_rows, columns]) /
+                    (next_rows - prev_rows)[:, None].astype(np.float))
+    grad[:, 1::2] = ((pixels[rows, next_columns] -
+                      pixels[rows, prev_columns]) /
+                     (next_columns - prev_columns)[:, None].astype(np.float))
+    igo_features = _igo_from_gradient(grad, double_angles)
+    return igo_features.reshape(centres.n_points, n_offsets,
+                                igo_features.shape[-1])
+
+
+def _igo_from_gradient(grad, double_angles):
+    # feature channels per image channel
+    feat_channels = 2
+    if double_angles:
+        feat_channels = 4
+    # compute angles
+    grad_orient = np.angle(grad[..., ::2] + 1j * grad[..., 1::2])
+    igo_pixels = np.empty(grad.shape[:-1] +
+                          (grad_orient.shape[-1] * feat_channels,))
+    igo_pixels[..., ::feat_channels] = np.cos(grad_orient)
+    igo_pixels[..., 1::feat_channels] = np.sin(grad_orient)
+    if double_angles:
+        igo_pixels[..., 2::feat_channels] = np.cos(2 * grad_orient)
+        igo_pixels[..., 3::feat_channels] = np.sin(2 * grad_orient)
+    return igo_pixels
+
+
 @ndfeature
 def es(image_data, verbose=False):
     r"""
@@ -489,22 +693,9 @@ def daisy(pixels, step=1, radius=15, rings=2, histograms=2, orientations=8,
     from menpo.external.skimage._daisy import _daisy
 
     # Parse options
-    if sigmas is not None and ring_radii is not None \
-            and len(sigmas) - 1 != len(ring_radii):
-        raise ValueError('`len(sigmas)-1 != len(ring_radii)`')
-    if ring_radii is not None:
-        rings = len(ring_radii)
-        radius = ring_radii[-1]
-    if sigmas is not None:
-        rings = len(sigmas) - 1
-    if sigmas is None:
-        sigmas = [radius * (i + 1) / float(2 * rings) for i in range(rings)]
-    if ring_radii is None:
-        ring_radii = [radius * (i + 1) / float(rings) for i in range(rings)]
-    if normalization is None:
-        normalization = 'off'
-    if normalization not in ['l1', 'l2', 'daisy', 'off']:
-        raise ValueError('Invalid normalization method.')
+    (radius, rings, normalization, sigmas,
+     ring_radii) = _parse_daisy_options(radius, rings, normalization, sigmas,
+                                        ring_radii)
 
     # Compute daisy features
     daisy_descriptor = _daisy(pixels, step=step, radius=radius, rings=rings,
@@ -534,11 +725,97 @@ def daisy(pixels, step=1, radius=15, rings=2, histograms=2, orientations=8,
     return daisy_descriptor
 
 
+def daisy_at_points(image, centres, sample_offsets=None, radius=15, rings=2,
+                    histograms=2, orientations=8, normalization='l1',
+                    sigmas=None, ring_radii=None):
+    r"""
+    Computes Daisy descriptors only at a set of centres (and optionally at
+    offsets around each of them), rather than a dense Daisy features image.
+
+    The descriptor of each pixel is equal (up to floating point rounding) to
+    the descriptor of the same pixel in the features image of :map:`daisy`
+    with ``step=1``, but only the parts of the image that the descriptors
+    depend on are processed. As in :map:`daisy`, descriptors only exist for
+    the pixels that are at least ``radius`` pixels inside the image, so the
+    other pixels are moved to the closest of those.
+
+    Parameters
+    ----------
+    image : :map:`Image` or `ndarray`
+        The image (or its pixels, where the last axis represents the number
+        of channels) to compute the descriptors on.
+
+    centres : :map:`PointCloud`
+        The centres to compute descriptors at.
+
+    sample_offsets : :map:`PointCloud`, optional
+        The offsets from each centre to compute descriptors at, as in
+        :meth:`Image.extract_patches`. If ``None``, only the centres are
+        used.
+
+    radius, rings, histograms, orientations, normalization, sigmas, ring_radii
+        The Daisy options, as in :map:`daisy`.
+
+    Returns
+    -------
+    descriptors : ``(n_centres, n_offsets, descriptor_length)`` `ndarray`
+        The descriptor of each offset of each centre.
+
+    Raises
+    -------
+    ValueError
+        `len(sigmas)-1 != len(ring_radii)`
+    ValueError
+        Invalid normalization method.
+    ValueError
+        The image is too small for the radius.
+    """
+    from menpo.external.skimage._daisy import _daisy_at_points
+
+    (radius, rings, normalization, sigmas,
+     ring_radii) = _parse_daisy_options(radius, rings, normalization, sigmas,
+                                        ring_radii)
+    pixels = feature_pixels(image)
+    if pixels.shape[0] <= 2 * radius or pixels.shape[1] <= 2 * radius:
+        raise ValueError('The image is too small for a Daisy radius of '
+                         '{}.'.format(radius))
+    points, n_offsets = sample_points(centres, sample_offsets)
+    points[:, 0] = np.clip(points[:, 0], radius, pixels.shape[0] - radius - 1)
+    points[:, 1] = np.clip(points[:, 1], radius, pixels.shape[1] - radius - 1)
+    descriptors = _daisy_at_points(pixels, points, radius=radius, rings=rings,
+                                   histograms=histograms,
+                                   orientations=orientations,
+                                   normalization=normalization, sigmas=sigmas,
+                                   ring_radii=ring_radii)
+    return descriptors.reshape(centres.n_points, n_offsets,
+                               descriptors.shape[-1])
+
+
+def _parse_daisy_options(radius, rings, normalization, sigmas, ring_radii):
+    if sigmas is not None and ring_radii is not None \
+            and len(sigmas) - 1 != len(ring_radii):
+        raise ValueError('`len(sigmas)-1 != len(ring_radii)`')
+    if ring_radii is not None:
+        rings = len(ring_radii)
+        radius = ring_radii[-1]
+    if sigmas is not None:
+        rings = len(sigmas) - 1
+    if sigmas is None:
+        sigmas = [radius * (i + 1) / float(2 * rings) for i in range(rings)]
+    if ring_radii is None:
+        ring_radii = [radius * (i + 1) / float(rings) for i in range(rings)]
+    if normalization is None:
+        normalization = 'off'
+    if normalization not in ['l1', 'l2', 'daisy', 'off']:
+        raise ValueError('Invalid normalization method.')
+    return radius, rings, normalization, sigmas, ring_radii
+
+
 @winitfeature
 def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
         window_step_vertical=1, window_step_horizontal=1,
         window_step_unit='pixels', padding=True, verbose=False,
-        skip_checks=False):
+        skip_checks=False, n_threads=1):
     r"""
     Computes a 2-dimensional LBP features image with N*C number of channels,
     where N is the number of channels of the original image and C is the number
@@ -596,6 +873,11 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
 
     skip_checks : `bool`, optional
         If True
+
+    n_threads : `int`, optional
+        The number of threads the windows are split across. The features are
+        identical for any number of threads.
+
     Raises
     -------
     ValueError
@@ -616,6 +898,8 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
         Vertical window step must be > 0
     ValueError
         Window step unit must be either pixels or window
+    ValueError
+        Number of threads must be > 0
     """
     if radius is None:
         radius = range(1, 5)
@@ -624,28 +908,7 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
 
     if not skip_checks:
         # Check parameters
-        if ((isinstance(radius, int) and isinstance(samples, list)) or
-                (isinstance(radius, list) and isinstance(samples, int))):
-            raise ValueError("Radius and samples must both be either integers "
-                             "or lists")
-        elif isinstance(radius, list) and isinstance(samples, list):
-            if len(radius) != len(samples):
-                raise ValueError("Radius and samples must have the same "
-                                 "length")
-
-        if isinstance(radius, int) and radius < 1:
-            raise ValueError("Radius must be > 0")
-        elif isinstance(radius, list) and sum(r < 1 for r in radius) > 0:
-            raise ValueError("Radii must be > 0")
-
-        if isinstance(samples, int) and samples < 1:
-            raise ValueError("Samples must be > 0")
-        elif isinstance(samples, list) and sum(s < 1 for s in samples) > 0:
-            raise ValueError("Samples must be > 0")
-
-        if mapping_type not in ['u2', 'ri', 'riu2', 'none']:
-            raise ValueError("Mapping type must be u2, ri, riu2 or "
-                             "none")
+        _check_lbp_options(radius, samples, mapping_type)
 
         if window_step_horizontal <= 0:
             raise ValueError("Horizontal window step must be > 0")
@@ -657,26 +920,17 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
             raise ValueError("Window step unit must be either pixels or "
                              "window")
 
-    # Correct input image_data
-    pixels = np.asfortranarray(pixels)
+        if n_threads < 1:
+            raise ValueError("Number of threads must be > 0")
 
     # Parse options
-    radius = np.asfortranarray(radius)
-    samples = np.asfortranarray(samples)
-    window_height = np.uint32(2 * radius.max() + 1)
+    radius, samples, window_height, mapping_type = _parse_lbp_options(
+        radius, samples, mapping_type)
     window_width = window_height
     if window_step_unit == 'window':
         window_step_vertical = np.uint32(window_step_vertical * window_height)
         window_step_horizontal = np.uint32(window_step_horizontal *
                                            window_width)
-    if mapping_type == 'u2':
-        mapping_type = 1
-    elif mapping_type == 'ri':
-        mapping_type = 2
-    elif mapping_type == 'riu2':
-        mapping_type = 3
-    else:
-        mapping_type = 0
 
     # Create iterator object
     iterator = WindowIterator(pixels, window_height, window_width,
@@ -688,7 +942,8 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
         print(iterator)
 
     # Compute LBP
-    return iterator.LBP(radius, samples, mapping_type, verbose)
+    return iterator.LBP(radius, samples, mapping_type, verbose,
+                        n_threads=n_threads)
 
     # # store parameters
     # lbp_image.lbp_parameters = {'radius': radius, 'samples': samples,
@@ -709,6 +964,131 @@ def lbp(pixels, radius=None, samples=None, mapping_type='riu2',
     #                                 self._image.pixels.shape[2]}
 
 
+def lbp_at_points(image, centres, sample_offsets=None, radius=None,
+                  samples=None, mapping_type='riu2', verbose=False,
+                  skip_checks=False, n_threads=1):
+    r"""
+    Computes LBP descriptors only at a set of centres (and optionally at
+    offsets around each of them), rather than a dense LBP features image.
+
+    The descriptor of each pixel is equal to the descriptor of the same pixel
+    in the features image of :map:`lbp` with ``padding=True`` and unit window
+    steps. The pixels outside of the image are set to zero.
+
+    Parameters
+    ----------
+    image : :map:`Image` or `ndarray`
+        The image (or its pixels, where the last axis represents the number
+        of channels) to compute the descriptors on.
+
+    centres : :map:`PointCloud`
+        The centres to compute descriptors at.
+
+    sample_offsets : :map:`PointCloud`, optional
+        The offsets from each centre to compute descriptors at, as in
+        :meth:`Image.extract_patches`. If ``None``, only the centres are
+        used.
+
+    radius, samples, mapping_type
+        The LBP options, as in :map:`lbp`.
+
+    verbose : `bool`, optional
+        Flag to print LBP related information.
+
+    skip_checks : `bool`, optional
+        If ``True``, the options are not checked.
+
+    n_threads : `int`, optional
+        The number of threads the descriptors are split across. The
+        descriptors are identical for any number of threads.
+
+    Returns
+    -------
+    descriptors : ``(n_centres, n_offsets, descriptor_length)`` `ndarray`
+        The descriptor of each offset of each centre.
+
+    Raises
+    -------
+    ValueError
+        Radius and samples must both be either integers or lists
+    ValueError
+        Radius and samples must have the same length
+    ValueError
+        Radius must be > 0
+    ValueError
+        Radii must be > 0
+    ValueError
+        Samples must be > 0
+    ValueError
+        Mapping type must be u2, ri, riu2 or none
+    ValueError
+        Number of threads must be > 0
+    """
+    if radius is None:
+        radius = range(1, 5)
+    if samples is None:
+        samples = [8]*4
+    if not skip_checks:
+        _check_lbp_options(radius, samples, mapping_type)
+        if n_threads < 1:
+            raise ValueError("Number of threads must be > 0")
+    radius, samples, window_size, mapping_type = _parse_lbp_options(
+        radius, samples, mapping_type)
+
+    pixels = feature_pixels(image)
+    points, n_offsets = sample_points(centres, sample_offsets)
+    # The windows are placed as the ones of a padded iterator
+    iterator = WindowIterator(pixels, window_size, window_size, 1, 1, True)
+    if verbose:
+        print(iterator)
+    descriptors = iterator.LBP(radius, samples, mapping_type, verbose,
+                               n_threads=n_threads, centres=points)[0]
+    return descriptors.reshape(centres.n_points, n_offsets,
+                               descriptors.shape[-1])
+
+
+def _check_lbp_options(radius, samples, mapping_type):
+    if ((isinstance(radius, int) and isinstance(samples, list)) or
+            (isinstance(radius, list) and isinstance(samples, int))):
+        raise ValueError("Radius and samples must both be either integers "
+                         "or lists")
+    elif isinstance(radius, list) and isinstance(samples, list):
+        if len(radius) != len(samples):
+            raise ValueError("Radius and samples must have the same "
+                             "length")
+
+    if isinstance(radius, int) and radius < 1:
+        raise ValueError("Radius must be > 0")
+    elif isinstance(radius, list) and sum(r < 1 for r in radius) > 0:
+        raise ValueError("Radii must be > 0")
+
+    if isinstance(samples, int) and samples < 1:
+        raise ValueError("Samples must be > 0")
+    elif isinstance(samples, list) and sum(s < 1 for s in samples) > 0:
+        raise ValueError("Samples must be > 0")
+
+    if mapping_type not in ['u2', 'ri', 'riu2', 'none']:
+        raise ValueError("Mapping type must be u2, ri, riu2 or "
+                         "none")
+
+
+def _parse_lbp_options(radius, samples, mapping_type):
+    # The radius and samples arrays, the window size and the code of the
+    # mapping type that the window iterator expects
+    radius = np.asfortranarray(radius)
+    samples = np.asfortranarray(samples)
+    window_size = np.uint32(2 * radius.max() + 1)
+    if mapping_type == 'u2':
+        mapping_type = 1
+    elif mapping_type == 'ri':
+        mapping_type = 2
+    elif mapping_type == 'riu2':
+        mapping_type = 3
+    else:
+        mapping_type = 0
+    return radius, samples, window_size, mapping_type
+
+
 @ndfeature
 def no_op(image_data):
     r"""
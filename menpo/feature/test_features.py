@@ -1,10 +1,19 @@
 import numpy as np
 from numpy.testing import assert_allclose
+import os
 import random
 import math
+import shutil
+import tempfile
+import warnings
+from nose.tools import raises
 
 from menpo.image import Image, MaskedImage
-from menpo.feature import hog, lbp, es, igo, daisy
+from menpo.shape import PointCloud
+from menpo.feature import (hog, lbp, es, igo, daisy, hog_at_points,
+                           lbp_at_points, igo_at_points, daisy_at_points,
+                           FeatureCache, get_feature_cache, ndfeature)
+import menpo
 import menpo.io as mio
 
 
@@ -166,6 +175,225 @@ def test_lbp_channels():
         assert_allclose(lbp_img.n_channels, n_combs[i, 0] * channels[i, 0])
 
 
+def test_hog_n_threads_identical():
+    image = Image(np.random.randn(50, 40, 2))
+    for algorithm in ['dalaltriggs', 'zhuramanan']:
+        hog_img = hog(image, algorithm=algorithm, cell_size=4)
+        hog_threads_img = hog(image, algorithm=algorithm, cell_size=4,
+                              n_threads=3)
+        assert np.array_equal(hog_img.pixels, hog_threads_img.pixels)
+
+
+def test_lbp_n_threads_identical():
+    image = Image(np.random.randn(50, 40, 2))
+    lbp_img = lbp(image)
+    lbp_threads_img = lbp(image, n_threads=4)
+    assert np.array_equal(lbp_img.pixels, lbp_threads_img.pixels)
+
+
+@raises(ValueError)
+def test_hog_n_threads_raises():
+    hog(Image(np.random.randn(20, 20)), n_threads=0)
+
+
+def test_hog_cells_engine_equal_to_windows():
+    image = Image(np.random.randn(50, 40, 2))
+    for algorithm in ['dalaltriggs', 'zhuramanan']:
+        for padding in [True, False]:
+            hog_img = hog(image, algorithm=algorithm, cell_size=4,
+                          padding=padding)
+            hog_cells_img = hog(image, algorithm=algorithm, cell_size=4,
+                                padding=padding, engine='cells',
+                                n_threads=2)
+            assert_allclose(hog_img.pixels, hog_cells_img.pixels,
+                            rtol=1e-6, atol=1e-9)
+
+
+def test_hog_cells_engine_sparse_equal_to_windows():
+    image = Image(np.random.randn(50, 40, 2))
+    hog_img = hog(image, mode='sparse', cell_size=4)
+    hog_cells_img = hog(image, mode='sparse', cell_size=4, engine='cells')
+    assert_allclose(hog_img.pixels, hog_cells_img.pixels, rtol=1e-6,
+                    atol=1e-9)
+
+
+@raises(ValueError)
+def test_hog_cells_engine_partial_cells_raises():
+    hog(Image(np.random.randn(40, 40)), cell_size=4, window_height=10,
+        window_width=10, window_unit='pixels', engine='cells')
+
+
+@raises(ValueError)
+def test_hog_engine_raises():
+    hog(Image(np.random.randn(20, 20)), engine='blocks')
+
+
+def test_windowiterator_features_any_layout():
+    pixels = np.random.randn(30, 25, 2)
+    strided = np.zeros((60, 50, 4))
+    strided[::2, ::2, 1:3] = pixels
+    strided = strided[::2, ::2, 1:3]
+    for feature in [hog, lbp]:
+        f_pixels = feature(pixels)
+        assert np.array_equal(f_pixels, feature(np.asfortranarray(pixels)))
+        assert np.array_equal(f_pixels, feature(strided))
+
+
+def test_hog_does_not_modify_input():
+    pixels = np.asfortranarray(np.random.randn(30, 25, 2))
+    pixels_copy = pixels.copy()
+    hog(pixels)
+    assert np.array_equal(pixels, pixels_copy)
+
+
+def test_features_at_points_shape():
+    image = Image(np.random.randn(40, 45, 2))
+    centres = PointCloud(np.array([[5., 5.], [20., 30.], [35., 40.]]))
+    offsets = PointCloud(np.array([[0., 0.], [1., 0.], [0., -1.], [2., 2.]]))
+    for feature in [hog_at_points, lbp_at_points, igo_at_points]:
+        descriptors = feature(image, centres, sample_offsets=offsets)
+        assert_allclose(descriptors.shape[:2], (3, 4))
+    descriptors = daisy_at_points(image, centres, sample_offsets=offsets,
+                                  radius=5)
+    assert_allclose(descriptors.shape, (3, 4, 40))
+
+
+def test_features_at_points_equal_to_dense():
+    pixels = np.random.randn(40, 45, 2)
+    centres = PointCloud(np.array([[0., 0.], [39., 44.], [17.5, 22.3],
+                                   [8., 30.]]))
+    rows, columns = centres.points.astype(np.int64).T
+    for algorithm in ['dalaltriggs', 'zhuramanan']:
+        assert_allclose(hog_at_points(pixels, centres, algorithm=algorithm,
+                                      cell_size=4)[:, 0],
+                        hog(pixels, algorithm=algorithm,
+                            cell_size=4)[rows, columns])
+    assert_allclose(lbp_at_points(pixels, centres, radius=2, samples=8)[:, 0],
+                    lbp(pixels, radius=2, samples=8)[rows, columns])
+    assert_allclose(igo_at_points(pixels, centres, double_angles=True)[:, 0],
+                    igo(pixels, double_angles=True)[rows, columns])
+
+
+def test_features_on_float32_image():
+    image = Image(np.random.rand(30, 25, 2))
+    f32_image = image.compact(dtype=np.float32)
+    for feature in [hog, lbp, igo]:
+        assert_allclose(feature(f32_image).pixels, feature(image).pixels,
+                        atol=1e-4)
+
+
+def test_features_on_read_only_pixels():
+    pixels = np.random.rand(30, 25, 2)
+    read_only = pixels.copy()
+    read_only.flags.writeable = False
+    for feature in [hog, lbp]:
+        assert_allclose(feature(read_only), feature(pixels))
+        assert_allclose(feature(Image(read_only, copy=False)).pixels,
+                        feature(Image(pixels)).pixels)
+
+
+def test_feature_cache_memory_hits():
+    image = Image(np.random.randn(30, 25, 2))
+    with FeatureCache() as cache:
+        assert get_feature_cache() is cache
+        hog_img = hog(image, cell_size=4)
+        # the same options given positionally share the entry
+        hog_cached_img = hog(image, 'dense', cell_size=4)
+        hog_cached_img.pixels[:] = 0
+        hog_cached_img = hog(image, cell_size=4)
+        igo(image)
+        igo(image, double_angles=True)
+    assert get_feature_cache() is None
+    assert np.array_equal(hog_img.pixels, hog_cached_img.pixels)
+    assert cache.memory_hits == 2
+    assert cache.misses == 3
+
+
+def test_feature_cache_lru_bound():
+    pixels = np.random.randn(30, 25, 2)
+    with FeatureCache(max_bytes=igo(pixels).nbytes) as cache:
+        igo(pixels)
+        igo(pixels + 1)
+        igo(pixels + 1)
+        igo(pixels)
+    assert cache.memory_hits == 1
+    assert cache.misses == 3
+    assert cache.n_bytes == igo(pixels).nbytes
+
+
+def test_feature_cache_disk_and_invalidate():
+    pixels = np.random.randn(30, 25, 2)
+    path = tempfile.mkdtemp()
+    try:
+        with FeatureCache(path=path):
+            lbp_pixels = lbp(pixels)
+            igo(pixels)
+        with FeatureCache(path=path) as cache:
+            assert np.array_equal(lbp(pixels), lbp_pixels)
+            assert cache.disk_hits == 1
+            cache.invalidate(lbp)
+        with FeatureCache(path=path) as cache:
+            lbp(pixels)
+            igo(pixels)
+            assert cache.misses == 1
+            assert cache.disk_hits == 1
+    finally:
+        shutil.rmtree(path)
+
+
+@ndfeature
+def _shift_feature(pixels, shift):
+    return pixels + shift.points[0, 0]
+
+
+def test_feature_cache_bypassed_for_object_options():
+    pixels = np.random.randn(30, 25, 2)
+    with FeatureCache() as cache:
+        shifted = _shift_feature(pixels, PointCloud(np.array([[1., 0.]])))
+        shifted_2 = _shift_feature(pixels, PointCloud(np.array([[2., 0.]])))
+    assert np.allclose(shifted + 1, shifted_2)
+    assert cache.hits == 0
+    assert cache.misses == 0
+
+
+def test_feature_cache_disk_is_per_version():
+    pixels = np.random.randn(30, 25, 2)
+    path = tempfile.mkdtemp()
+    try:
+        with FeatureCache(path=path):
+            igo(pixels)
+        assert os.listdir(path) == ['menpo-{}'.format(menpo.__version__)]
+    finally:
+        shutil.rmtree(path)
+
+
+def test_feature_cache_unwritable_path_warns():
+    pixels = np.random.randn(30, 25, 2)
+    path = tempfile.mkdtemp()
+    try:
+        with FeatureCache(path=path) as cache:
+            # a file in the way of the features of this version
+            open(cache._version_path(), 'w').close()
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter('always')
+                igo_pixels = igo(pixels)
+            assert len(w) == 1
+            assert np.array_equal(igo(pixels), igo_pixels)
+            assert cache.memory_hits == 1
+    finally:
+        shutil.rmtree(path)
+
+
+def test_daisy_at_points_equal_to_dense():
+    pixels = np.random.randn(40, 45, 2)
+    centres = PointCloud(np.array([[6., 6.], [33., 38.], [17., 22.]]))
+    rows, columns = centres.points.astype(np.int64).T
+    assert_allclose(daisy_at_points(pixels, centres, radius=6,
+                                    normalization='l2')[:, 0],
+                    daisy(pixels, radius=6, normalization='l2')[rows - 6,
+                                                                columns - 6])
+
+
 def test_igo_channels():
     n_cases = 3
     channels = np.random.randint(1, 10, [n_cases, 1])
@@ -274,3 +502,11 @@ def test_constrain_landmarks():
     x = np.where(hog_b.landmarks['PTS'].lms.points[:, 0] > hog_b.shape[1] - 1)
     y = np.where(hog_b.landmarks['PTS'].lms.points[:, 0] > hog_b.shape[0] - 1)
     assert_allclose(len(x[0]) + len(y[0]), 0)
+
+
+def test_features_of_compact_image_are_normalised():
+    image = Image(np.random.rand(30, 40, 1))
+    c_image = image.compact()
+    n_image = Image(c_image.pixels / 255.)
+    assert_allclose(igo(c_image).pixels, igo(n_image).pixels)
+    assert_allclose(hog(c_image).pixels, hog(n_image).pixels)
@@ -1,5 +1,5 @@
 # distutils: language = c++
-# distutils: sources = menpo/feature/cpp/ImageWindowIterator.cpp menpo/feature/cpp/WindowFeature.cpp menpo/feature/cpp/HOG.cpp menpo/feature/cpp/LBP.cpp
+# distutils: sources = menpo/feature/cpp/ImageWindowIterator.cpp menpo/feature/cpp/WindowFeature.cpp menpo/feature/cpp/HOG.cpp menpo/feature/cpp/DenseHOG.cpp menpo/feature/cpp/LBP.cpp
 
 import numpy as np
 cimport numpy as np
@@ -17,16 +17,23 @@ cdef extern from "math.h":
 
 cdef extern from "cpp/ImageWindowIterator.h":
     cdef cppclass ImageWindowIterator:
-        ImageWindowIterator(double *image, unsigned int imageHeight,
+        ImageWindowIterator(const double *image, unsigned int imageHeight,
                             unsigned int imageWidth,
                             unsigned int numberOfChannels,
+                            long imageRowStride, long imageColumnStride,
+                            long imageChannelStride, double imageScale,
                             unsigned int windowHeight,
                             unsigned int windowWidth,
                             unsigned int windowStepHorizontal,
                             unsigned int windowStepVertical,
                             bool enablePadding)
         void apply(double *outputImage, int *windowsCenters,
-                   WindowFeature *windowFeature)
+                   WindowFeature *windowFeature,
+                   unsigned int numberOfThreads) nogil
+        void applyAtCentres(double *outputImage, const int *centres,
+                            unsigned int numberOfCentres,
+                            WindowFeature *windowFeature,
+                            unsigned int numberOfThreads) nogil
         unsigned int _numberOfWindowsHorizontally, \
             _numberOfWindowsVertically, _numberOfWindows, _imageWidth, \
             _imageHeight, _numberOfChannels, _windowHeight, _windowWidth, \
@@ -51,6 +58,12 @@ cdef extern from "cpp/HOG.h":
             numberOfBlocksPerWindowHorizontally, \
             numberOfBlocksPerWindowVertically
 
+cdef extern from "cpp/DenseHOG.h":
+    cdef cppclass DenseHOG:
+        DenseHOG(ImageWindowIterator *iterator, HOG *hog)
+        void apply(double *outputImage, int *windowsCenters,
+                   unsigned int numberOfThreads) nogil
+
 cdef extern from "cpp/LBP.h":
     cdef cppclass LBP(WindowFeature):
         LBP(unsigned int windowHeight, unsigned int windowWidth,
@@ -63,16 +76,24 @@ cdef extern from "cpp/LBP.h":
 
 cdef class WindowIterator:
     cdef ImageWindowIterator* iterator
+    # the iterator reads the pixels of the image in place
+    cdef object image
 
     def __cinit__(self, np.ndarray[np.float64_t, ndim=3] image,
                   unsigned int windowHeight, unsigned int windowWidth,
                   unsigned int windowStepHorizontal,
-                  unsigned int windowStepVertical, bool enablePadding):
-        cdef np.ndarray[np.float64_t, ndim=3, mode='fortran'] image_f = \
-            np.require(image, requirements='F')
-        self.iterator = new ImageWindowIterator(&image_f[0, 0, 0],
+                  unsigned int windowStepVertical, bool enablePadding,
+                  double imageScale=1.0):
+        # a typed ndarray, unlike a memoryview, accepts read-only pixels
+        cdef Py_ssize_t itemsize = sizeof(double)
+        self.image = image
+        self.iterator = new ImageWindowIterator(<const double *>image.data,
                                                 image.shape[0], image.shape[1],
-                                                image.shape[2], windowHeight,
+                                                image.shape[2],
+                                                image.strides[0] // itemsize,
+                                                image.strides[1] // itemsize,
+                                                image.strides[2] // itemsize,
+                                                imageScale, windowHeight,
                                                 windowWidth,
                                                 windowStepHorizontal,
                                                 windowStepVertical,
@@ -102,9 +123,37 @@ cdef class WindowIterator:
                     <int>self.iterator._numberOfWindowsVertically)
         return info_str
 
+    cdef _apply_at_centres(self, WindowFeature *windowFeature, centres,
+                           unsigned int n_threads):
+        # the descriptors of the windows centred at the (row, column) pixels
+        # of centres only, as a (n_centres, descriptor_length) array
+        cdef int[:, :] ccentres = np.ascontiguousarray(centres,
+                                                       dtype=np.int32)
+        cdef unsigned int numberOfCentres = ccentres.shape[0]
+        cdef double[:, :] outputImage = np.zeros(
+            [numberOfCentres, windowFeature.descriptorLengthPerWindow])
+        if numberOfCentres == 0:
+            return WindowIteratorResult(np.asarray(outputImage),
+                                        np.asarray(ccentres))
+        cdef double *outputImagePtr = &outputImage[0, 0]
+        cdef int *centresPtr = &ccentres[0, 0]
+        with nogil:
+            self.iterator.applyAtCentres(outputImagePtr, centresPtr,
+                                         numberOfCentres, windowFeature,
+                                         n_threads)
+        return WindowIteratorResult(np.asarray(outputImage),
+                                    np.asarray(ccentres))
+
     def HOG(self, method, numberOfOrientationBins, cellHeightAndWidthInPixels,
             blockHeightAndWidthInCells, enableSignedGradients,
-            l2normClipping, verbose):
+            l2normClipping, verbose, unsigned int n_threads=1,
+            bool reuseCells=False, centres=None):
+        if reuseCells and centres is None and (
+                self.iterator._windowHeight % cellHeightAndWidthInPixels or
+                self.iterator._windowWidth % cellHeightAndWidthInPixels):
+            raise ValueError("The window-related options are wrong. "
+                             "Reusing cells requires windows that are a "
+                             "whole number of cells.")
         cdef HOG *hog = new HOG(self.iterator._windowHeight,
                                 self.iterator._windowWidth,
                                 self.iterator._numberOfChannels, method,
@@ -116,14 +165,6 @@ cdef class WindowIterator:
                 hog.numberOfBlocksPerWindowHorizontally == 0:
             raise ValueError("The window-related options are wrong. "
                              "The number of blocks per window is 0.")
-        cdef double[:, :, :] outputImage = np.zeros(
-            [self.iterator._numberOfWindowsVertically,
-             self.iterator._numberOfWindowsHorizontally,
-             hog.descriptorLengthPerWindow], order='F')
-        cdef int[:, :, :] windowsCenters = np.zeros(
-            [self.iterator._numberOfWindowsVertically,
-             self.iterator._numberOfWindowsHorizontally,
-             2], order='F', dtype=np.int32)
         if verbose:
             info_str = "HOG features:\n"
             if method == 1:
@@ -162,17 +203,48 @@ cdef class WindowIterator:
                     <int>hog.numberOfBlocksPerWindowVertically,
                     <int>hog.descriptorLengthPerBlock,
                     <int>hog.descriptorLengthPerWindow)
-            info_str = "{}Output image size {}W x {}H x {}.".format(
-                info_str, <int>self.iterator._numberOfWindowsHorizontally,
-                <int>self.iterator._numberOfWindowsVertically,
-                <int>hog.descriptorLengthPerWindow)
+            if reuseCells and centres is None:
+                info_str = "{}  - Cells reused by overlapping " \
+                           "windows.\n".format(info_str)
+            if centres is None:
+                info_str = "{}Output image size {}W x {}H x {}.".format(
+                    info_str, <int>self.iterator._numberOfWindowsHorizontally,
+                    <int>self.iterator._numberOfWindowsVertically,
+                    <int>hog.descriptorLengthPerWindow)
+            else:
+                info_str = "{}Output of {} descriptors of length {}.".format(
+                    info_str, len(centres), <int>hog.descriptorLengthPerWindow)
             print info_str
-        self.iterator.apply(&outputImage[0,0,0], &windowsCenters[0,0,0], hog)
+        if centres is not None:
+            result = self._apply_at_centres(hog, centres, n_threads)
+            del hog
+            return result
+        cdef double[:, :, :] outputImage = np.zeros(
+            [self.iterator._numberOfWindowsVertically,
+             self.iterator._numberOfWindowsHorizontally,
+             hog.descriptorLengthPerWindow])
+        cdef int[:, :, :] windowsCenters = np.zeros(
+            [self.iterator._numberOfWindowsVertically,
+             self.iterator._numberOfWindowsHorizontally,
+             2], dtype=np.int32)
+        cdef double *outputImagePtr = &outputImage[0, 0, 0]
+        cdef int *windowsCentersPtr = &windowsCenters[0, 0, 0]
+        cdef DenseHOG *denseHog
+        if reuseCells:
+            denseHog = new DenseHOG(self.iterator, hog)
+            with nogil:
+                denseHog.apply(outputImagePtr, windowsCentersPtr, n_threads)
+            del denseHog
+        else:
+            with nogil:
+                self.iterator.apply(outputImagePtr, windowsCentersPtr, hog,
+                                    n_threads)
         del hog
-        return WindowIteratorResult(np.ascontiguousarray(outputImage),
-                                    np.ascontiguousarray(windowsCenters))
+        return WindowIteratorResult(np.asarray(outputImage),
+                                    np.asarray(windowsCenters))
 
-    def LBP(self, radius, samples, mapping_type, verbose):
+    def LBP(self, radius, samples, mapping_type, verbose,
+            unsigned int n_threads=1, centres=None):
         # find unique samples (thus lbp codes mappings)
         uniqueSamples, whichMappingTable = np.unique(samples,
                                                      return_inverse=True)
@@ -191,14 +263,6 @@ cdef class WindowIterator:
                                 &csamples[0], radius.size, mapping_type,
                                 &cuniqueSamples[0], &cwhichMappingTable[0],
                                 numberOfUniqueSamples)
-        cdef double[:, :, :] outputImage = np.zeros(
-            [self.iterator._numberOfWindowsVertically,
-             self.iterator._numberOfWindowsHorizontally,
-             lbp.descriptorLengthPerWindow], order='F')
-        cdef int[:, :, :] windowsCenters = np.zeros(
-            [self.iterator._numberOfWindowsVertically,
-             self.iterator._numberOfWindowsHorizontally,
-             2], order='F', dtype=np.int32)
         if verbose:
             info_str = "LBP features:\n"
             if radius.size == 1:
@@ -234,15 +298,35 @@ cdef class WindowIterator:
             info_str = "{0}  - Descriptor length per window = " \
                        "{1} x 1.\n".format(info_str,
                                            <int>lbp.descriptorLengthPerWindow)
-            info_str = "{}Output image size {}W x {}H x {}.".format(
-                info_str, <int>self.iterator._numberOfWindowsHorizontally,
-                <int>self.iterator._numberOfWindowsVertically,
-                <int>lbp.descriptorLengthPerWindow)
+            if centres is None:
+                info_str = "{}Output image size {}W x {}H x {}.".format(
+                    info_str, <int>self.iterator._numberOfWindowsHorizontally,
+                    <int>self.iterator._numberOfWindowsVertically,
+                    <int>lbp.descriptorLengthPerWindow)
+            else:
+                info_str = "{}Output of {} descriptors of length {}.".format(
+                    info_str, len(centres), <int>lbp.descriptorLengthPerWindow)
             print info_str
-        self.iterator.apply(&outputImage[0,0,0], &windowsCenters[0,0,0], lbp)
+        if centres is not None:
+            result = self._apply_at_centres(lbp, centres, n_threads)
+            del lbp
+            return result
+        cdef double[:, :, :] outputImage = np.zeros(
+            [self.iterator._numberOfWindowsVertically,
+             self.iterator._numberOfWindowsHorizontally,
+             lbp.descriptorLengthPerWindow])
+        cdef int[:, :, :] windowsCenters = np.zeros(
+            [self.iterator._numberOfWindowsVertically,
+             self.iterator._numberOfWindowsHorizontally,
+             2], dtype=np.int32)
+        cdef double *outputImagePtr = &outputImage[0, 0, 0]
+        cdef int *windowsCentersPtr = &windowsCenters[0, 0, 0]
+        with nogil:
+            self.iterator.apply(outputImagePtr, windowsCentersPtr, lbp,
+                                n_threads)
         del lbp
-        return WindowIteratorResult(np.ascontiguousarray(outputImage),
-                                    np.ascontiguousarray(windowsCenters))
+        return WindowIteratorResult(np.asarray(outputImage),
+                                    np.asarray(windowsCenters))
 
 def _lbp_mapping_table(n_samples, mapping_type='riu2'):
     r"""
@@ -2,3 +2,5 @@ from .base import Image, ImageBoundaryError
 from .boolean import BooleanImage
 from .masked import MaskedImage
 from .interpolation import scipy_interpolation
+from .rasterize import rasterize_triangles
+from .warp import WarpPlan
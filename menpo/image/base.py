@@ -63,6 +63,11 @@ class Image(Vectorizable, LandmarkableViewable):
     the image have the same number of channels, and all channels have the
     same data-type (`float`).
 
+    To save memory, the pixels of a normalised image can instead be stored
+    as `np.uint8` (see :meth:`compact_inplace`), in which case they are only
+    converted back to `float` for the operations that need them (warping,
+    feature computation, normalisation...).
+
     Parameters
     -----------
     image_data : ``(M, N ..., Q, C)`` `ndarray`
@@ -86,6 +91,9 @@ class Image(Vectorizable, LandmarkableViewable):
 
     __metaclass__ = abc.ABCMeta
 
+    # True if uint8 pixels are values in [0, 1] stored multiplied by 255
+    _deferred_normalisation = False
+
     def __init__(self, image_data, copy=True):
         super(Image, self).__init__()
         if not copy:
@@ -131,6 +139,7 @@ class Image(Vectorizable, LandmarkableViewable):
         """
         img = MaskedImage(self.pixels, mask=mask, copy=copy)
         img.landmarks = self.landmarks
+        img._deferred_normalisation = self._deferred_normalisation
         return img
 
     @classmethod
@@ -304,10 +313,88 @@ class Image(Vectorizable, LandmarkableViewable):
             Flattened representation of this image, containing all pixel
             and channel information
         """
+        pixels = self._float_pixels()
         if keep_channels:
-            return self.pixels.reshape([-1, self.n_channels])
+            return pixels.reshape([-1, self.n_channels])
         else:
-            return self.pixels.ravel()
+            return pixels.ravel()
+
+    @property
+    def normalisation_deferred(self):
+        r"""
+        ``True`` if the pixels are stored as `np.uint8` values in the range
+        ``[0, 255]`` that represent `float` values in the range ``[0, 1]``.
+
+        :type: `bool`
+        """
+        return self._deferred_normalisation and self.pixels.dtype == np.uint8
+
+    def _float_pixels(self):
+        r"""
+        The pixels to be used by operations that work on `float` values. If
+        the normalisation of the pixels is deferred, a normalised `float`
+        copy of them, otherwise the pixels themselves.
+        """
+        if self.normalisation_deferred:
+            return self.pixels * (1.0 / 255)
+        return self.pixels
+
+    def compact_inplace(self, dtype=np.uint8):
+        r"""
+        Store the pixels of this normalised image with a smaller data-type.
+
+        With `np.uint8`, the pixels are stored multiplied by `255` and
+        rounded (values outside of ``[0, 1]`` are clipped) and
+        :attr:`normalisation_deferred` becomes ``True``. With `np.float32`,
+        the pixels are stored as normalised `np.float32` values. Cropping,
+        patch extraction and exporting preserve the data-type, all other
+        operations normalise a `float` copy of the pixels as needed.
+
+        Parameters
+        ----------
+        dtype : {`np.uint8`, `np.float32`}, optional
+            The data-type to store the pixels with.
+
+        Returns
+        -------
+        image : ``type(self)``
+            This image, for convenience.
+
+        Raises
+        ------
+        ValueError
+            If the data-type is not `np.uint8` or `np.float32`.
+        """
+        dtype = np.dtype(dtype)
+        if dtype == np.uint8:
+            if not self.normalisation_deferred:
+                pixels = np.clip(self.pixels, 0, 1) * 255
+                self.pixels = np.round(pixels).astype(np.uint8)
+                self._deferred_normalisation = True
+        elif dtype == np.float32:
+            self.pixels = self._float_pixels().astype(np.float32)
+            self._deferred_normalisation = False
+        else:
+            raise ValueError("Can only compact to np.uint8 or np.float32 "
+                             "pixels, not {}".format(dtype))
+        return self
+
+    def compact(self, dtype=np.uint8):
+        r"""
+        Return a copy of this normalised image with its pixels stored with a
+        smaller data-type. See :meth:`compact_inplace` for details.
+
+        Parameters
+        ----------
+        dtype : {`np.uint8`, `np.float32`}, optional
+            The data-type to store the pixels with.
+
+        Returns
+        -------
+        image : ``type(self)``
+            A compacted copy of this image.
+        """
+        return self.copy().compact_inplace(dtype=dtype)
 
     def from_vector(self, vector, n_channels=None, copy=True):
         r"""
@@ -795,6 +882,8 @@ class Image(Vectorizable, LandmarkableViewable):
         as_single_array : (n_center * n_offset, self.shape...) ndarray, optional
             If ``True``, a single numpy array is returned containing each patch.
             If ``False``, a list of images is returned representing each patch.
+            In both cases the patches have the data-type of the pixels of
+            this image.
 
         Returns
         -------
@@ -826,7 +915,11 @@ class Image(Vectorizable, LandmarkableViewable):
         if as_single_array:
             return single_array
         else:
-            return [Image(p, copy=False) for p in single_array]
+            patches = [Image(p, copy=False) for p in single_array]
+            if self.normalisation_deferred:
+                for patch in patches:
+                    patch._deferred_normalisation = True
+            return patches
 
     def extract_patches_around_landmarks(
             self, group=None, label=None, patch_size=(16, 16),
@@ -854,6 +947,8 @@ class Image(Vectorizable, LandmarkableViewable):
         as_single_array : (n_center * n_offset, self.shape...) ndarray, optional
             If ``True``, a single numpy array is returned containing each patch.
             If ``False``, a list of images is returned representing each patch.
+            In both cases the patches have the data-type of the pixels of
+            this image.
 
         Returns
         -------
@@ -926,7 +1021,8 @@ class Image(Vectorizable, LandmarkableViewable):
         # we want to sample each channel in turn, returning a vector of
         # sampled pixels. Store those in a (n_pixels, n_channels) array.
         sampled_pixel_values = scipy_interpolation(
-            self.pixels, points_to_sample, order=order, mode=mode, cval=cval)
+            self._float_pixels(), points_to_sample, order=order, mode=mode,
+            cval=cval)
         # set any nan values to 0
         sampled_pixel_values[np.isnan(sampled_pixel_values)] = 0
         # build a warped version of the image
@@ -997,9 +1093,11 @@ class Image(Vectorizable, LandmarkableViewable):
         """
         if (isinstance(transform, Affine) and order in range(4) and
             self.n_dims == 2):
-            # skimage has an optimised Cython interpolation for 2D affine
-            # warps
-            sampled = cython_interpolation(self.pixels, template_shape,
+            # we have an optimised Cython interpolation for 2D affine warps
+            # that samples all channels at once, directly into a
+            # template_shape + (n_channels,) array
+            sampled = cython_interpolation(self._float_pixels(),
+                                           template_shape,
                                            transform, order=order,
                                            mode=mode, cval=cval)
         else:
@@ -1007,11 +1105,13 @@ class Image(Vectorizable, LandmarkableViewable):
             points_to_sample = transform.apply(template_points)
             # we want to sample each channel in turn, returning a vector of
             # sampled pixels. Store those in a (n_pixels, n_channels) array.
-            sampled = scipy_interpolation(self.pixels, points_to_sample,
-                                          order=order, mode=mode, cval=cval)
+            sampled = scipy_interpolation(self._float_pixels(),
+                                          points_to_sample, order=order,
+                                          mode=mode, cval=cval)
         # set any nan values to 0
         sampled[np.isnan(sampled)] = 0
-        # build a warped version of the image
+        # build a warped version of the image (a no-op reshape if we have
+        # already sampled straight into the image shape)
         warped_pixels = sampled.reshape(template_shape + (self.n_channels,))
         warped_image = Image(warped_pixels, copy=False)
 
@@ -1345,9 +1445,9 @@ class Image(Vectorizable, LandmarkableViewable):
                                            [1.0, -0.272, -0.647],
                                            [1.0, -1.106, 1.703]]))
             coef = T[0, :]
-            pixels = np.dot(greyscale.pixels, coef.T)
+            pixels = np.dot(greyscale._float_pixels(), coef.T)
         elif mode == 'average':
-            pixels = np.mean(greyscale.pixels, axis=-1)
+            pixels = np.mean(greyscale._float_pixels(), axis=-1)
         elif mode == 'channel':
             if channel is None:
                 raise ValueError("For the 'channel' mode you have to provide"
@@ -1363,8 +1463,9 @@ class Image(Vectorizable, LandmarkableViewable):
     def as_PILImage(self):
         r"""
         Return a PIL copy of the image. Scales the image by `255` and
-        converts to `np.uint8`. Image must only have 1 or 3 channels and
-        be two dimensional.
+        converts to `np.uint8` (images whose normalisation is deferred are
+        used as they are). Image must only have 1 or 3 channels and be two
+        dimensional.
 
         Returns
         -------
@@ -1381,10 +1482,8 @@ class Image(Vectorizable, LandmarkableViewable):
                 self.n_channels, self.n_dims))
         # Slice off the channel for greyscale images
         pixels = self.pixels[..., 0] if self.n_channels == 1 else self.pixels
-        
-        if self._is_normalized():
-	        pixels *= 255
-
+        if not self.normalisation_deferred and self._is_normalized():
+            pixels = pixels * 255
         return PILImage.fromarray(pixels.astype(np.uint8))
 
     def __str__(self):
@@ -2,6 +2,7 @@ from warnings import warn
 import numpy as np
 
 from .base import Image
+from .rasterize import rasterize_triangles
 
 
 class BooleanImage(Image):
@@ -446,18 +447,12 @@ class BooleanImage(Image):
 
             Default: None
         """
-        from menpo.transform.piecewiseaffine import PiecewiseAffine
-        from menpo.transform.piecewiseaffine import TriangleContainmentError
+        from menpo.shape import TriMesh
 
         if self.n_dims != 2:
             raise ValueError("can only constrain mask on 2D images.")
 
         if trilist is not None:
-            from menpo.shape import TriMesh
             pointcloud = TriMesh(pointcloud.points, trilist)
 
-        pwa = PiecewiseAffine(pointcloud, pointcloud)
-        try:
-            pwa.apply(self.indices())
-        except TriangleContainmentError as e:
-            self.from_vector_inplace(~e.points_outside_source_domain)
+        self.pixels[..., 0] = rasterize_triangles(pointcloud, self.shape)
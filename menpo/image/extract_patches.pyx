@@ -130,14 +130,14 @@ cdef void calc_slices(const np.int64_t[:, :] centres,
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef void slice_image(const double[:, :, :] image,
-                      const np.int64_t n_centres,
-                      const np.int64_t n_sample_offsets,
-                      const np.int64_t[:, :] ext_s_min,
-                      const np.int64_t[:, :] ext_s_max,
-                      const np.int64_t[:, :] ins_s_min,
-                      const np.int64_t[:, :] ins_s_max,
-                      double[:, :, :, :] patches):
+cdef void slice_image_float64(double[:, :, :] image,
+                              const np.int64_t n_centres,
+                              const np.int64_t n_sample_offsets,
+                              const np.int64_t[:, :] ext_s_min,
+                              const np.int64_t[:, :] ext_s_max,
+                              const np.int64_t[:, :] ins_s_min,
+                              const np.int64_t[:, :] ins_s_max,
+                              double[:, :, :, :] patches):
     r"""
     Extract all the patches from the image. The patch extents have already been
     calculated and so this function simply slices appropriately in to the image
@@ -166,7 +166,7 @@ cdef void slice_image(const double[:, :, :] image,
 
     Parameters (Outputs)
     --------------------
-    patches : np.int64_t[:, :, :, :] (n_centres * n_sample_offsets, height, width, channels)
+    patches : double[:, :, :, :] (n_centres * n_sample_offsets, height, width, channels)
         The set of patches that have been extracted.
     """
     cdef np.int64_t i = 0
@@ -180,7 +180,51 @@ cdef void slice_image(const double[:, :, :] image,
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cpdef extract_patches_cython(double[:, :, :] image, double[:, :] centres,
+cdef void slice_image_float32(float[:, :, :] image,
+                              const np.int64_t n_centres,
+                              const np.int64_t n_sample_offsets,
+                              const np.int64_t[:, :] ext_s_min,
+                              const np.int64_t[:, :] ext_s_max,
+                              const np.int64_t[:, :] ins_s_min,
+                              const np.int64_t[:, :] ins_s_max,
+                              float[:, :, :, :] patches):
+    r"""
+    As :func:`slice_image_float64`, for single precision images.
+    """
+    cdef np.int64_t i = 0
+    for i in range(n_centres * n_sample_offsets):
+            patches[i,
+                    ins_s_min[i, 0]:ins_s_max[i, 0],
+                    ins_s_min[i, 1]:ins_s_max[i, 1]] = \
+            image[ext_s_min[i, 0]:ext_s_max[i, 0],
+                  ext_s_min[i, 1]:ext_s_max[i, 1]]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void slice_image_uint8(np.uint8_t[:, :, :] image,
+                            const np.int64_t n_centres,
+                            const np.int64_t n_sample_offsets,
+                            const np.int64_t[:, :] ext_s_min,
+                            const np.int64_t[:, :] ext_s_max,
+                            const np.int64_t[:, :] ins_s_min,
+                            const np.int64_t[:, :] ins_s_max,
+                            np.uint8_t[:, :, :, :] patches):
+    r"""
+    As :func:`slice_image_float64`, for uint8 images.
+    """
+    cdef np.int64_t i = 0
+    for i in range(n_centres * n_sample_offsets):
+            patches[i,
+                    ins_s_min[i, 0]:ins_s_max[i, 0],
+                    ins_s_min[i, 1]:ins_s_max[i, 1]] = \
+            image[ext_s_min[i, 0]:ext_s_max[i, 0],
+                  ext_s_min[i, 1]:ext_s_max[i, 1]]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef extract_patches_cython(np.ndarray image, double[:, :] centres,
                              np.int64_t[:] patch_size, np.int64_t[:, :] sample_offsets):
     r"""
     Extract a set of patches from an image. Given a set of patch centres and
@@ -192,8 +236,9 @@ cpdef extract_patches_cython(double[:, :, :] image, double[:, :] centres,
 
     Parameters
     ----------
-    image : double[:, :, :] (height, width, n_channels)
-        The image to extract patches from.
+    image : np.ndarray (height, width, n_channels)
+        The image to extract patches from. May be of type `np.uint8`,
+        `np.float32` or `np.float64`.
     n_centres : np.int64_t
         The number of centres given.
     n_sample_offsets : np.int64_t
@@ -213,8 +258,8 @@ cpdef extract_patches_cython(double[:, :, :] image, double[:, :] centres,
 
     Returns
     -------
-    patches : double[:, :, :, :] (n_centres * n_sample_offsets, height, width, n_channels)
-        Returns a matrix containing the set of patches. The last 3 dimensions
+    patches : np.ndarray (n_centres * n_sample_offsets, height, width, n_channels)
+        Returns a matrix of the same type as the image containing the set of patches. The last 3 dimensions
         are the patches and the first dimension is each centre. If multiple
         sample offsets were provided, then they are all concatenated together
         to return (n_centres * n_sample_offsets) patches.
@@ -241,9 +286,9 @@ cpdef extract_patches_cython(double[:, :, :] image, double[:, :] centres,
 
         # It is important this array is zeros and not empty due to truncating
         # out of bounds patches.
-        np.ndarray[double, ndim=4] patches = np.zeros(
+        np.ndarray patches = np.zeros(
             [n_centres * n_sample_offsets, patch_shape0, patch_shape1,
-             n_channels])
+             n_channels], dtype=image.dtype)
 
     calc_augmented_centres(centres, sample_offsets, augmented_centres)
     calc_slices(augmented_centres,
@@ -256,13 +301,20 @@ cpdef extract_patches_cython(double[:, :, :] image, double[:, :] centres,
                 ins_s_min,
                 ins_s_max)
 
-    slice_image(image,
-                n_centres,
-                n_sample_offsets,
-                ext_s_min,
-                ext_s_max,
-                ins_s_min,
-                ins_s_max,
-                patches)
+    # a function per pixel type, as Cython 0.21 can not match the np.int64_t
+    # views of a fused function
+    if image.dtype == np.float64:
+        slice_image_float64(image, n_centres, n_sample_offsets, ext_s_min,
+                            ext_s_max, ins_s_min, ins_s_max, patches)
+    elif image.dtype == np.float32:
+        slice_image_float32(image, n_centres, n_sample_offsets, ext_s_min,
+                            ext_s_max, ins_s_min, ins_s_max, patches)
+    elif image.dtype == np.uint8:
+        slice_image_uint8(image, n_centres, n_sample_offsets, ext_s_min,
+                          ext_s_max, ins_s_min, ins_s_max, patches)
+    else:
+        raise ValueError('Patches can only be extracted from images of type '
+                         'uint8, float32 or float64, not '
+                         '{}'.format(image.dtype))
 
     return patches
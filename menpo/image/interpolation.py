@@ -1,6 +1,6 @@
 import numpy as np
 map_coordinates = None  # expensive, from scipy.ndimage
-from menpo.external.skimage._warps_cy import _warp_fast
+from menpo.external.skimage._warps_cy import _warp_fast_multichannel
 from menpo.transform import Homogeneous
 
 # Store out a transform that simply switches the x and y axis
@@ -59,45 +59,48 @@ def scipy_interpolation(pixels, points_to_sample, mode='constant', order=1,
 
 
 def cython_interpolation(pixels, template_shape, h_transform, mode='constant',
-                         order=1, cval=0.):
+                         order=1, cval=0., out=None):
     r"""
     Interpolation utilizing skimage's fast cython warp function.
 
     Parameters
     ----------
-    pixels : (M, N, ..., n_channels) ndarray
+    pixels : (M, N, n_channels) ndarray
         The image to be sampled from, the final axis containing channel
         information.
 
     template_shape : tuple
         The shape of the new image that will be sampled
 
+    h_transform : :map:`Homogeneous`
+        The 2D transform from the template space back to ``pixels``.
+
     mode : {'constant', 'nearest', 'reflect', 'wrap'}, optional
         Points outside the boundaries of the input are filled according to the
         given mode.
 
     order : int, optional
         The order of the spline interpolation. The order has to be in the
-        range 0-5.
+        range 0-3.
 
     cval : float, optional
         The value that should be used for points that are sampled from
         outside the image bounds if mode is 'constant'
 
+    out : (M', N', n_channels) ndarray, optional
+        C-contiguous double buffer of shape ``template_shape + (n_channels,)``
+        that the result is written into. If ``None``, a new array is
+        allocated.
+
     Returns
     -------
-    sampled_image : ndarray
-        The pixel information sampled at each of the points.
+    sampled_image : (M', N', n_channels) ndarray
+        The pixel information sampled at each pixel of ``template_shape``.
     """
     # unfortunately they consider xy -> yx
     matrix = xy_yx.compose_before(h_transform).compose_before(xy_yx).h_matrix
-    warped_channels = []
-    # Loop over every channel in image - we know last axis is always channels
-    # Note that map_coordinates uses the opposite (dims, points) convention
-    # to us so we transpose
-    for i in xrange(pixels.shape[-1]):
-        warped_channels.append(_warp_fast(pixels[..., i], matrix,
-                                          output_shape=template_shape,
-                                          mode=mode, order=order, cval=cval))
-    warped_channels = [v.reshape([-1, 1]) for v in warped_channels]
-    return np.concatenate(warped_channels, axis=1)
+    # All channels are interpolated in a single pass, so each source
+    # coordinate is only computed once.
+    return _warp_fast_multichannel(pixels, matrix,
+                                   output_shape=template_shape,
+                                   mode=mode, order=order, cval=cval, out=out)
@@ -85,6 +85,7 @@ class MaskedImage(Image):
         """
         img = Image(self.pixels, copy=copy)
         img.landmarks = self.landmarks
+        img._deferred_normalisation = self._deferred_normalisation
         return img
 
     @classmethod
@@ -201,7 +202,13 @@ class MaskedImage(Image):
             else:
                 pixels = pixels.copy()
             self.pixels = pixels
+            self._deferred_normalisation = False
         else:
+            if self.normalisation_deferred:
+                # the new pixels are normalised floats, so the unmasked
+                # pixels have to be normalised before they are written
+                self.pixels = self._float_pixels()
+                self._deferred_normalisation = False
             self.pixels[self.mask.mask] = pixels
             # oh dear, couldn't avoid a copy. Did the user try to?
             if not copy:
@@ -238,10 +245,13 @@ class MaskedImage(Image):
         vectorized_image : (shape given by `keep_channels`) ndarray
             Vectorized image
         """
+        pixels = self.masked_pixels()
+        if self.normalisation_deferred:
+            pixels = pixels * (1.0 / 255)
         if keep_channels:
-            return self.masked_pixels().reshape([-1, self.n_channels])
+            return pixels.reshape([-1, self.n_channels])
         else:
-            return self.masked_pixels().ravel()
+            return pixels.ravel()
 
     def from_vector(self, vector, n_channels=None):
         r"""
@@ -0,0 +1,131 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+from libc.math cimport ceil, floor
+
+
+cdef inline double edge_function(double a0, double a1, double b0, double b1,
+                                 double p0, double p1):
+    r"""
+    Twice the signed area of the triangle (a, b, p). Zero if p lies on the
+    line through a and b, and of opposite signs on either side of it.
+    """
+    return (b0 - a0) * (p1 - a1) - (b1 - a1) * (p0 - a0)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void rasterize_triangles_c(const double[:, :] points,
+                                const np.int64_t[:, :] trilist,
+                                np.uint8_t[:, :] mask,
+                                np.int32_t[:, :] labels,
+                                bint write_labels):
+    r"""
+    Fill each triangle into the mask. Every pixel whose centre lies within
+    (or on the edge of) the triangle is set. If ``write_labels``, the index
+    of the first triangle that covers each pixel is written to labels.
+
+    Parameters (Inputs)
+    -------------------
+    points : double[:, :] (n_points, 2)
+        The vertices of the triangles, in pixel (index) coordinates.
+    trilist : np.int64_t[:, :] (n_tris, 3)
+        The triangle list.
+    write_labels : bool
+        Whether the labels buffer should be filled.
+
+    Parameters (Outputs)
+    --------------------
+    mask : np.uint8_t[:, :] (M, N)
+        The output mask buffer.
+    labels : np.int32_t[:, :] (M, N)
+        The output label buffer - expected to be filled with -1.
+    """
+    cdef:
+        Py_ssize_t t, r, c, r_min, r_max, c_min, c_max
+        Py_ssize_t n_rows = mask.shape[0], n_cols = mask.shape[1]
+        double i0, i1, j0, j1, k0, k1, area, w_i, w_j, w_k
+
+    for t in range(trilist.shape[0]):
+        i0 = points[trilist[t, 0], 0]
+        i1 = points[trilist[t, 0], 1]
+        j0 = points[trilist[t, 1], 0]
+        j1 = points[trilist[t, 1], 1]
+        k0 = points[trilist[t, 2], 0]
+        k1 = points[trilist[t, 2], 1]
+        area = edge_function(i0, i1, j0, j1, k0, k1)
+        if area == 0 or area != area:
+            # degenerate triangles cover no pixels
+            continue
+        # the pixel bounding box of the triangle, clipped to the image
+        r_min = max(<Py_ssize_t>ceil(min(i0, min(j0, k0))), 0)
+        r_max = min(<Py_ssize_t>floor(max(i0, max(j0, k0))), n_rows - 1)
+        c_min = max(<Py_ssize_t>ceil(min(i1, min(j1, k1))), 0)
+        c_max = min(<Py_ssize_t>floor(max(i1, max(j1, k1))), n_cols - 1)
+        for r in range(r_min, r_max + 1):
+            for c in range(c_min, c_max + 1):
+                # a pixel is inside if it is on the same side of all three
+                # edges as the opposite vertex
+                w_i = edge_function(j0, j1, k0, k1, r, c)
+                w_j = edge_function(k0, k1, i0, i1, r, c)
+                w_k = edge_function(i0, i1, j0, j1, r, c)
+                if area < 0:
+                    w_i, w_j, w_k = -w_i, -w_j, -w_k
+                if w_i >= 0 and w_j >= 0 and w_k >= 0:
+                    mask[r, c] = 1
+                    if write_labels and labels[r, c] < 0:
+                        labels[r, c] = t
+
+
+def rasterize_triangles(pointcloud, shape, return_labels=False):
+    r"""
+    Rasterize the triangles of a 2D :map:`TriMesh` into a boolean mask.
+
+    Each triangle is filled by testing the pixels of its bounding box
+    against its three edges, so the cost is proportional to the area
+    covered by the triangles rather than to the number of pixels in the
+    image times the number of triangles.
+
+    Parameters
+    ----------
+    pointcloud : :map:`TriMesh` or :map:`PointCloud`
+        The triangles to rasterize, in pixel (index) coordinates. If a
+        :map:`PointCloud` is provided, a Delaunay triangulation of the points
+        is used (filling its convex hull).
+    shape : `tuple` of `int`
+        The ``(M, N)`` shape of the output mask.
+    return_labels : `bool`, optional
+        If ``True``, also return the index of the triangle that covers each
+        pixel. Pixels covered by more than one triangle (i.e. on a shared
+        edge) are assigned the lowest triangle index.
+
+    Returns
+    -------
+    mask : ``(M, N)`` `np.bool` ndarray
+        ``True`` for each pixel whose centre lies within a triangle.
+    labels : ``(M, N)`` `np.int32` ndarray
+        Only returned if ``return_labels``. The triangle index covering
+        each pixel, or -1 for pixels outside of all triangles.
+
+    Raises
+    ------
+    ValueError
+        If the pointcloud is not 2D.
+    """
+    from menpo.shape import TriMesh  # to avoid circular import
+    if pointcloud.n_dims != 2:
+        raise ValueError("Can only rasterize 2D triangles.")
+    if not isinstance(pointcloud, TriMesh):
+        pointcloud = TriMesh(pointcloud.points)
+    shape = tuple(int(s) for s in shape)
+    mask = np.zeros(shape, dtype=np.uint8)
+    labels = np.empty(shape if return_labels else (0, 0), dtype=np.int32)
+    labels.fill(-1)
+    rasterize_triangles_c(np.require(pointcloud.points, dtype=np.float64),
+                          np.require(pointcloud.trilist, dtype=np.int64),
+                          mask, labels, return_labels)
+    mask = mask.view(np.bool)
+    if return_labels:
+        return mask, labels
+    else:
+        return mask
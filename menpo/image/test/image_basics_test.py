@@ -48,3 +48,76 @@ def test_warp_to_shape_boolean_preserves_path():
     i2 = i1.rescale(0.8)
     assert hasattr(i2, 'path')
     assert i2.path == i1.path
+
+
+def test_compact_uint8_defers_normalisation():
+    img = Image(np.random.rand(10, 12, 3))
+    c_img = img.compact()
+    assert c_img.pixels.dtype == np.uint8
+    assert c_img.normalisation_deferred
+    assert not img.normalisation_deferred
+    assert np.allclose(c_img.as_vector(), img.as_vector(), atol=0.5 / 255)
+
+
+def test_compact_float32():
+    img = Image(np.random.rand(10, 12, 3))
+    c_img = img.compact(dtype=np.float32)
+    assert c_img.pixels.dtype == np.float32
+    assert not c_img.normalisation_deferred
+    assert np.allclose(c_img.pixels, img.pixels, atol=1e-6)
+    # from deferred uint8
+    f_img = img.compact().compact(dtype=np.float32)
+    assert np.allclose(f_img.pixels, img.pixels, atol=0.5 / 255)
+
+
+@raises(ValueError)
+def test_compact_int_dtype_raises_value_error():
+    Image(np.random.rand(10, 12, 3)).compact(dtype=np.int32)
+
+
+def test_compact_preserved_by_crop_and_copy():
+    img = Image(np.random.rand(10, 12, 3)).compact()
+    cropped = img.crop((2, 2), (6, 8)).copy()
+    assert cropped.pixels.dtype == np.uint8
+    assert cropped.normalisation_deferred
+    assert cropped.as_masked().normalisation_deferred
+
+
+def test_compact_warps_are_normalised():
+    img = Image(np.random.rand(10, 12, 3)).compact()
+    expected = Image(img.pixels / 255.)
+    scale = UniformScale(0.7, n_dims=2)
+    assert np.allclose(img.warp_to_shape((8, 8), scale).pixels,
+                       expected.warp_to_shape((8, 8), scale).pixels)
+    mask = BooleanImage.blank((8, 8))
+    assert np.allclose(img.warp_to_mask(mask, scale).pixels,
+                       expected.warp_to_mask(mask, scale).pixels)
+
+
+def test_compact_as_greyscale_is_normalised():
+    img = Image(np.random.rand(10, 12, 3)).compact()
+    expected = Image(img.pixels / 255.)
+    assert np.allclose(img.as_greyscale().pixels,
+                       expected.as_greyscale().pixels)
+
+
+def test_compact_as_PILImage():
+    pixels = np.random.rand(10, 12, 3)
+    img = Image(pixels)
+    assert np.all(np.asarray(img.compact().as_PILImage()) ==
+                  np.round(pixels * 255))
+    # the pixels of the image are not modified
+    assert np.all(img.pixels == pixels)
+
+
+def test_compact_set_masked_pixels_partial_mask():
+    mask = np.zeros((10, 12), dtype=np.bool)
+    mask[2:7, 3:9] = True
+    img = MaskedImage(np.random.rand(10, 12, 3), mask=mask).compact()
+    expected = img.pixels / 255.
+    new_pixels = np.random.rand(mask.sum(), 3)
+    img.set_masked_pixels(new_pixels)
+    expected[mask] = new_pixels
+    assert not img.normalisation_deferred
+    assert np.allclose(img.pixels, expected)
+    assert np.allclose(img.as_vector(), new_pixels.ravel())
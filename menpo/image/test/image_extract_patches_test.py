@@ -1,3 +1,4 @@
+import numpy as np
 from nose.tools import assert_equals
 
 import menpo.io as mio
@@ -80,3 +81,17 @@ def test_squared_even_patches_sample_offsets():
     patches = image.extract_patches(image.landmarks['PTS'].lms,
                                     sample_offsets=sample_offsets)
     assert_equals(len(patches), 136)
+
+
+def test_patches_preserve_compact_dtype():
+    image = mio.import_builtin_asset('breakingbad.jpg')
+    image = labeller(image, 'PTS', ibug_face_68)
+    centres = image.landmarks['PTS'].lms
+    expected = image.extract_patches(centres, as_single_array=True)
+    for dtype in (np.uint8, np.float32):
+        c_image = image.compact(dtype=dtype)
+        patches = c_image.extract_patches(centres, as_single_array=True)
+        assert_equals(patches.dtype, dtype)
+        patch = c_image.extract_patches(centres)[0]
+        assert(np.allclose(patch.as_vector(keep_channels=True),
+                           expected[0].reshape(-1, 3), atol=0.5 / 255))
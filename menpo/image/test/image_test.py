@@ -177,6 +177,32 @@ def test_boolean_image_false_indices():
     assert(image.__str__() == '3W x 2H 2D mask, 100.0% of which is True')
 
 
+def test_boolean_image_constrain_to_pointcloud():
+    from menpo.shape import PointCloud
+    image = BooleanImage.blank((10, 10), fill=False)
+    image.constrain_to_pointcloud(PointCloud(np.array([[1., 1.], [1., 6.],
+                                                       [6., 1.]])))
+    expected = np.zeros((10, 10), dtype=np.bool)
+    for i in range(1, 7):
+        expected[i, 1:8 - i] = True
+    assert_equal(image.mask, expected)
+
+
+def test_rasterize_triangles_labels():
+    from menpo.image import rasterize_triangles
+    from menpo.shape import TriMesh
+    square = TriMesh(np.array([[0., 0.], [0., 4.], [4., 4.], [4., 0.]]),
+                     trilist=np.array([[0, 1, 2], [0, 2, 3]]))
+    mask, labels = rasterize_triangles(square, (6, 6), return_labels=True)
+    assert_equal(mask, labels >= 0)
+    assert(np.all(mask[:5, :5]))
+    assert(not np.any(mask[5:]) and not np.any(mask[:, 5:]))
+    # the shared diagonal belongs to the first triangle
+    assert_equal(np.diag(labels)[:5], 0)
+    assert_equal(labels[1, 0], 1)
+    assert_equal(labels[0, 1], 0)
+
+
 def test_boolean_image_from_vector():
     vector = np.zeros(16, dtype=np.bool)
     image = BooleanImage.blank((4, 4))
@@ -95,6 +95,64 @@ def test_warp_to_shape_equal_warp_to_mask():
     assert_allclose(m_shape.pixels, m_mask.pixels)
 
 
+def test_warp_to_shape_multichannel_matches_per_channel():
+    from menpo.external.skimage._warps_cy import _warp_fast
+    from menpo.image.interpolation import xy_yx
+    img = Image(np.random.rand(30, 20, 5))
+    t = Affine.identity(2).from_vector(np.array([0.1, -0.05, 0.2, -0.1, 3.2,
+                                                 -1.7]))
+    matrix = xy_yx.compose_before(t).compose_before(xy_yx).h_matrix
+    for order in range(4):
+        for mode in ['constant', 'nearest', 'reflect', 'wrap']:
+            warped = img.warp_to_shape((25, 35), t, order=order, mode=mode)
+            expected = np.concatenate(
+                [_warp_fast(img.pixels[..., i], matrix, output_shape=(25, 35),
+                            order=order, mode=mode)[..., None]
+                 for i in range(img.n_channels)], axis=-1)
+            assert_allclose(warped.pixels, expected)
+
+
 def test_rescale_boolean():
     mask = BooleanImage.blank((100, 100))
     mask.resize((10, 10))
+
+
+def test_warp_plan_equal_warp_to_mask():
+    from menpo.image import WarpPlan
+    t = Affine.identity(2).from_vector(np.array([0.1, 0.05, -0.1, 0.2, 70,
+                                                 30]))
+    mask = BooleanImage.blank((50, 60))
+    mask.pixels[:10, :30] = False
+    masked = MaskedImage(rgb_image.pixels)
+    masked.mask.pixels[:120] = False
+    for order in [0, 1, 3]:
+        for mode in ['constant', 'nearest', 'reflect']:
+            plan = WarpPlan(mask, order=order, mode=mode)
+            for img in [rgb_image, masked]:
+                expected = img.warp_to_mask(mask, t, order=order, mode=mode)
+                warped = plan.warp(img, t)
+                assert(type(warped) == MaskedImage)
+                assert_allclose(warped.pixels, expected.pixels)
+                assert(np.all(warped.mask.pixels == expected.mask.pixels))
+
+
+def test_warp_plan_reuses_out():
+    from menpo.image import WarpPlan
+    t = Affine.identity(2).from_vector(initial_params)
+    plan = WarpPlan(template_mask)
+    warped = plan.warp(rgb_image, t)
+    rewarped = plan.warp(rgb_image, t, out=warped)
+    assert(rewarped is warped)
+    assert_allclose(rewarped.pixels, rgb_template.pixels)
+    assert_allclose(plan.sample(rgb_image, t),
+                    rgb_template.pixels.reshape([-1, 3]))
+
+
+def test_warp_plan_boolean():
+    from menpo.image import WarpPlan
+    b = BooleanImage.blank((10, 10))
+    b.pixels[:, :5] = False
+    plan = WarpPlan(BooleanImage.blank((10, 10)))
+    warped_mask = plan.warp(b, Affine.identity(2))
+    assert(type(warped_mask) == BooleanImage)
+    assert(np.all(warped_mask.pixels == b.pixels))
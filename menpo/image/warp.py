@@ -0,0 +1,218 @@
+import numpy as np
+
+from menpo.external.skimage._warps_cy import _sample_points_multichannel
+from menpo.transform import Affine
+
+from .boolean import BooleanImage
+from .interpolation import scipy_interpolation
+from .masked import MaskedImage
+
+
+class WarpPlan(object):
+    r"""
+    A reusable plan for repeatedly warping images into the same template mask.
+
+    Warping into a fixed template mask (as is done in every iteration of a
+    fitting loop) with :meth:`Image.warp_to_mask` recomputes the true indices
+    of the template, allocates a new :map:`MaskedImage` and samples each
+    channel in turn on every call. A :map:`WarpPlan` does all of the
+    transform-independent work once, so that each call to :meth:`warp` or
+    :meth:`sample` only has to compute the transformed template coordinates
+    and sample the image at them.
+
+    For 2D images with ``order`` 0 or 1 and ``mode`` ``'constant'`` or
+    ``'nearest'``, all channels are sampled in a single pass from each
+    transformed coordinate. All other configurations are sampled with
+    :func:`scipy_interpolation`. In all cases the result is equal to that of
+    :meth:`Image.warp_to_mask`.
+
+    Parameters
+    ----------
+    template_mask : :map:`BooleanImage`
+        Defines the shape of the result, and what pixels should be
+        sampled.
+
+    order : `int`, optional
+        The order of interpolation. The order has to be in the range 0-5:
+        * 0: Nearest-neighbor
+        * 1: Bi-linear (default)
+        * 2: Bi-quadratic
+        * 3: Bi-cubic
+        * 4: Bi-quartic
+        * 5: Bi-quintic
+
+    mode : `str`, optional
+        Points outside the boundaries of the input are filled according
+        to the given mode ('constant', 'nearest', 'reflect' or 'wrap').
+
+    cval : `float`, optional
+        Used in conjunction with mode 'constant', the value outside
+        the image boundaries.
+    """
+    def __init__(self, template_mask, order=1, mode='constant', cval=0.):
+        if order not in range(6):
+            raise ValueError('order must be in the range 0-5')
+        self.template_mask = template_mask.copy()
+        self.order = order
+        self.mode = mode
+        self.cval = cval
+        self.template_points = self.template_mask.true_indices()
+        n_points = self.template_points.shape[0]
+        # the template points in homogeneous form, so that an affine
+        # transform can be applied with a single matrix product
+        self._h_template_points = np.hstack([self.template_points,
+                                             np.ones([n_points, 1])])
+        self._points_buffer = np.empty([n_points, self.n_dims])
+        # (n_true_pixels, n_channels) sample buffers, keyed by n_channels
+        self._sample_buffers = {}
+
+    @property
+    def n_dims(self):
+        r"""
+        The number of dimensions of the template.
+
+        :type: `int`
+        """
+        return self.template_mask.n_dims
+
+    @property
+    def n_true_pixels(self):
+        r"""
+        The number of pixels that are sampled on each warp.
+
+        :type: `int`
+        """
+        return self.template_points.shape[0]
+
+    def _fast_sampling(self, order):
+        return (self.n_dims == 2 and order in (0, 1) and
+                self.mode in ('constant', 'nearest'))
+
+    def _transformed_points(self, transform):
+        if self.n_dims != transform.n_dims:
+            raise ValueError(
+                "Trying to warp a {}D template with a {}D transform "
+                "(they must match)".format(self.n_dims, transform.n_dims))
+        if isinstance(transform, Affine):
+            # the last row of an affine h_matrix is always [0, ..., 0, 1]
+            return np.dot(self._h_template_points,
+                          transform.h_matrix[:-1].T,
+                          out=self._points_buffer)
+        return transform.apply(self.template_points)
+
+    def _sample(self, pixels, points, order, out):
+        if self._fast_sampling(order):
+            _sample_points_multichannel(pixels, points, order=order,
+                                        mode=self.mode, cval=self.cval,
+                                        out=out)
+        else:
+            out[...] = scipy_interpolation(pixels, points, order=order,
+                                           mode=self.mode, cval=self.cval)
+        # set any nan values to 0
+        out[np.isnan(out)] = 0
+        return out
+
+    def _sample_buffer(self, n_channels):
+        buffer = self._sample_buffers.get(n_channels)
+        if buffer is None:
+            buffer = np.empty([self.n_true_pixels, n_channels])
+            self._sample_buffers[n_channels] = buffer
+        return buffer
+
+    def sample(self, image, transform, out=None):
+        r"""
+        Sample the pixels of an image at the transformed template points.
+
+        Parameters
+        ----------
+        image : :map:`Image`
+            The image to be sampled.
+
+        transform : :map:`Transform`
+            Transform **from the template space back to the image**.
+
+        out : ``(n_true_pixels, n_channels)`` `ndarray`, optional
+            C-contiguous float buffer that the result is written into. If
+            ``None``, a buffer owned by this plan is used, which is
+            **overwritten on the next call**.
+
+        Returns
+        -------
+        sampled : ``(n_true_pixels, n_channels)`` `ndarray`
+            The pixel values sampled at each true pixel of the template.
+        """
+        points = self._transformed_points(transform)
+        if out is None:
+            out = self._sample_buffer(image.n_channels)
+        return self._sample(image._float_pixels(), points, self.order,
+                            out)
+
+    def warp(self, image, transform, warp_landmarks=False, out=None):
+        r"""
+        Return a copy of an image warped into the template mask. The result
+        is equal to that of :meth:`Image.warp_to_mask` called with this plan's
+        template mask and interpolation settings.
+
+        Parameters
+        ----------
+        image : :map:`Image`
+            The image to be warped.
+
+        transform : :map:`Transform`
+            Transform **from the template space back to the image**.
+            Defines, for each pixel location on the template, which pixel
+            location should be sampled from on the image.
+
+        warp_landmarks : `bool`, optional
+            If `True`, warped_image will have the same landmark dictionary
+            as image, but with each landmark updated to the warped position.
+
+        out : :map:`MaskedImage`, optional
+            A previously warped image from this plan (with the same number of
+            channels as ``image``) that is filled in place, rather than a
+            new image being allocated.
+
+        Returns
+        -------
+        warped_image : :map:`MaskedImage` or :map:`BooleanImage`
+            The warped image. A :map:`BooleanImage` if ``image`` is one.
+        """
+        points = self._transformed_points(transform)
+        mask = self.template_mask.mask
+        if isinstance(image, BooleanImage):
+            sampled = self._sample(image.pixels.astype(np.float), points, 0,
+                                   self._sample_buffer(1))
+            if out is None:
+                out = self.template_mask.copy()
+            out.pixels[mask] = sampled
+            return self._attach_landmarks(out, image, transform,
+                                          warp_landmarks)
+        if out is None:
+            out = MaskedImage.blank(self.template_mask.shape,
+                                    n_channels=image.n_channels,
+                                    mask=self.template_mask.copy())
+        elif out.n_channels != image.n_channels:
+            raise ValueError(
+                "out has {} channels, but the image being warped has "
+                "{}".format(out.n_channels, image.n_channels))
+        else:
+            # reset the mask, it may have been shrunk by a previous warp
+            out.mask.pixels[...] = self.template_mask.pixels
+        out.pixels[mask] = self._sample(image._float_pixels(), points,
+                                        self.order,
+                                        self._sample_buffer(image.n_channels))
+        if isinstance(image, MaskedImage):
+            # the mask of the image is warped through the same points
+            out.mask.pixels[mask] = self._sample(
+                image.mask.pixels.astype(np.float), points, 0,
+                self._sample_buffer(1))
+        return self._attach_landmarks(out, image, transform, warp_landmarks)
+
+    @staticmethod
+    def _attach_landmarks(warped_image, image, transform, warp_landmarks):
+        if warp_landmarks and image.has_landmarks:
+            warped_image.landmarks = image.landmarks
+            transform.pseudoinverse().apply_inplace(warped_image.landmarks)
+        if hasattr(image, 'path'):
+            warped_image.path = image.path
+        return warped_image
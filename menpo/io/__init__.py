@@ -1,7 +1,8 @@
-from .input import (import_image, import_images,
+from .input import (import_image, import_images, import_lazy_images,
                     import_builtin_asset,
                     import_landmark_file, import_landmark_files,
                     data_path_to, data_dir_path, ls_builtin_assets,
                     image_paths, landmark_file_paths)
-from .output import export_image, export_landmark_file
+from .output import (export_image, export_images, export_landmark_file,
+                     export_landmark_files, export_shard)
 
@@ -1,4 +1,4 @@
-from .base import (import_image, import_images,
+from .base import (import_image, import_images, import_lazy_images,
                    import_builtin_asset,
                    import_landmark_file, import_landmark_files,
                    data_path_to, data_dir_path, ls_builtin_assets,
@@ -1,10 +1,15 @@
 import abc
 import os
+from collections import deque
 from glob import glob
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
+import numpy as np
+
 from ..utils import _norm_path
 from menpo import menpo_src_dir_path
+from menpo.transform import Scale
 from menpo.visualize import progress_bar_str, print_dynamic
 
 
@@ -59,7 +64,62 @@ def same_name(asset):
             for p in landmark_file_paths(pattern)}
 
 
-def import_image(filepath, landmark_resolver=same_name, normalise=True):
+class _SameNameIndex(object):
+    r"""
+    Resolves the same landmarks as :func:`same_name` for many assets, but
+    lists each directory once rather than globbing once per asset.
+
+    The landmark files of a directory are indexed by every prefix of their
+    filename that ends before a ``'.'`` (i.e. every stem that
+    :func:`same_name` would match them with), so each lookup is a single
+    dictionary access.
+    """
+    def __init__(self):
+        self._directories = {}
+
+    def __call__(self, asset):
+        directory, filename = os.path.split(_norm_path(asset.path))
+        index = self._directories.get(directory)
+        if index is None:
+            index = self._index_directory(directory)
+            self._directories[directory] = index
+        return dict(index.get(os.path.splitext(filename)[0], {}))
+
+    @staticmethod
+    def _index_directory(directory):
+        index = {}
+        try:
+            filenames = sorted(os.listdir(directory))
+        except OSError:
+            filenames = []
+        for filename in filenames:
+            ext = os.path.splitext(filename)[-1]
+            if ext not in image_landmark_types:
+                continue
+            path = os.path.join(directory, filename)
+            if not os.path.isfile(path):
+                continue
+            stem_end = filename.find('.')
+            while stem_end != -1:
+                stem = index.setdefault(filename[:stem_end], {})
+                stem[ext[1:].upper()] = path
+                stem_end = filename.find('.', stem_end + 1)
+        return index
+
+
+def _batch_landmark_resolver(landmark_resolver):
+    r"""
+    The resolver to use when finding the landmarks of many assets. The
+    default :func:`same_name` resolver is replaced by a :class:`_SameNameIndex`,
+    any other resolver is returned as is.
+    """
+    if landmark_resolver is same_name:
+        return _SameNameIndex()
+    return landmark_resolver
+
+
+def import_image(filepath, landmark_resolver=same_name, normalise=True,
+                 dtype=np.float64, scale_hint=None):
     r"""
     Single image (and associated landmarks) importer.
 
@@ -80,13 +140,28 @@ def import_image(filepath, landmark_resolver=same_name, normalise=True):
     normalise : `bool`, optional
         If ``True``, normalise the image pixels between 0 and 1 and convert
         to floating point.
+    dtype : {`np.float64`, `np.float32`, `np.uint8`}, optional
+        The data-type of the pixels of normalised images. With `np.uint8`,
+        the pixels are kept as they are stored in the file and their
+        normalisation is deferred until an operation needs `float` pixels,
+        using an eighth of the memory (see :meth:`Image.compact_inplace`).
+        Images with more than 8 bits per channel are imported as
+        `np.float64` instead. Ignored if ``normalise`` is ``False``.
+    scale_hint : `float`, optional
+        If not ``None``, a hint that the image will be downscaled by this
+        factor (in ``(0, 1]``) after importing. JPEG images are then decoded
+        directly at the smallest of ``1/2``, ``1/4`` or ``1/8`` scale that is
+        no smaller than the hint (at a fraction of the cost of decoding the
+        full image), and the landmarks attached to them are rescaled to
+        match. Other formats are decoded at full size.
 
     Returns
     -------
     images : :map:`Image` or list of
         An instantiated :map:`Image` or subclass thereof or a list of images.
     """
-    kwargs = {'normalise': normalise}
+    kwargs = {'normalise': normalise, 'dtype': dtype,
+              'scale_hint': scale_hint}
     return _import(filepath, image_types,
                    landmark_ext_map=image_landmark_types,
                    landmark_resolver=landmark_resolver,
@@ -114,7 +189,9 @@ def import_landmark_file(filepath, asset=None):
 
 
 def import_images(pattern, max_images=None, landmark_resolver=same_name,
-                  normalise=True, verbose=False):
+                  normalise=True, verbose=False, n_workers=None,
+                  prefetch=None, dtype=np.float64, manifest=None,
+                  scale_hint=None):
     r"""
     Multiple image import generator.
 
@@ -143,6 +220,41 @@ def import_images(pattern, max_images=None, landmark_resolver=same_name,
         to ``np.float``.
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported.
+    n_workers : `int`, optional
+        If greater than ``1``, images are decoded (and their landmarks
+        parsed) by a pool of ``n_workers`` threads, ahead of them being
+        yielded. Images are still yielded in sorted order. Note that the
+        ``landmark_resolver`` will then be called from the worker threads.
+    prefetch : `int`, optional
+        The maximum number of images that are imported ahead of the one
+        being yielded when ``n_workers > 1``, which bounds the memory used.
+        If ``None``, ``2 * n_workers`` is used.
+    dtype : {`np.float64`, `np.float32`, `np.uint8`}, optional
+        The data-type of the pixels of normalised images. With `np.uint8`,
+        the pixels are kept as they are stored in the file and their
+        normalisation is deferred until an operation needs `float` pixels,
+        using an eighth of the memory (see :meth:`Image.compact_inplace`).
+        Images with more than 8 bits per channel are imported as
+        `np.float64` instead. Ignored if ``normalise`` is ``False``.
+    manifest : `str` or ``True``, optional
+        If not ``None``, the path of a manifest file that records the
+        filepaths matching the glob (and the
+        landmark filepaths found by the ``landmark_resolver``) and the
+        modification times of the directories searched. Later imports reuse
+        it, only searching the dataset again if the entries of a directory
+        have changed (a directory is only listed again if its modification
+        time has changed). If ``True``, a ``.menpo_manifest.json`` file is
+        written in the directory the glob starts from. If the manifest can not be written, or the
+        ``landmark_resolver`` is not a top level function of a module (e.g.
+        a lambda), a warning is raised and the import continues without
+        it.
+    scale_hint : `float`, optional
+        If not ``None``, a hint that the images will be downscaled by this
+        factor (in ``(0, 1]``) after importing. JPEG images are then decoded
+        directly at the smallest of ``1/2``, ``1/4`` or ``1/8`` scale that is
+        no smaller than the hint (at a fraction of the cost of decoding the
+        full image), and the landmarks attached to them are rescaled to
+        match. Other formats are decoded at full size.
 
     Yields
     ------
@@ -163,17 +275,124 @@ def import_images(pattern, max_images=None, landmark_resolver=same_name,
         >>>    im.crop_inplace((0, 0), (100, 100))  # crop to a sensible size as we go
         >>>    images.append(im)
     """
-    kwargs = {'normalise': normalise}
+    kwargs = {'normalise': normalise, 'dtype': dtype,
+              'scale_hint': scale_hint}
     for asset in _import_glob_generator(pattern, image_types,
                                         max_assets=max_images,
                                         landmark_resolver=landmark_resolver,
                                         landmark_ext_map=image_landmark_types,
                                         verbose=verbose,
-                                        importer_kwargs=kwargs):
+                                        importer_kwargs=kwargs,
+                                        n_workers=n_workers,
+                                        prefetch=prefetch,
+                                        manifest=manifest):
         yield asset
 
 
-def import_landmark_files(pattern, max_landmarks=None, verbose=False):
+def import_lazy_images(pattern, max_images=None, landmark_resolver=same_name,
+                       normalise=True, cache_size=0, dtype=np.float64,
+                       manifest=None, scale_hint=None):
+    r"""
+    Multiple image importer that returns a lazy, indexable collection.
+
+    Unlike :map:`import_images`, no image is imported up front. The returned
+    :map:`LazyImageList` only holds the path of each image and of its
+    landmark files, and imports an image when it is accessed. This allows
+    random access (e.g. shuffled minibatches) over datasets too large to
+    hold in memory.
+
+    Note that the landmark files are resolved before the images are
+    imported, so the ``landmark_resolver`` is passed an object that only
+    has the ``path`` of the image (which is all the default resolver needs).
+
+    Parameters
+    ----------
+    pattern : `str`
+        The glob path pattern to search for images.
+    max_images : positive `int`, optional
+        If not ``None``, only import the first ``max_images`` found. Else,
+        import all.
+    landmark_resolver : `function`, optional
+        This function will be used to find landmarks for each
+        image. The function should take one argument (an object with the
+        ``path`` of the image) and return a dictionary of the form
+        ``{'group_name': 'landmark_filepath'}``.
+        Default finds landmarks with the same name as the image file.
+    normalise : `bool`, optional
+        If ``True``, normalise the images between 0.0 and 1.0 and convert
+        to ``np.float``.
+    cache_size : `int`, optional
+        The number of most recently accessed images that are kept in memory.
+    dtype : {`np.float64`, `np.float32`, `np.uint8`}, optional
+        The data-type of the pixels of normalised images. With `np.uint8`,
+        the pixels are kept as they are stored in the file and their
+        normalisation is deferred until an operation needs `float` pixels,
+        using an eighth of the memory (see :meth:`Image.compact_inplace`).
+        Images with more than 8 bits per channel are imported as
+        `np.float64` instead. Ignored if ``normalise`` is ``False``.
+    manifest : `str` or ``True``, optional
+        If not ``None``, the path of a manifest file that records the
+        filepaths matching the glob (and the
+        landmark filepaths found by the ``landmark_resolver``) and the
+        modification times of the directories searched. Later imports reuse
+        it, only searching the dataset again if the entries of a directory
+        have changed (a directory is only listed again if its modification
+        time has changed). If ``True``, a ``.menpo_manifest.json`` file is
+        written in the directory the glob starts from. If the manifest can not be written, or the
+        ``landmark_resolver`` is not a top level function of a module (e.g.
+        a lambda), a warning is raised and the import continues without
+        it.
+    scale_hint : `float`, optional
+        If not ``None``, a hint that the images will be downscaled by this
+        factor (in ``(0, 1]``) after importing. JPEG images are then decoded
+        directly at the smallest of ``1/2``, ``1/4`` or ``1/8`` scale that is
+        no smaller than the hint (at a fraction of the cost of decoding the
+        full image), and the landmarks attached to them are rescaled to
+        match. Other formats are decoded at full size.
+
+    Returns
+    -------
+    images : :map:`LazyImageList`
+        The images found to match the glob pattern provided, in sorted
+        order.
+
+    Raises
+    ------
+    ValueError
+        If no images are found at the provided glob.
+
+    Examples
+    --------
+    Iterate over shuffled minibatches of a huge collection of images
+
+        >>> images = import_lazy_images('./massive_image_db/*')
+        >>> order = np.random.permutation(len(images))
+        >>> for i in range(0, len(images), 100):
+        >>>     batch = list(images[order[i:i + 100]])
+    """
+    if manifest is not None:
+        assets = resolve_with_manifest(manifest, pattern, image_types,
+                                       landmark_resolver=landmark_resolver)
+        if max_images:
+            assets = assets[:max_images]
+    else:
+        filepaths = sorted(glob_with_suffix(pattern, image_types))
+        if max_images:
+            filepaths = filepaths[:max_images]
+        landmark_resolver = _batch_landmark_resolver(landmark_resolver)
+        assets = [(f, landmark_resolver(_PathAsset(f))) for f in filepaths]
+    if len(assets) == 0:
+        raise ValueError('The glob {} yields no assets'.format(pattern))
+    filepaths = [f for f, _ in assets]
+    landmark_paths = [{} if lm_paths is None else lm_paths
+                      for _, lm_paths in assets]
+    return LazyImageList(filepaths, landmark_paths, normalise=normalise,
+                         dtype=dtype, scale_hint=scale_hint,
+                         cache_size=cache_size)
+
+
+def import_landmark_files(pattern, max_landmarks=None, verbose=False,
+                          manifest=None, n_workers=None, prefetch=None):
     r"""Multiple landmark file import generator.
 
     Note that this is a generator function.
@@ -189,6 +408,23 @@ def import_landmark_files(pattern, max_landmarks=None, verbose=False):
 
     verbose : `bool`, optional
         If ``True`` progress of the importing will be dynamically reported.
+    manifest : `str` or ``True``, optional
+        If not ``None``, the path of a manifest file that records the
+        filepaths matching the glob and the modification times of the
+        directories searched. Later imports reuse it, only searching the
+        dataset again if the entries of a directory have changed (a
+        directory is only listed again if its modification time has
+        changed). If ``True``, a ``.menpo_manifest.json`` file is written in
+        the directory the glob starts from. If the manifest can not be written, a warning is raised
+        and the import continues without it.
+    n_workers : `int`, optional
+        If greater than ``1``, the landmark files are parsed by a pool of
+        ``n_workers`` threads, ahead of them being yielded. Landmarks are
+        still yielded in sorted order.
+    prefetch : `int`, optional
+        The maximum number of landmark files that are parsed ahead of the one
+        being yielded when ``n_workers > 1``. If ``None``, ``2 * n_workers``
+        is used.
 
     Yields
     ------
@@ -203,7 +439,9 @@ def import_landmark_files(pattern, max_landmarks=None, verbose=False):
     """
     for asset in _import_glob_generator(pattern, image_landmark_types,
                                         max_assets=max_landmarks,
-                                        verbose=verbose):
+                                        verbose=verbose, manifest=manifest,
+                                        n_workers=n_workers,
+                                        prefetch=prefetch):
         yield asset
 
 
@@ -279,8 +517,20 @@ def landmark_file_paths(pattern):
 def _import_glob_generator(pattern, extension_map, max_assets=None,
                            landmark_resolver=same_name,
                            landmark_ext_map=None, importer_kwargs=None,
-                           verbose=False):
-    filepaths = list(glob_with_suffix(pattern, extension_map))
+                           verbose=False, n_workers=None, prefetch=None,
+                           manifest=None):
+    if manifest is not None:
+        if landmark_ext_map is None:
+            landmark_resolver = None
+        assets = resolve_with_manifest(manifest, pattern, extension_map,
+                                       landmark_resolver=landmark_resolver)
+        filepaths = [f for f, _ in assets]
+        if landmark_resolver is not None:
+            # the landmarks recorded in the manifest are used instead
+            landmark_paths = dict(assets)
+            landmark_resolver = lambda x: landmark_paths.get(str(x.path))
+    else:
+        filepaths = list(glob_with_suffix(pattern, extension_map))
     if max_assets:
         filepaths = filepaths[:max_assets]
     n_files = len(filepaths)
@@ -289,7 +539,9 @@ def _import_glob_generator(pattern, extension_map, max_assets=None,
     for i, asset in enumerate(_multi_import_generator(filepaths, extension_map,
                                          landmark_resolver=landmark_resolver,
                                          landmark_ext_map=landmark_ext_map,
-                                         importer_kwargs=importer_kwargs)):
+                                         importer_kwargs=importer_kwargs,
+                                         n_workers=n_workers,
+                                         prefetch=prefetch)):
         if verbose:
             print_dynamic('- Loading {} assets: {}'.format(
                 n_files, progress_bar_str(float(i + 1) / n_files,
@@ -359,6 +611,10 @@ def _import(filepath, extensions_map, keep_importer=False,
     for x in built_objects:
         x.path = path
 
+    # the importer may have decoded the asset at a different scale to the
+    # one the landmarks are defined in
+    landmark_scale = getattr(importer, 'landmark_scale', None)
+
     # handle landmarks
     if landmark_ext_map is not None:
         for x in built_objects:
@@ -366,10 +622,8 @@ def _import(filepath, extensions_map, keep_importer=False,
             # paths
             if lm_paths is None:
                 continue
-            for group_name, lm_path in lm_paths.iteritems():
-                lms = _import(lm_path, landmark_ext_map, asset=x)
-                if x.n_dims == lms.n_dims:
-                    x.landmarks[group_name] = lms
+            _attach_landmarks(x, lm_paths, landmark_ext_map,
+                              scale=landmark_scale)
 
     # undo list-ification (if we added it!)
     if len(built_objects) == 1:
@@ -381,9 +635,35 @@ def _import(filepath, extensions_map, keep_importer=False,
         return built_objects
 
 
+def _attach_landmarks(asset, lm_paths, landmark_ext_map, scale=None):
+    r"""
+    Imports the landmark files at `lm_paths` and attaches them to the asset
+    (skipping any whose dimensionality does not match the asset's).
+
+    Parameters
+    ----------
+    asset : :map:`Landmarkable`
+        The asset the landmarks are attached to.
+    lm_paths : dict
+        A dictionary of the form {'group_name': 'landmark_filepath'}
+    landmark_ext_map : dictionary (str, :map:`Importer`)
+        A map from extensions to the landmark importers.
+    scale : ``(n_dims,)`` ndarray, optional
+        If not None, the landmarks are scaled by this (per axis) factor
+        before being attached, as the asset was imported at this scale.
+    """
+    for group_name, lm_path in lm_paths.iteritems():
+        lms = _import(lm_path, landmark_ext_map, asset=asset)
+        if asset.n_dims == lms.n_dims:
+            if scale is not None:
+                Scale(scale).apply_inplace(lms.lms)
+            asset.landmarks[group_name] = lms
+
+
 def _multi_import_generator(filepaths, extensions_map, keep_importers=False,
                             landmark_resolver=same_name,
-                            landmark_ext_map=None, importer_kwargs=None):
+                            landmark_ext_map=None, importer_kwargs=None,
+                            n_workers=None, prefetch=None):
     r"""
     Generator yielding assets from the filepaths provided.
 
@@ -412,6 +692,12 @@ def _multi_import_generator(filepaths, extensions_map, keep_importers=False,
         return a dictionary of the form {'group_name': 'landmark_filepath'}
     importer_kwargs: dict, optional
         kwargs to be supplied to the importer if not None
+    n_workers: int, optional
+        If greater than 1, the files are imported by a pool of this many
+        threads. Assets are still yielded in alphabetical order.
+    prefetch: int, optional
+        The maximum number of files imported ahead of the one being yielded
+        when `n_workers` is greater than 1. If None, `2 * n_workers`.
 
     Yields
     ------
@@ -422,11 +708,19 @@ def _multi_import_generator(filepaths, extensions_map, keep_importers=False,
         yielded asset.
     """
     importer = None
-    for f in sorted(filepaths):
-        imported = _import(f, extensions_map, keep_importer=keep_importers,
-                           landmark_resolver=landmark_resolver,
-                           landmark_ext_map=landmark_ext_map,
-                           importer_kwargs=importer_kwargs)
+    import_kwargs = {'keep_importer': keep_importers,
+                     'landmark_resolver': _batch_landmark_resolver(
+                         landmark_resolver),
+                     'landmark_ext_map': landmark_ext_map,
+                     'importer_kwargs': importer_kwargs}
+    if n_workers is not None and n_workers > 1:
+        imports = _parallel_import_generator(sorted(filepaths),
+                                             extensions_map, import_kwargs,
+                                             n_workers, prefetch=prefetch)
+    else:
+        imports = (_import(f, extensions_map, **import_kwargs)
+                   for f in sorted(filepaths))
+    for imported in imports:
         if keep_importers:
             assets, importer = imported
         else:
@@ -448,6 +742,53 @@ def _multi_import_generator(filepaths, extensions_map, keep_importers=False,
             yield imported
 
 
+def _parallel_import_generator(filepaths, extensions_map, import_kwargs,
+                               n_workers, prefetch=None):
+    r"""
+    Generator yielding the result of calling :func:`_import` on each of the
+    filepaths in turn, where the imports are run ahead of time by a pool of
+    threads. At most `prefetch` imports are pending or held at once, so
+    memory use is bounded however slowly the results are consumed.
+
+    Parameters
+    ----------
+    filepaths : list of strings
+        The filepaths to import, in the order that they are yielded.
+    extensions_map : dictionary (String, :class:`menpo.io.base.Importer`)
+        A map from extensions to importers.
+    import_kwargs : dict
+        kwargs to be supplied to :func:`_import` for every filepath.
+    n_workers : int
+        The number of threads importing files.
+    prefetch : int, optional
+        The maximum number of files imported ahead of the one being yielded.
+        If None, `2 * n_workers`.
+
+    Yields
+    ------
+    imported :
+        The result of :func:`_import` for each filepath. Exceptions raised
+        by an import are re-raised when its result is reached.
+    """
+    if prefetch is None:
+        prefetch = 2 * n_workers
+    pool = ThreadPool(n_workers)
+    pending = deque()
+    try:
+        for f in filepaths:
+            # wait for the oldest import before starting another one
+            while len(pending) >= max(prefetch, 1):
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(_import, (f, extensions_map),
+                                            import_kwargs))
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        # stop any outstanding imports if the consumer stopped early (or
+        # an import failed)
+        pool.terminate()
+
+
 def _pathlib_glob_for_pattern(pattern):
     r"""Generator for glob matching a string path pattern
 
@@ -464,6 +805,33 @@ def _pathlib_glob_for_pattern(pattern):
     ------
     Path : A path to a file matching the provided pattern.
 
+    Raises
+    ------
+    ValueError
+        If the pattern doesn't contain a '*' wildcard and is not a directory
+    """
+    preglob, pattern = _split_glob_pattern(pattern)
+    p = Path(preglob)
+    return sorted(p.glob(str(pattern)))
+
+
+def _split_glob_pattern(pattern):
+    r"""
+    Split a path pattern into the directory that the glob starts from and
+    the glob pattern relative to it (see :func:`_pathlib_glob_for_pattern`).
+
+    Parameters
+    ----------
+    pattern : `str`
+        Path including glob patterns.
+
+    Returns
+    -------
+    preglob : `str`
+        The directory the glob is applied from.
+    pattern : `str`
+        The glob pattern, relative to `preglob`.
+
     Raises
     ------
     ValueError
@@ -487,8 +855,7 @@ def _pathlib_glob_for_pattern(pattern):
         # to the nearest dir and add the reminder to the pattern
         preglob, pattern_prefix = os.path.split(preglob)
         pattern = pattern_prefix + pattern
-    p = Path(preglob)
-    return sorted(p.glob(str(pattern)))
+    return preglob, pattern
 
 
 def glob_with_suffix(pattern, extensions_map):
@@ -705,3 +1072,5 @@ class Importer(object):
 
 # Avoid circular imports
 from menpo.io.input.extensions import image_landmark_types, image_types
+from menpo.io.input.lazy import LazyImageList, _PathAsset
+from menpo.io.input.manifest import resolve_with_manifest
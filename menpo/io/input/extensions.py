@@ -2,6 +2,7 @@
 from .landmark import LM2Importer, LJSONImporter
 from .image import PILImporter, PILGIFImporter
 from .landmark_image import ImageASFImporter, ImagePTSImporter
+from .shard import ShardImporter
 
 
 image_types = {'.bmp': PILImporter,
@@ -27,7 +28,8 @@ image_types = {'.bmp': PILImporter,
                '.tiff': PILImporter,
                '.xbm': PILImporter,
                # '.pdf': PILImporter,
-               '.xpm': PILImporter}
+               '.xpm': PILImporter,
+               '.mshard': ShardImporter}
 
 image_landmark_types = {'.asf': ImageASFImporter,
                         '.lm2': LM2Importer,
@@ -26,11 +26,38 @@ class PILImporter(Importer):
         If ``True``, normalise between 0.0 and 1.0 and convert to float. If
         ``False`` just pass whatever PIL imports back (according
         to types rules outlined in constructor).
+    dtype : {`np.float64`, `np.float32`, `np.uint8`}, optional
+        The data-type of the pixels of normalised images. With `np.uint8`,
+        the pixels are kept as they are stored in the file and their
+        normalisation is deferred until an operation needs `float` pixels
+        (see :meth:`Image.compact_inplace`). Images with more than 8 bits
+        per channel (mode ``I``) are imported as `np.float64` instead.
+        Ignored if ``normalise`` is ``False``.
+    scale_hint : `float`, optional
+        If not ``None``, JPEG images are decoded at the smallest of ``1/2``,
+        ``1/4`` or ``1/8`` scale that is no smaller than this scale.
+
+    Attributes
+    ----------
+    landmark_scale : ``(2,)`` `ndarray` or ``None``
+        After :meth:`build`, the scale of the decoded image relative to the
+        image in the file (for each axis), if they differ.
     """
-    def __init__(self, filepath, normalise=True):
+    def __init__(self, filepath, normalise=True, dtype=np.float64,
+                 scale_hint=None):
         super(PILImporter, self).__init__(filepath)
         self._pil_image = None
         self.normalise = normalise
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float64, np.float32, np.uint8):
+            raise ValueError("Normalised images can only be imported as "
+                             "np.float64, np.float32 or np.uint8, "
+                             "not {}".format(self.dtype))
+        if scale_hint is not None and not 0 < scale_hint <= 1:
+            raise ValueError("The scale hint must be in the range (0, 1], "
+                             "not {}".format(scale_hint))
+        self.scale_hint = scale_hint
+        self.landmark_scale = None
 
     def build(self):
         r"""
@@ -38,6 +65,8 @@ class PILImporter(Importer):
         create a class.
         """
         self._pil_image = PILImage.open(self.filepath)
+        if self.scale_hint is not None:
+            self._draft()
         mode = self._pil_image.mode
         if mode == 'RGBA':
             # RGB with Alpha Channel
@@ -62,13 +91,41 @@ class PILImporter(Importer):
             image = Image(self._pil_to_numpy(self.normalise, convert='RGB'))
         else:
             raise ValueError('Unexpected mode for PIL: {}'.format(mode))
+        if mode != '1':
+            self._defer_normalisation(image)
         return image
 
+    def _draft(self):
+        r"""
+        Configure the decoder to decode at a reduced scale (only supported by
+        JPEG images) that is no smaller than the scale hint, recording the
+        scale that is actually used.
+        """
+        width, height = self._pil_image.size
+        self._pil_image.draft(self._pil_image.mode,
+                              (int(np.ceil(width * self.scale_hint)),
+                               int(np.ceil(height * self.scale_hint))))
+        d_width, d_height = self._pil_image.size
+        if (d_width, d_height) != (width, height):
+            self.landmark_scale = np.array([d_height / float(height),
+                                            d_width / float(width)])
+
+    def _defer_normalisation(self, image):
+        if self.normalise and image.pixels.dtype == np.uint8:
+            image._deferred_normalisation = True
+
     def _pil_to_numpy(self, normalise, convert=None):
-        dtype = np.float if normalise else None
         p = self._pil_image.convert(convert) if convert else self._pil_image
+        if normalise and self.dtype == np.uint8:
+            if p.mode in ('L', 'RGB'):
+                # the normalisation is deferred (see _defer_normalisation)
+                return np.array(p, dtype=np.uint8, copy=True)
+            # the values of other modes (e.g. 16 bit) do not fit in uint8
+            dtype = np.dtype(np.float64)
+        else:
+            dtype = self.dtype if normalise else None
         np_pixels = np.array(p, dtype=dtype, copy=True)
-        return np_pixels / 255.0 if normalise else np_pixels
+        return np_pixels / dtype.type(255) if normalise else np_pixels
 
 
 class PILGIFImporter(PILImporter):
@@ -87,10 +144,19 @@ class PILGIFImporter(PILImporter):
         If ``True``, normalise between 0.0 and 1.0 and convert to float. If
         ``False`` just pass whatever PIL imports back (according
         to types rules outlined in constructor).
+    dtype : {`np.float64`, `np.float32`, `np.uint8`}, optional
+        The data-type of the pixels of normalised images. With `np.uint8`,
+        the pixels are kept as they are stored in the file and their
+        normalisation is deferred until an operation needs `float` pixels
+        (see :meth:`Image.compact_inplace`). Ignored if ``normalise`` is
+        ``False``.
     """
 
-    def __init__(self, filepath, normalise=True):
-        super(PILGIFImporter, self).__init__(filepath, normalise=normalise)
+    def __init__(self, filepath, normalise=True, dtype=np.float64,
+                 scale_hint=None):
+        super(PILGIFImporter, self).__init__(filepath, normalise=normalise,
+                                             dtype=dtype,
+                                             scale_hint=scale_hint)
 
     def build(self):
         r"""
@@ -107,7 +173,9 @@ class PILGIFImporter(PILImporter):
                 while 1:  # Keep looping until we hit the end of the GIF
                     np_pixels = self._pil_to_numpy(self.normalise,
                                                    convert='RGB')
-                    images.append(Image(np_pixels))
+                    image = Image(np_pixels)
+                    self._defer_normalisation(image)
+                    images.append(image)
                     # Seek to the next frame
                     self._pil_image.seek(self._pil_image.tell() + 1)
             except EOFError:
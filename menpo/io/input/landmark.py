@@ -10,6 +10,37 @@ from menpo.transform import Scale
 from .base import Importer
 
 
+def _parse_rows(lines, n_columns):
+    r"""
+    Parse the first `n_columns` whitespace separated numbers of each line in
+    to a float array, using a single call to :func:`np.fromstring` when every
+    line only holds numbers and has the same number of them.
+
+    Parameters
+    ----------
+    lines : list of `str`
+        The lines to parse.
+    n_columns : `int`
+        The number of values parsed from the start of each line.
+
+    Returns
+    -------
+    rows : ``(n_lines, n_columns)`` `ndarray`
+        The values of each line.
+    """
+    if len(lines) == 0:
+        return np.empty([0, n_columns])
+    n_values = len(lines[0].split())
+    if (n_values >= n_columns and
+            all(len(l.split()) == n_values for l in lines[1:])):
+        values = np.fromstring(' '.join(lines), dtype=np.float, sep=' ')
+        # parsing stops at the first token that is not a number
+        if values.size == n_values * len(lines):
+            return values.reshape([len(lines), n_values])[:, :n_columns]
+    # ragged or non-numeric lines - split them one at a time
+    return np.array([l.split()[:n_columns] for l in lines], dtype=np.float)
+
+
 class LandmarkImporter(Importer):
     """
     Abstract base class for importing landmarks.
@@ -114,17 +145,12 @@ class ASFImporter(LandmarkImporter):
         # Pop the last element of the list for the image_name
         image_name = landmarks.pop()
 
-        xs = np.empty([count, 1])
-        ys = np.empty([count, 1])
-        connectivity = np.empty([count, 2], dtype=np.int)
-        for i in xrange(count):
-            # Though unpacked, they are still all strings
-            # Only unpack the first 7
-            (path_num, path_type, xpos, ypos,
-             point_num, connects_from, connects_to) = landmarks[i].split()[:7]
-            xs[i, ...] = float(xpos)
-            ys[i, ...] = float(ypos)
-            connectivity[i, ...] = [int(connects_from), int(connects_to)]
+        # Each line is: path_num, path_type, xpos, ypos, point_num,
+        # connects_from, connects_to
+        rows = _parse_rows(landmarks[:count], 7)
+        xs = rows[:, 2:3]
+        ys = rows[:, 3:4]
+        connectivity = rows[:, 5:7].astype(np.int)
 
         points = self._build_points(xs, ys)
         if asset is not None:
@@ -180,19 +206,17 @@ class PTSImporter(LandmarkImporter):
         pass
 
     def _parse_format(self, asset=None):
-        f = open(self.filepath, 'r')
-        for line in f:
-            if line.split()[0] == '{':
-                break
-        xs = []
-        ys = []
-        for line in f:
-            if line.split()[0] != '}':
-                xpos, ypos = line.split()[0:2]
-                xs.append(xpos)
-                ys.append(ypos)
-        xs = np.array(xs, dtype=np.float).reshape((-1, 1))
-        ys = np.array(ys, dtype=np.float).reshape((-1, 1))
+        with open(self.filepath, 'r') as f:
+            landmarks = f.read()
+        # The points are the lines between the braces
+        start = landmarks.index('{') + 1
+        end = landmarks.find('}', start)
+        if end == -1:
+            end = len(landmarks)
+        rows = _parse_rows([l for l in landmarks[start:end].splitlines()
+                            if l.strip()], 2)
+        xs = rows[:, 0:1]
+        ys = rows[:, 1:2]
         # PTS landmarks are 1-based, need to convert to 0-based (subtract 1)
         points = self._build_points(xs - 1, ys - 1)
 
@@ -272,23 +296,13 @@ class LM2Importer(LandmarkImporter):
                               "Expected a list of coordinates beginning with "
                               "'2D Image coordinates:' "
                               "but found '{0}'".format(coords_str))
-        xs = []
-        ys = []
-        for i in xrange(num_points):
-            p = landmark_text.pop(0).split()
-            xs.append(float(p[0]))
-            ys.append(float(p[1]))
-
-        xs = np.array(xs, dtype=np.float).reshape((-1, 1))
-        ys = np.array(ys, dtype=np.float).reshape((-1, 1))
+        rows = _parse_rows(landmark_text[:num_points], 2)
 
         # Flip the x and y
-        self.pointcloud = PointCloud(np.hstack([ys, xs]))
+        self.pointcloud = PointCloud(rows[:, 1::-1])
         # Create the mask whereby there is one landmark per label
         # (identity matrix)
-        masks = np.eye(num_points).astype(np.bool)
-        masks = np.vsplit(masks, num_points)
-        masks = [np.squeeze(m) for m in masks]
+        masks = np.eye(num_points, dtype=np.bool)
         self.labels_to_masks = OrderedDict(zip(labels, masks))
 
 
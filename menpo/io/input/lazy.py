@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from .base import _import, _attach_landmarks
+from .extensions import image_types, image_landmark_types
+
+
+class LazyImageList(object):
+    r"""
+    An indexable collection of images that are only decoded when they are
+    accessed.
+
+    Only the filepaths of each image and of its landmark files are held.
+    Indexing with an `int` imports the image (and attaches its landmarks),
+    then passes it through each of the functions that have been mapped over
+    the collection. Indexing with a `slice` or a sequence of `int` (e.g. a
+    shuffled minibatch) returns a new :map:`LazyImageList` without importing
+    anything.
+
+    Parameters
+    ----------
+    filepaths : list of `str`
+        The filepaths of the images.
+    landmark_paths : list of `dict`
+        For each image, a dictionary of the form
+        ``{'group_name': 'landmark_filepath'}``.
+    normalise : `bool`, optional
+        If ``True``, normalise the image pixels between 0 and 1 and convert
+        to floating point.
+    cache_size : `int`, optional
+        The number of most recently accessed items that are kept, so that
+        accessing them again does not import them again. Note that a cached
+        item is returned as is (not copied) while it is in the cache.
+    dtype : {`np.float64`, `np.float32`, `np.uint8`}, optional
+        The data-type of the pixels of normalised images (see
+        :func:`import_lazy_images`).
+    scale_hint : `float`, optional
+        If not ``None``, JPEG images are decoded at a reduced scale (see
+        :func:`import_lazy_images`).
+    """
+    def __init__(self, filepaths, landmark_paths, normalise=True,
+                 cache_size=0, dtype=np.float64, scale_hint=None):
+        if len(filepaths) != len(landmark_paths):
+            raise ValueError("{} filepaths but {} sets of landmark "
+                             "paths".format(len(filepaths),
+                                            len(landmark_paths)))
+        self.filepaths = list(filepaths)
+        self.landmark_paths = list(landmark_paths)
+        self.normalise = normalise
+        self.cache_size = cache_size
+        self.dtype = dtype
+        self.scale_hint = scale_hint
+        self._functions = []
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.filepaths)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._subset(range(len(self))[index])
+        if not isinstance(index, (int, long, np.integer)):
+            # a sequence of indices
+            return self._subset(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("index {} is out of range for {} "
+                             "images".format(index, len(self)))
+        item = self._cache.get(index)
+        if item is not None:
+            # mark as the most recently used
+            del self._cache[index]
+        else:
+            item = self._load(index)
+        if self.cache_size > 0:
+            self._cache[index] = item
+            if len(self._cache) > self.cache_size:
+                # drop the least recently used
+                self._cache.popitem(last=False)
+        return item
+
+    def _load(self, index):
+        image, importer = _import(
+            self.filepaths[index], image_types, keep_importer=True,
+            landmark_ext_map=None,
+            importer_kwargs={'normalise': self.normalise,
+                             'dtype': self.dtype,
+                             'scale_hint': self.scale_hint})
+        _attach_landmarks(image, self.landmark_paths[index],
+                          image_landmark_types,
+                          scale=getattr(importer, 'landmark_scale', None))
+        for f in self._functions:
+            image = f(image)
+        return image
+
+    def _subset(self, indices):
+        new = LazyImageList([self.filepaths[i] for i in indices],
+                            [self.landmark_paths[i] for i in indices],
+                            normalise=self.normalise,
+                            cache_size=self.cache_size,
+                            dtype=self.dtype, scale_hint=self.scale_hint)
+        new._functions = list(self._functions)
+        return new
+
+    def map(self, f):
+        r"""
+        Return a new collection whose items are the items of this collection
+        passed through `f`. Nothing is imported until an item is accessed,
+        and successive maps are composed in the order they were applied.
+
+        Parameters
+        ----------
+        f : `callable`
+            Called with each item on access, returning the new item.
+
+        Returns
+        -------
+        mapped : :map:`LazyImageList`
+            The mapped collection.
+        """
+        new = self._subset(range(len(self)))
+        new._functions.append(f)
+        return new
+
+    def __str__(self):
+        return 'Lazy collection of {} images'.format(len(self))
+
+
+class _PathAsset(object):
+    r"""
+    Stands in for an asset when resolving landmark paths before the asset is
+    imported.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
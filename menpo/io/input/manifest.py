@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from fnmatch import fnmatch
+from warnings import warn
+
+from pathlib import Path
+
+from ..utils import _norm_path
+from .base import (_split_glob_pattern, glob_with_suffix,
+                   _batch_landmark_resolver)
+from .lazy import _PathAsset
+
+# bumped whenever the layout of the manifest file changes
+MANIFEST_VERSION = 3
+# the coarsest resolution (in seconds) of the modification times of the
+# filesystems that manifests are written to (e.g. FAT)
+MTIME_RESOLUTION = 2
+# the filename of a manifest written in the directory being globbed
+DEFAULT_MANIFEST_NAME = '.menpo_manifest.json'
+
+
+def resolve_with_manifest(manifest_path, pattern, extensions_map,
+                          landmark_resolver=None):
+    r"""
+    Glob for the assets matching a pattern (and resolve their landmark
+    files), reusing the results recorded in a manifest file.
+
+    For each glob, the manifest records the matched filepaths, their
+    landmark filepaths and the modification time (and a hash of the names of
+    the entries) of every directory that is searched. If none of these
+    directories have changed, the recorded filepaths are returned after only
+    checking the modification time of each directory. Otherwise the glob is
+    run again, but the landmark filepaths are only resolved again for the
+    assets in the directories that have changed. The manifest is then
+    updated.
+
+    A directory whose modification time has changed, or is too close to the
+    time the manifest was written to tell apart later changes (timestamps
+    are coarse on many filesystems), is listed again and only counts as
+    changed if its entries have. Note that this means that the directory
+    the manifest is written in is listed by every import, as writing the
+    manifest modifies it.
+
+    Parameters
+    ----------
+    manifest_path : `str` or ``True``
+        The path of the manifest file. If ``True``, a file named
+        ``.menpo_manifest.json`` in the directory the glob starts from is
+        used. The file is created if it does not exist. If it can not be
+        written (e.g. the directory is read-only), a warning is raised and
+        the assets are returned without caching them.
+    pattern : `str`
+        The glob path pattern to search for assets.
+    extensions_map : dictionary (String, :class:`menpo.io.base.Importer`)
+        A map from extensions to importers. Only the files with one of these
+        extensions are returned.
+    landmark_resolver : `function`, optional
+        If not ``None``, the function used to find the landmarks of each
+        asset (see :func:`import_images`). It is recorded by its module and
+        name, so it must be a function defined at the top level of a module.
+        For any other resolver (e.g. a lambda, a partial or a closure), a
+        warning is raised and the manifest is not used.
+
+    Returns
+    -------
+    assets : list of (`str`, `dict` or ``None``)
+        The sorted filepaths matching the pattern, each with the landmark
+        filepaths returned by the ``landmark_resolver`` (or ``None``).
+    """
+    resolver_name = _function_name(landmark_resolver)
+    if resolver_name is None:
+        warn('The landmark resolver {} is not a top level function of a '
+             'module, so it can not be recorded in a manifest. The manifest '
+             'is not used.'.format(landmark_resolver))
+        return _resolve_assets(pattern, extensions_map, landmark_resolver, {})
+    preglob, glob = _split_glob_pattern(pattern)
+    preglob = str(Path(preglob))
+    if manifest_path is True:
+        manifest_path = os.path.join(preglob, DEFAULT_MANIFEST_NAME)
+    manifest_path = _norm_path(manifest_path)
+    manifest, written = _load_manifest(manifest_path)
+    key = '{} {} {}'.format(os.path.join(preglob, glob),
+                            ','.join(sorted(extensions_map)), resolver_name)
+    entry = manifest['globs'].get(key)
+    if entry is not None:
+        changed = set(d for d, state in entry['directories'].items()
+                      if _directory_changed(d, state, written, manifest_path))
+        if len(changed) == 0:
+            return [(path, lm_paths) for path, lm_paths in entry['assets']]
+        previous = dict((path, lm_paths) for path, lm_paths in entry['assets']
+                        if os.path.dirname(path) not in changed)
+    else:
+        previous = {}
+    directories = dict((d, _directory_state(d, manifest_path))
+                       for d in _searched_directories(preglob, glob))
+    assets = _resolve_assets(pattern, extensions_map, landmark_resolver,
+                             previous)
+    manifest['globs'][key] = {'directories': directories, 'assets': assets}
+    _save_manifest(manifest_path, manifest)
+    return assets
+
+
+def _resolve_assets(pattern, extensions_map, landmark_resolver, previous):
+    r"""
+    Glob for the assets matching a pattern and resolve the landmark files of
+    those that are not in `previous` (a map from the filepaths to the
+    landmark filepaths that are already known).
+    """
+    landmark_resolver = _batch_landmark_resolver(landmark_resolver)
+    assets = []
+    for path in glob_with_suffix(pattern, extensions_map):
+        if path in previous:
+            lm_paths = previous[path]
+        elif landmark_resolver is None:
+            lm_paths = None
+        else:
+            lm_paths = landmark_resolver(_PathAsset(path))
+            if lm_paths is not None:
+                lm_paths = dict((group, str(lm_path))
+                                for group, lm_path in lm_paths.items())
+        assets.append((path, lm_paths))
+    return assets
+
+
+def _searched_directories(preglob, glob):
+    r"""
+    The directories that are listed when globbing for `glob` from `preglob`,
+    i.e. those whose contents decide which files match.
+    """
+    directories = [preglob]
+    searched = set(directories)
+    for part in glob.split(os.sep)[:-1]:
+        subdirectories = []
+        for d in directories:
+            if part == '**':
+                subdirectories.extend(dirpath for dirpath, _, _ in os.walk(d))
+            else:
+                subdirectories.extend(
+                    os.path.join(d, name) for name in _listdir(d)
+                    if fnmatch(name, part) and
+                    os.path.isdir(os.path.join(d, name)))
+        directories = subdirectories
+        searched.update(directories)
+    return searched
+
+
+def _listdir(directory):
+    try:
+        return os.listdir(directory)
+    except OSError:
+        return []
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        # removed (or never written)
+        return None
+
+
+def _listing_hash(directory, manifest_path):
+    r"""
+    A hash of the names of the entries of a directory, ignoring the manifest
+    (and its temporary files), or ``None`` if the directory does not exist.
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        # the directory has been removed
+        return None
+    if directory == os.path.dirname(manifest_path):
+        manifest_name = os.path.basename(manifest_path)
+        names = [n for n in names if n != manifest_name and
+                 not n.startswith(manifest_name + '.')]
+    h = hashlib.sha1()
+    for name in sorted(names):
+        h.update(name.encode('utf-8') + b'\0')
+    return h.hexdigest()
+
+
+def _directory_state(directory, manifest_path):
+    r"""
+    The modification time of a directory and the hash of its entries, as
+    recorded in the manifest.
+    """
+    return [_mtime(directory), _listing_hash(directory, manifest_path)]
+
+
+def _directory_changed(directory, state, written, manifest_path):
+    r"""
+    Whether the entries of a directory have changed since its `state` was
+    recorded in a manifest that was last written at `written` (the
+    modification time of the manifest file). The directory is only listed
+    if its modification time has changed, or was too close to `written` to
+    be trusted.
+    """
+    mtime, listing = state
+    if (mtime is not None and _mtime(directory) == mtime and
+            written is not None and mtime < written - MTIME_RESOLUTION):
+        return False
+    return _listing_hash(directory, manifest_path) != listing
+
+
+def _function_name(f):
+    r"""
+    The module and name of a function, or ``None`` if the function can not
+    be found again by them (e.g. a lambda, a partial or a closure), so that
+    it can not be recorded.
+    """
+    if f is None:
+        return 'None'
+    module = sys.modules.get(getattr(f, '__module__', None))
+    name = getattr(f, '__name__', None)
+    if module is None or name is None or getattr(module, name, None) is not f:
+        return None
+    return '{}.{}'.format(f.__module__, name)
+
+
+def _load_manifest(manifest_path):
+    r"""
+    The manifest, and the time it was written (``None`` if it has to be
+    started again).
+    """
+    written = _mtime(manifest_path)
+    try:
+        with open(manifest_path, 'rb') as f:
+            manifest = json.load(f)
+    except (IOError, ValueError):
+        # missing or unreadable - start a new one
+        manifest = None
+    if (not isinstance(manifest, dict) or
+            manifest.get('version') != MANIFEST_VERSION):
+        manifest = {'version': MANIFEST_VERSION, 'globs': {}}
+        written = None
+    return manifest, written
+
+
+def _save_manifest(manifest_path, manifest):
+    # written to a temporary file that is then renamed, so that a crash or a
+    # concurrent import never sees a partially written manifest
+    manifest_dir = os.path.dirname(manifest_path)
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(
+            dir=manifest_dir, prefix=os.path.basename(manifest_path) + '.',
+            suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            json.dump(manifest, f)
+        if os.name == 'nt' and os.path.exists(manifest_path):
+            # renaming does not replace an existing file on Windows
+            os.remove(manifest_path)
+        os.rename(temp_path, manifest_path)
+    except (IOError, OSError) as e:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+        warn('The manifest {} could not be written ({}), so the assets '
+             'found were not cached.'.format(manifest_path, e))
@@ -0,0 +1,98 @@
+import json
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+from menpo.image import Image, MaskedImage, BooleanImage
+from menpo.landmark import LandmarkGroup
+from menpo.shape import PointCloud
+from menpo.io.output.shard import (SHARD_MAGIC, SHARD_VERSION,
+                                   SHARD_FOOTER_FORMAT)
+from .base import Importer
+
+
+class ShardImporter(Importer):
+    r"""
+    Imports the images (and their landmarks) written to a shard by
+    :func:`ShardExporter`.
+
+    The whole shard is memory mapped (copy-on-write) and the pixels (and
+    masks) of each image are views in to the map, so importing does no
+    decoding or copying - the pixels are only read from disk as they are
+    accessed. Modifying the pixels in place never modifies the shard.
+
+    Images are returned as they were exported, so the ``normalise``,
+    ``dtype`` and ``scale_hint`` arguments used to import other image types
+    are ignored.
+
+    Parameters
+    ----------
+    filepath : string
+        Absolute filepath of the shard
+    """
+    def __init__(self, filepath, normalise=True, dtype=None,
+                 scale_hint=None):
+        super(ShardImporter, self).__init__(filepath)
+
+    def build(self):
+        r"""
+        Memory map the shard and build an image for each of the images in
+        its index.
+
+        Returns
+        -------
+        images : list of :map:`Image`
+            The images of the shard, in the order they were exported.
+        """
+        data = np.memmap(self.filepath, dtype=np.uint8, mode='c')
+        index = _read_index(data, self.filepath)
+        return [_build_image(data, entry) for entry in index['images']]
+
+
+def _read_index(data, filepath):
+    footer_length = struct.calcsize(SHARD_FOOTER_FORMAT) + len(SHARD_MAGIC)
+    if (len(data) < len(SHARD_MAGIC) + footer_length or
+            data[:len(SHARD_MAGIC)].tostring() != SHARD_MAGIC or
+            data[-len(SHARD_MAGIC):].tostring() != SHARD_MAGIC):
+        raise ValueError('{} is not a valid shard'.format(filepath))
+    footer = data[-footer_length:-len(SHARD_MAGIC)].tostring()
+    index_length = struct.unpack(SHARD_FOOTER_FORMAT, footer)[0]
+    index_start = len(data) - footer_length - index_length
+    index = data[index_start:-footer_length].tostring()
+    index = json.loads(index.decode('utf-8'))
+    if index['version'] != SHARD_VERSION:
+        raise ValueError('{} is a version {} shard, only version {} shards '
+                         'are supported'.format(filepath, index['version'],
+                                                SHARD_VERSION))
+    return index
+
+
+def _array_view(data, entry):
+    dtype = np.dtype(str(entry['dtype']))
+    shape = tuple(entry['shape'])
+    n_bytes = dtype.itemsize * int(np.prod(shape))
+    start = entry['offset']
+    return data[start:start + n_bytes].view(dtype).reshape(shape)
+
+
+def _build_image(data, entry):
+    pixels = _array_view(data, entry['pixels'])
+    if entry['type'] == 'BooleanImage':
+        image = BooleanImage(pixels[..., 0], copy=False)
+    elif entry['type'] == 'MaskedImage':
+        mask = BooleanImage(_array_view(data, entry['mask']), copy=False)
+        image = MaskedImage(pixels, mask=mask, copy=False)
+    else:
+        image = Image(pixels, copy=False)
+    if entry['normalisation_deferred']:
+        image._deferred_normalisation = True
+    for lm_entry in entry['landmarks']:
+        # landmarks are small, so are copied out of the map
+        points = np.array(_array_view(data, lm_entry['points']))
+        labels_to_masks = OrderedDict(
+            (label, np.array(_array_view(data, mask_entry)))
+            for label, mask_entry in lm_entry['labels'])
+        image.landmarks[lm_entry['group']] = LandmarkGroup(
+            PointCloud(points, copy=False), labels_to_masks, copy=False)
+    return image
@@ -1 +1,2 @@
-from .base import export_landmark_file, export_image
+from .base import (export_landmark_file, export_landmark_files,
+                   export_image, export_images, export_shard)
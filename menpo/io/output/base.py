@@ -1,6 +1,9 @@
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
 from pathlib import Path
 
-from .extensions import landmark_types, image_types
+from .extensions import landmark_types, image_types, shard_types
 from ..utils import _norm_path
 
 
@@ -86,6 +89,131 @@ def export_image(fp, image, extension=None, overwrite=False):
     _export(fp, image, image_types, extension, overwrite)
 
 
+def export_images(path_image_pairs, overwrite=False,
+                  landmark_extension=None, landmark_group=None,
+                  n_workers=None, prefetch=None):
+    r"""
+    Exports many images, each to its own filepath. The export type of each
+    image is calculated based on its filepath extension.
+
+    Each output directory is checked once, and the images can be encoded and
+    written by a pool of threads. Optionally, the landmarks of each image
+    are written alongside it, to a file with the same name but a landmark
+    extension.
+
+    Parameters
+    ----------
+    path_image_pairs : iterable of (`str`, :map:`Image`)
+        The string path to save each image at, and the image. A generator
+        can be used - only a bounded number of images are held at once.
+    overwrite : `bool`, optional
+        Whether or not to overwrite files that already exist.
+    landmark_extension : `str`, optional
+        If not ``None``, the extension (e.g. ``'.pts'`` or ``'.ljson'``) of
+        a landmark file that is written next to each image that has
+        landmarks.
+    landmark_group : `str`, optional
+        The landmark group written next to each image. If ``None``, the
+        images must only have one landmark group.
+    n_workers : `int`, optional
+        If greater than ``1``, the files are written by a pool of
+        ``n_workers`` threads.
+    prefetch : `int`, optional
+        The maximum number of files that are waiting to be written when
+        ``n_workers > 1``, which bounds the memory used. If ``None``,
+        ``2 * n_workers`` is used.
+
+    Raises
+    ------
+    ValueError
+        A file already exists and ``overwrite`` != ``True``
+    ValueError
+        An output directory does not exist
+    ValueError
+        An extension does not match to an existing exporter type
+        (the output type is not supported).
+    """
+    def exports():
+        for fp, image in path_image_pairs:
+            yield fp, image, image_types
+            if landmark_extension is not None and image.has_landmarks:
+                lm_fp = Path(fp).with_suffix(
+                    _normalise_extension(landmark_extension))
+                yield (str(lm_fp), image.landmarks[landmark_group],
+                       landmark_types)
+
+    _export_many(exports(), overwrite=overwrite, n_workers=n_workers,
+                 prefetch=prefetch)
+
+
+def export_landmark_files(path_landmark_group_pairs, overwrite=False,
+                          n_workers=None, prefetch=None):
+    r"""
+    Exports many landmark groups, each to its own filepath. The export type
+    of each landmark group is calculated based on its filepath extension.
+
+    Each output directory is checked once, and the files can be written by
+    a pool of threads.
+
+    Parameters
+    ----------
+    path_landmark_group_pairs : iterable of (`str`, :map:`LandmarkGroup`)
+        The string path to save each landmark group at, and the group.
+    overwrite : `bool`, optional
+        Whether or not to overwrite files that already exist.
+    n_workers : `int`, optional
+        If greater than ``1``, the files are written by a pool of
+        ``n_workers`` threads.
+    prefetch : `int`, optional
+        The maximum number of files that are waiting to be written when
+        ``n_workers > 1``. If ``None``, ``2 * n_workers`` is used.
+
+    Raises
+    ------
+    ValueError
+        A file already exists and ``overwrite`` != ``True``
+    ValueError
+        An output directory does not exist
+    ValueError
+        An extension does not match to an existing exporter type
+        (the output type is not supported).
+    """
+    _export_many(((fp, lmark_group, landmark_types)
+                  for fp, lmark_group in path_landmark_group_pairs),
+                 overwrite=overwrite, n_workers=n_workers, prefetch=prefetch)
+
+
+def export_shard(fp, images, overwrite=False):
+    r"""
+    Exports a collection of images (and their landmarks) in to a single
+    ``.mshard`` shard file. The ``fp`` argument can be either a `str` or any
+    Python type that acts like a file.
+
+    Importing a shard (e.g. with :func:`import_image` or
+    :func:`import_images`) returns the images without decoding or copying
+    their pixels, which are views in to a memory map of the shard. See
+    :func:`ShardExporter` for details of the format.
+
+    Parameters
+    ----------
+    fp : `str` or `file`-like object
+        The string path or file-like object to save the shard at/into.
+    images : iterable of :map:`Image`
+        The images to export. They are written as they are iterated, so a
+        generator (e.g. :func:`import_images`) can be used.
+    overwrite : `bool`, optional
+        Whether or not to overwrite a file if it already exists.
+
+    Raises
+    ------
+    ValueError
+        File already exists and ``overwrite`` != ``True``
+    ValueError
+        ``fp`` is a `str` that does not end with ``.mshard``
+    """
+    _export(fp, images, shard_types, '.mshard', overwrite)
+
+
 def _normalise_extension(extension):
     # Account for the fact the user may only have passed the extension
     # without the proceeding period
@@ -123,8 +251,7 @@ def _export(fp, obj, extensions_map, extension=None, overwrite=False):
         export_function = _extension_to_export_function(
             path_filepath.suffix, extensions_map)
 
-        with path_filepath.open('wb') as file_handle:
-            export_function(file_handle, obj)
+        _write_file(path_filepath, export_function, obj)
     else:
         # You MUST provide an extension if a file handle is given
         if extension is None:
@@ -144,3 +271,61 @@ def _export(fp, obj, extensions_map, extension=None, overwrite=False):
         export_function = _extension_to_export_function(
             _normalise_extension(extension), extensions_map)
         export_function(fp, obj)
+
+
+def _write_file(path, export_function, obj):
+    with path.open('wb') as file_handle:
+        export_function(file_handle, obj)
+
+
+def _export_many(exports, overwrite=False, n_workers=None, prefetch=None):
+    r"""
+    Write each object to its filepath, with the exporter found for the
+    filepath extension in the given extensions map.
+
+    Parameters
+    ----------
+    exports : iterable of (`str`, `object`, `dict`)
+        The filepath, object to export and extensions map of each file.
+    overwrite : `bool`, optional
+        Whether or not to overwrite files that already exist.
+    n_workers : `int`, optional
+        If greater than 1, the files are written by a pool of this many
+        threads.
+    prefetch : `int`, optional
+        The maximum number of files waiting to be written when `n_workers`
+        is greater than 1. If None, `2 * n_workers`.
+    """
+    checked_dirs = set()
+
+    def writes():
+        for fp, obj, extensions_map in exports:
+            path = _validate_filepath(fp, None, overwrite)
+            if path.parent not in checked_dirs:
+                if not path.parent.is_dir():
+                    raise ValueError('The output directory {} does not '
+                                     'exist.'.format(path.parent))
+                checked_dirs.add(path.parent)
+            export_function = _extension_to_export_function(path.suffix,
+                                                            extensions_map)
+            yield path, export_function, obj
+
+    if n_workers is None or n_workers <= 1:
+        for args in writes():
+            _write_file(*args)
+        return
+    if prefetch is None:
+        prefetch = 2 * n_workers
+    pool = ThreadPool(n_workers)
+    pending = deque()
+    try:
+        for args in writes():
+            # wait for the oldest write before starting another one (this
+            # re-raises any exception of the write)
+            while len(pending) >= max(prefetch, 1):
+                pending.popleft().get()
+            pending.append(pool.apply_async(_write_file, args))
+        while pending:
+            pending.popleft().get()
+    finally:
+        pool.terminate()
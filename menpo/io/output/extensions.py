@@ -1,5 +1,6 @@
 from .landmark import LJSONExporter, PTSExporter
 from .image import PILExporter
+from .shard import ShardExporter
 
 landmark_types = {
     '.ljson': LJSONExporter,
@@ -27,6 +28,11 @@ image_types = {
     '.tif': PILExporter,
     '.tiff': PILExporter,
     '.xbm': PILExporter,
-    '.xpm': PILExporter
+    '.xpm': PILExporter,
+    '.mshard': ShardExporter
 }
 
+
+shard_types = {
+    '.mshard': ShardExporter
+}
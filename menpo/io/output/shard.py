@@ -0,0 +1,95 @@
+import json
+import struct
+
+import numpy as np
+
+# the first and last bytes of every shard
+SHARD_MAGIC = b'MENPOSHARD\x00\x01'
+# the version of the shard index layout
+SHARD_VERSION = 1
+# arrays start at multiples of this many bytes into the shard
+SHARD_ALIGNMENT = 64
+# the footer is the length of the index followed by the magic
+SHARD_FOOTER_FORMAT = '<Q'
+
+
+def ShardExporter(file_handle, images):
+    r"""
+    Given a file handle to write in to (which should act like a Python `file`
+    object), write out one or more images (and their landmarks) in to a
+    single shard. No value is returned.
+
+    A shard is a menpo-native binary container. The raw pixels (and masks) of
+    each image, and the points and label masks of each of its landmark groups,
+    are written one after the other (each aligned to 64 bytes), followed by a
+    JSON index of their offsets, data-types and shapes. When imported, the
+    pixels of each image are views in to a memory map of the shard, so that
+    nothing needs to be decoded or copied.
+
+    The pixels are written with their current data-type, so images with
+    compact pixels (see :meth:`Image.compact_inplace`) stay compact. Only the
+    points and labels of each landmark group are written (any connectivity is
+    dropped).
+
+    Parameters
+    ----------
+    file_handle : `file`-like object
+        The file to write in to
+    images : :map:`Image` or iterable of :map:`Image`
+        The image data to write out.
+    """
+    from menpo.image import Image  # to avoid circular import
+    if isinstance(images, Image):
+        images = [images]
+    writer = _ShardWriter(file_handle)
+    index = {'version': SHARD_VERSION,
+             'images': [_write_image(writer, image) for image in images]}
+    index = json.dumps(index).encode('utf-8')
+    file_handle.write(index)
+    file_handle.write(struct.pack(SHARD_FOOTER_FORMAT, len(index)))
+    file_handle.write(SHARD_MAGIC)
+
+
+class _ShardWriter(object):
+    r"""
+    Writes aligned arrays to a file handle, tracking the offset of each.
+    """
+    def __init__(self, file_handle):
+        self.file_handle = file_handle
+        file_handle.write(SHARD_MAGIC)
+        self.offset = len(SHARD_MAGIC)
+
+    def write(self, array):
+        padding = -self.offset % SHARD_ALIGNMENT
+        self.file_handle.write(b'\x00' * padding)
+        self.offset += padding
+        array = np.ascontiguousarray(array)
+        entry = {'offset': self.offset, 'dtype': array.dtype.str,
+                 'shape': list(array.shape)}
+        self.file_handle.write(array.data)
+        self.offset += array.nbytes
+        return entry
+
+
+def _write_image(writer, image):
+    from menpo.image import MaskedImage, BooleanImage
+    if isinstance(image, BooleanImage):
+        image_type = 'BooleanImage'
+    elif isinstance(image, MaskedImage):
+        image_type = 'MaskedImage'
+    else:
+        image_type = 'Image'
+    entry = {'type': image_type,
+             'pixels': writer.write(image.pixels),
+             'normalisation_deferred': image.normalisation_deferred,
+             'landmarks': []}
+    if image_type == 'MaskedImage':
+        entry['mask'] = writer.write(image.mask.mask)
+    for group in image.landmarks.group_labels:
+        lmark_group = image.landmarks[group]
+        entry['landmarks'].append({
+            'group': group,
+            'points': writer.write(lmark_group.lms.points),
+            'labels': [[label, writer.write(mask)] for label, mask
+                       in lmark_group._labels_to_masks.items()]})
+    return entry
@@ -1,9 +1,15 @@
+import os
+import shutil
+import tempfile
+
 import numpy as np
+from numpy.testing import assert_allclose
 from mock import patch, PropertyMock
 from nose.tools import raises
 
 import menpo.io as mio
-from menpo.image import Image
+from menpo.testing import RecordingThreadPool
+from menpo.image import Image, MaskedImage
 
 
 test_lg = mio.import_landmark_file(mio.data_path_to('breakingbad.pts'))
@@ -186,3 +192,102 @@ def test_export_image_jpg(mock_open, exists, PILImage):
         type(f).name = PropertyMock(return_value=fake_path)
         mio.export_image(f, test_img, extension='jpg')
     PILImage.save.assert_called_once()
+
+
+def test_export_shard_roundtrip():
+    bb = mio.import_builtin_asset('breakingbad.jpg')
+    takeo = mio.import_builtin_asset('takeo.ppm').as_masked().compact()
+    takeo.mask.pixels[:10] = False
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp_dir, 'test.mshard')
+        mio.export_shard(path, iter([bb, takeo]))
+        images = mio.import_image(path)
+        assert(len(images) == 2)
+        assert(type(images[0]) == Image)
+        assert(type(images[1]) == MaskedImage)
+        # the pixels are views in to the shard
+        assert(isinstance(images[0].pixels, np.memmap))
+        assert(np.all(images[0].pixels == bb.pixels))
+        assert(np.all(images[1].pixels == takeo.pixels))
+        assert(images[1].normalisation_deferred)
+        assert(np.all(images[1].mask.pixels == takeo.mask.pixels))
+        assert_allclose(images[0].landmarks['PTS'].lms.points,
+                        bb.landmarks['PTS'].lms.points)
+        assert(images[0].landmarks['PTS'].labels ==
+               bb.landmarks['PTS'].labels)
+        # modifying the imported pixels does not modify the shard
+        images[0].pixels[...] = 0
+        assert(np.all(mio.import_image(path)[0].pixels == bb.pixels))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@raises(ValueError)
+def test_export_shard_wrong_extension_raises_value_error():
+    mio.export_shard('/tmp/test.jpg', [test_img])
+
+
+def test_export_images_with_landmarks():
+    bb = mio.import_builtin_asset('breakingbad.jpg').resize([54, 96])
+    takeo = mio.import_builtin_asset('takeo.ppm')
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        paths = [os.path.join(tmp_dir, 'bb.png'),
+                 os.path.join(tmp_dir, 'takeo.png')]
+        for n_workers in [None, 2]:
+            mio.export_images(zip(paths, [bb, takeo]), overwrite=True,
+                              landmark_extension='pts', n_workers=n_workers,
+                              prefetch=1)
+            for path, img in zip(paths, [bb, takeo]):
+                exported = mio.import_image(path)
+                assert(exported.shape == img.shape)
+                # PTS files are written to 3 decimal places
+                assert_allclose(exported.landmarks['PTS'].lms.points,
+                                img.landmarks['PTS'].lms.points, atol=1e-3)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@patch('menpo.io.output.base.ThreadPool', RecordingThreadPool)
+def test_export_landmark_files_prefetch_bounds_pending():
+    RecordingThreadPool.max_pending = 0
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        paths = [os.path.join(tmp_dir, '{}.ljson'.format(i))
+                 for i in range(5)]
+        mio.export_landmark_files(((p, test_lg) for p in paths), n_workers=2,
+                                  prefetch=2)
+        assert(all(os.path.isfile(p) for p in paths))
+        assert(RecordingThreadPool.max_pending == 2)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_export_landmark_files():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        paths = [os.path.join(tmp_dir, '{}.ljson'.format(i))
+                 for i in range(3)]
+        mio.export_landmark_files(((p, test_lg) for p in paths), n_workers=2)
+        for path in paths:
+            assert_allclose(mio.import_landmark_file(path).lms.points,
+                            test_lg.lms.points)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@raises(ValueError)
+def test_export_images_missing_directory_raises_value_error():
+    mio.export_images([('/tmp/not/a/dir/test.png', test_img)])
+
+
+@raises(ValueError)
+def test_export_images_no_overwrite_raises_value_error():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp_dir, 'test.png')
+        mio.export_images([(path, test_img)])
+        mio.export_images([(path, test_img)], n_workers=2)
+    finally:
+        shutil.rmtree(tmp_dir)
@@ -1,9 +1,14 @@
 import os
+import shutil
+import tempfile
+import warnings
 import numpy as np
+from numpy.testing import assert_allclose
 from mock import patch
 from nose.tools import raises
 from PIL import Image as PILImage
 import menpo.io as mio
+from menpo.testing import RecordingThreadPool
 
 
 @raises(ValueError)
@@ -76,6 +81,44 @@ def test_import_images():
     assert(len(exp_imgs_filenames - imgs_filenames) == 0)
 
 
+def test_import_images_n_workers():
+    imgs_glob = os.path.join(mio.data_dir_path(), '*')
+    imgs = list(mio.import_images(imgs_glob))
+    par_imgs = list(mio.import_images(imgs_glob, n_workers=3, prefetch=1))
+    assert([i.path for i in par_imgs] == [i.path for i in imgs])
+    for im, par_im in zip(imgs, par_imgs):
+        assert(np.all(par_im.pixels == im.pixels))
+        assert(par_im.landmarks.group_labels == im.landmarks.group_labels)
+
+
+def test_import_lazy_images():
+    imgs_glob = os.path.join(mio.data_dir_path(), '*')
+    imgs = list(mio.import_images(imgs_glob))
+    lazy_imgs = mio.import_lazy_images(imgs_glob, cache_size=2)
+    assert(len(lazy_imgs) == len(imgs))
+    for im, lazy_im in zip(imgs, lazy_imgs):
+        assert(lazy_im.path == im.path)
+        assert(np.all(lazy_im.pixels == im.pixels))
+        assert(lazy_im.landmarks.group_labels == im.landmarks.group_labels)
+    # only the two most recently accessed images are cached
+    first = lazy_imgs[0]
+    assert(lazy_imgs[0] is first)
+    lazy_imgs[1], lazy_imgs[2]
+    assert(lazy_imgs[0] is not first)
+
+
+def test_import_lazy_images_slice_and_map():
+    imgs_glob = os.path.join(mio.data_dir_path(), '*')
+    lazy_imgs = mio.import_lazy_images(imgs_glob)
+    subset = lazy_imgs[[3, 1]]
+    assert(subset.filepaths == [lazy_imgs.filepaths[3],
+                                lazy_imgs.filepaths[1]])
+    assert(lazy_imgs[1:3].filepaths == lazy_imgs.filepaths[1:3])
+    shapes = subset.map(lambda im: im.shape).map(lambda s: s[::-1])
+    assert(shapes[0] == lazy_imgs[3].shape[::-1])
+    assert(shapes[-1] == lazy_imgs[1].shape[::-1])
+
+
 def test_ls_builtin_assets():
     assert(set(mio.ls_builtin_assets()) == {'breakingbad.jpg',
                                             'einstein.jpg', 'einstein.pts',
@@ -261,3 +304,287 @@ def test_importing_GIF_non_pallete_exception(is_file, mock_image):
     is_file.return_value = True
 
     mio.import_image('fake_image_being_mocked.gif', normalise=False)
+
+
+def test_import_image_compact_dtypes():
+    img = mio.import_builtin_asset('breakingbad.jpg')
+    filepath = img.path
+    f32_img = mio.import_image(filepath, dtype=np.float32)
+    assert(f32_img.pixels.dtype == np.float32)
+    assert(np.allclose(f32_img.pixels, img.pixels))
+    u8_img = mio.import_image(filepath, dtype=np.uint8)
+    assert(u8_img.pixels.dtype == np.uint8)
+    assert(u8_img.normalisation_deferred)
+    assert(np.allclose(u8_img.as_vector(), img.as_vector()))
+    assert(u8_img.landmarks.group_labels == img.landmarks.group_labels)
+
+
+def test_import_16_bit_image_uint8_dtype_is_float():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        pixels = (np.arange(200).reshape([10, 20]) * 300).astype(np.int32)
+        path = os.path.join(tmp_dir, 'test.png')
+        PILImage.fromarray(pixels, mode='I').save(path)
+        img = mio.import_image(path)
+        u8_img = mio.import_image(path, dtype=np.uint8)
+        assert(u8_img.pixels.dtype == np.float64)
+        assert(not u8_img.normalisation_deferred)
+        assert(np.all(u8_img.pixels == img.pixels))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@raises(ValueError)
+def test_import_image_int_dtype_raises_value_error():
+    img = mio.import_builtin_asset('breakingbad.jpg')
+    mio.import_image(img.path, dtype=np.int32)
+
+
+resolved_paths = []
+
+
+def _counting_resolver(asset):
+    resolved_paths.append(str(asset.path))
+    return mio.input.base.same_name(asset)
+
+
+def test_import_images_manifest():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for asset in ['takeo.ppm', 'takeo.pts', 'lenna.png', 'lenna.pts']:
+            shutil.copy(mio.data_path_to(asset), tmp_dir)
+        pattern = os.path.join(tmp_dir, '*')
+        imgs = list(mio.import_images(pattern,
+                                      landmark_resolver=_counting_resolver,
+                                      manifest=True))
+        assert(len(resolved_paths) == 2)
+        assert(os.path.isfile(os.path.join(tmp_dir, '.menpo_manifest.json')))
+        # the manifest is reused while the directory is unchanged
+        del resolved_paths[:]
+        m_imgs = list(mio.import_images(pattern,
+                                        landmark_resolver=_counting_resolver,
+                                        manifest=True))
+        assert(len(resolved_paths) == 0)
+        assert([i.path for i in m_imgs] == [i.path for i in imgs])
+        for im, m_im in zip(imgs, m_imgs):
+            assert(m_im.landmarks.group_labels == im.landmarks.group_labels)
+        lazy_imgs = mio.import_lazy_images(
+            pattern, landmark_resolver=_counting_resolver, manifest=True)
+        assert(len(resolved_paths) == 0)
+        assert(lazy_imgs.filepaths == [str(i.path) for i in imgs])
+        # adding an image (straight away) invalidates the manifest
+        shutil.copy(mio.data_path_to('einstein.jpg'), tmp_dir)
+        m_imgs = list(mio.import_images(pattern,
+                                        landmark_resolver=_counting_resolver,
+                                        manifest=True))
+        assert(len(m_imgs) == 3)
+        assert(not m_imgs[0].has_landmarks)
+    finally:
+        shutil.rmtree(tmp_dir)
+        del resolved_paths[:]
+
+
+def test_import_images_manifest_only_lists_modified_directories():
+    from menpo.io.input import manifest
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        data_dir = os.path.join(tmp_dir, 'data')
+        os.mkdir(data_dir)
+        for asset in ['takeo.ppm', 'takeo.pts']:
+            shutil.copy(mio.data_path_to(asset), data_dir)
+        # a dataset that was last modified long before the manifest
+        os.utime(data_dir, (1e9, 1e9))
+        pattern = os.path.join(data_dir, '*')
+        manifest_path = os.path.join(tmp_dir, 'manifest.json')
+        list(mio.import_images(pattern, manifest=manifest_path))
+        with patch('menpo.io.input.manifest._listing_hash',
+                   wraps=manifest._listing_hash) as listing_hash:
+            imgs = list(mio.import_images(pattern, manifest=manifest_path))
+            assert(listing_hash.call_count == 0)
+            assert(imgs[0].has_landmarks)
+            # a modified directory is listed again
+            os.utime(data_dir, (2e9, 2e9))
+            list(mio.import_images(pattern, manifest=manifest_path))
+            assert(listing_hash.call_count == 1)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_import_images_manifest_lambda_resolver_not_recorded():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        shutil.copy(mio.data_path_to('takeo.ppm'), tmp_dir)
+        shutil.copy(mio.data_path_to('takeo.pts'), tmp_dir)
+        pattern = os.path.join(tmp_dir, '*')
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            imgs = list(mio.import_images(
+                pattern, manifest=True,
+                landmark_resolver=lambda x: mio.input.base.same_name(x)))
+            no_lms_imgs = list(mio.import_images(
+                pattern, manifest=True, landmark_resolver=lambda x: None))
+        assert(len(w) == 2)
+        assert(imgs[0].has_landmarks)
+        assert(not no_lms_imgs[0].has_landmarks)
+        assert(not os.path.exists(os.path.join(tmp_dir,
+                                               '.menpo_manifest.json')))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_import_images_unwritable_manifest_warns():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        shutil.copy(mio.data_path_to('takeo.ppm'), tmp_dir)
+        manifest = os.path.join(tmp_dir, 'missing', 'manifest.json')
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            imgs = list(mio.import_images(os.path.join(tmp_dir, '*'),
+                                          manifest=manifest))
+        assert(len(imgs) == 1)
+        assert(len(w) == 1)
+        assert(not os.path.exists(manifest))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_same_name_index_matches_same_name():
+    from menpo.io.input.base import same_name, _SameNameIndex
+    from menpo.io.input.lazy import _PathAsset
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for asset in ['takeo.ppm', 'takeo.pts', 'lenna.png', 'lenna.pts']:
+            shutil.copy(mio.data_path_to(asset), tmp_dir)
+        shutil.copy(mio.data_path_to('lenna.pts'),
+                    os.path.join(tmp_dir, 'takeo.v2.pts'))
+        index = _SameNameIndex()
+        for path in mio.image_paths(os.path.join(tmp_dir, '*')):
+            asset = _PathAsset(path)
+            assert(index(asset) == same_name(asset))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def _write_tmp_file(tmp_dir, filename, contents):
+    path = os.path.join(tmp_dir, filename)
+    with open(path, 'w') as f:
+        f.write(contents)
+    return path
+
+
+def test_import_asf_landmarks():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = _write_tmp_file(tmp_dir, 'test.asf', """# comment
+3
+
+0 0 0.25 0.5 0 2 1
+0 0 0.5 0.75 1 0 2
+0 0 0.75 1.0 2 1 0
+
+test.jpg
+""")
+        lmarks = mio.import_landmark_file(path)
+        assert_allclose(lmarks.lms.points,
+                        [[0.5, 0.25], [0.75, 0.5], [1.0, 0.75]])
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_import_lm2_landmarks():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = _write_tmp_file(tmp_dir, 'test.lm2', """# comment
+2 landmarks:
+Labels:
+Nose tip
+Chin middle
+2D Image coordinates:
+10.5 20.0
+30.25 40.0
+""")
+        lmarks = mio.import_landmark_file(path)
+        assert_allclose(lmarks.lms.points, [[20.0, 10.5], [40.0, 30.25]])
+        assert(lmarks.labels == ['nose_tip', 'chin_middle'])
+        assert(np.all(lmarks['chin_middle'].points == [[40.0, 30.25]]))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_import_pts_landmarks_extra_columns():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = _write_tmp_file(tmp_dir, 'test.pts', """version: 1
+n_points: 2
+{
+1.0 2.0 extra
+3.0 4.0 extra
+}
+""")
+        lmarks = mio.import_landmark_file(path)
+        assert_allclose(lmarks.lms.points, [[1.0, 0.0], [3.0, 2.0]])
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_import_pts_landmarks_ragged_lines():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        # the same total number of values as 3 lines of 3 values
+        path = _write_tmp_file(tmp_dir, 'test.pts', """version: 1
+n_points: 3
+{
+10 20 1
+30 40
+50 60 0 0
+}
+""")
+        lmarks = mio.import_landmark_file(path)
+        assert_allclose(lmarks.lms.points, [[19, 9], [39, 29], [59, 49]])
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+@patch('menpo.io.input.base.ThreadPool', RecordingThreadPool)
+def test_import_images_prefetch_bounds_pending():
+    RecordingThreadPool.max_pending = 0
+    imgs_glob = os.path.join(mio.data_dir_path(), '*')
+    imgs = list(mio.import_images(imgs_glob, n_workers=3, prefetch=2))
+    assert(len(imgs) > 2)
+    assert(RecordingThreadPool.max_pending == 2)
+
+
+def test_import_landmark_files_n_workers():
+    lmarks_glob = os.path.join(mio.data_dir_path(), '*')
+    lmarks = list(mio.import_landmark_files(lmarks_glob))
+    par_lmarks = list(mio.import_landmark_files(lmarks_glob, n_workers=3))
+    assert(len(par_lmarks) == len(lmarks))
+    for lm, par_lm in zip(lmarks, par_lmarks):
+        assert(np.all(par_lm.lms.points == lm.lms.points))
+
+
+def test_import_image_scale_hint():
+    img = mio.import_builtin_asset('breakingbad.jpg')
+    for scale_hint, scale in [(1, 1), (0.5, 0.5), (0.3, 0.5), (0.2, 0.25)]:
+        s_img = mio.import_image(img.path, scale_hint=scale_hint)
+        assert(s_img.shape == tuple(int(s * scale) for s in img.shape))
+        assert_allclose(s_img.landmarks['PTS'].lms.points,
+                        img.landmarks['PTS'].lms.points * scale)
+    lazy_img = mio.import_lazy_images(str(img.path.parent / 'breaking*'),
+                                      scale_hint=0.5)[0]
+    assert_allclose(lazy_img.landmarks['PTS'].lms.points,
+                    img.landmarks['PTS'].lms.points * 0.5)
+
+
+def test_import_image_scale_hint_non_jpeg():
+    img = mio.import_builtin_asset('lenna.png')
+    s_img = mio.import_image(img.path, scale_hint=0.5)
+    assert(s_img.shape == img.shape)
+    assert_allclose(s_img.landmarks['PTS'].lms.points,
+                    img.landmarks['PTS'].lms.points)
+
+
+@raises(ValueError)
+def test_import_image_scale_hint_out_of_range_raises_value_error():
+    img = mio.import_builtin_asset('breakingbad.jpg')
+    mio.import_image(img.path, scale_hint=2)
@@ -1,3 +1,5 @@
 from .convolution import log_gabor
 from .decomposition import (eigenvalue_decomposition,
-                            principal_component_decomposition)
+                            principal_component_decomposition,
+                            incremental_principal_component_decomposition,
+                            randomized_principal_component_decomposition)
@@ -143,3 +143,214 @@ def principal_component_decomposition(X, whiten=False, centre=True,
     eigenvectors = eigenvectors.T
 
     return eigenvectors, eigenvalues, mean_vector
+
+
+def incremental_principal_component_decomposition(X, eigenvectors,
+                                                  eigenvalues, n_samples,
+                                                  mean_vector=None,
+                                                  forgetting_factor=1.0,
+                                                  bias=False, eps=10**-10):
+    r"""
+    Update a PCA of previously seen data with a new batch of data, without
+    requiring the previous data. The previous scatter matrix is represented
+    by its eigenvectors scaled by their singular values, and a single
+    (thin) SVD of this stacked with the new (centred) data gives the updated
+    decomposition. See Ross et al., "Incremental Learning for Robust Visual
+    Tracking", IJCV 2008.
+
+    If the previous decomposition retains all of its positive eigenvalues
+    and ``forgetting_factor`` is ``1``, the result is equal to that of
+    :map:`principal_component_decomposition` on all the data (up to the
+    sign of each eigenvector).
+
+    Parameters
+    ----------
+    X : (n_new_samples, n_features) ndarray
+        The new data
+    eigenvectors : (n_components, n_features) ndarray
+        The eigenvectors of the previous data
+    eigenvalues : (n_components,) ndarray
+        The eigenvalues of the previous data
+    n_samples : int
+        The number of samples the previous decomposition was built from
+    mean_vector : (n_features,) ndarray, optional
+        The mean of the previous data. If `None`, the data is assumed to be
+        centred (as with ``centre=False`` in
+        :map:`principal_component_decomposition`) and the mean is 0.
+
+        Default: `None`
+    forgetting_factor : float, optional
+        A factor in the range (0, 1] by which the contribution of the
+        previous data is down-weighted. `1` weights every sample equally.
+
+        Default: `1.0`
+    bias : bool, optional
+        Whether to use a biased estimate of the number of samples. If `False`,
+        subtracts `1` from the number of samples.
+
+        Default: `False`
+    eps : float, optional
+        Components whose eigenvalues are smaller than ``eps`` times the
+        largest eigenvalue are discarded.
+
+        Default: `10**-10`
+
+    Returns
+    -------
+    eigenvectors : (n_components, n_features) ndarray
+        The updated eigenvectors
+    eigenvalues : (n_components,) ndarray
+        The updated positive eigenvalues
+    mean_vector : (n_features,) ndarray
+        The updated mean
+    n_samples : float
+        The updated (effective) number of samples
+    """
+    if not 0 < forgetting_factor <= 1:
+        raise ValueError("forgetting_factor must be in the range (0, 1]")
+    n_new_samples, n_features = X.shape
+    f = forgetting_factor
+    # the previous scatter matrix is V^T diag(s^2) V
+    N_a = n_samples if bias else n_samples - 1.0
+    s_a = np.sqrt(N_a * eigenvalues)
+
+    if mean_vector is None:
+        new_mean_vector = np.zeros(n_features)
+    else:
+        m_b = np.mean(X, axis=0)
+        new_mean_vector = ((f * n_samples * mean_vector + n_new_samples * m_b) /
+                           (f * n_samples + n_new_samples))
+        # the difference of the means contributes to the scatter of the
+        # combined data as an extra sample
+        mean_correction = (np.sqrt(n_samples * n_new_samples /
+                                   (n_samples + n_new_samples)) *
+                           (m_b - mean_vector))
+        X = np.vstack([X - m_b, mean_correction])
+
+    C = np.vstack([f * s_a[:, None] * eigenvectors, X])
+    _, s, Vt = np.linalg.svd(C, full_matrices=False)
+
+    n_samples = f * n_samples + n_new_samples
+    N = n_samples if bias else n_samples - 1.0
+    eigenvalues = s ** 2 / N
+    # select eigenvalues within the expected tolerance, as is done in
+    # eigenvalue_decomposition
+    index = eigenvalues > np.max(eigenvalues) * eps
+    return Vt[index], eigenvalues[index], new_mean_vector, n_samples
+
+
+def randomized_principal_component_decomposition(X, n_components,
+                                                 n_oversamples=10, n_iter=2,
+                                                 centre=True, bias=False,
+                                                 inplace=False, eps=10**-10,
+                                                 random_state=None):
+    r"""
+    Apply a truncated PCA on the data matrix X, finding only the first
+    ``n_components`` components with a randomized range finder. See Halko et
+    al., "Finding structure with randomness: Probabilistic algorithms for
+    constructing approximate matrix decompositions", SIAM Review 2011.
+
+    The data is projected onto ``n_components + n_oversamples`` random
+    directions, refined with ``n_iter`` power iterations, and a thin SVD of
+    the data restricted to the resulting basis gives the components. This
+    costs ``O(n_samples * n_features * n_components)``, rather than forming
+    and decomposing a full covariance or Gram matrix as
+    :map:`principal_component_decomposition` does. The eigenvalues and
+    eigenvectors have the same meaning as those returned by
+    :map:`principal_component_decomposition`, and are equal to its first
+    ``n_components`` if the data has (close to) rank ``n_components``.
+
+    Parameters
+    ----------
+    X : (n_samples, n_features) ndarray
+        Training data
+    n_components : int
+        The number of components to find
+    n_oversamples : int, optional
+        The number of extra random directions used to improve the accuracy
+        of the range finder.
+
+        Default: `10`
+    n_iter : int, optional
+        The number of power iterations. More iterations improve the
+        accuracy when the eigenvalues decay slowly.
+
+        Default: `2`
+    centre : bool, optional
+        Whether to centre the data matrix. If `False`, zero will be subtracted.
+
+        Default: `True`
+    bias : bool, optional
+        Whether to use a biased estimate of the number of samples. If `False`,
+        subtracts `1` from the number of samples.
+
+        Default: `False`
+    inplace : bool, optional
+        Whether to do the mean subtracting inplace or not. This is crucial if
+        the data matrix is greater than half the available memory size.
+
+        Default: `False`
+    eps : float, optional
+        Components whose eigenvalues are smaller than ``eps`` times the
+        largest eigenvalue are discarded.
+
+        Default: `10**-10`
+    random_state : int or `np.random.RandomState`, optional
+        The seed or state of the random number generator.
+
+        Default: `None`
+
+    Returns
+    -------
+    eigenvectors : (n_components, n_features) ndarray
+        The eigenvectors of the data matrix
+    eigenvalues : (n_components,) ndarray
+        The positive eigenvalues from the data matrix
+    mean_vector : (n_features,) ndarray
+        The mean that was subtracted from the dataset
+    """
+    n_samples, n_features = X.shape
+    if n_components < 1:
+        raise ValueError("n_components must be at least 1")
+
+    if bias:
+        N = n_samples
+    else:
+        N = n_samples - 1.0
+
+    if centre:
+        # centre data
+        mean_vector = np.mean(X, axis=0)
+    else:
+        mean_vector = np.zeros(n_features)
+
+    # This is required if the data matrix is very large!
+    if inplace:
+        X -= mean_vector
+    else:
+        X = X - mean_vector
+
+    if not isinstance(random_state, np.random.RandomState):
+        random_state = np.random.RandomState(random_state)
+    n_random = min(n_components + n_oversamples, n_samples, n_features)
+    # find an orthonormal basis Q that (approximately) spans the range of X
+    Y = np.dot(X, random_state.normal(size=(n_features, n_random)))
+    for _ in range(n_iter):
+        # orthonormalize between the power iterations to keep the small
+        # singular values from being lost to rounding errors
+        Q = np.linalg.qr(Y)[0]
+        Q = np.linalg.qr(np.dot(X.T, Q))[0]
+        Y = np.dot(X, Q)
+    Q = np.linalg.qr(Y)[0]
+
+    # the SVD of X restricted to the basis gives the components
+    # B:  n_random  x  n_features
+    B = np.dot(Q.T, X)
+    _, s, Vt = np.linalg.svd(B, full_matrices=False)
+    eigenvalues = s[:n_components] ** 2 / N
+    eigenvectors = Vt[:n_components]
+
+    # select eigenvalues within the expected tolerance, as is done in
+    # eigenvalue_decomposition
+    index = eigenvalues > np.max(eigenvalues) * eps
+    return eigenvectors[index], eigenvalues[index], mean_vector
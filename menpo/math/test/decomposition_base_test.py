@@ -1,6 +1,8 @@
 import numpy as np
 from numpy.testing import assert_almost_equal
 from menpo.math import eigenvalue_decomposition, \
+    incremental_principal_component_decomposition, \
+    randomized_principal_component_decomposition, \
     principal_component_decomposition
 
 # Positive semi-definite matrix
@@ -271,3 +273,27 @@ def eigenvalue_decomposition_large_epsilon_test():
     sqrt_one_over_2 = np.sqrt(2.0) / 2.0
     assert_almost_equal(pos_eigenvectors,
                         [[sqrt_one_over_2], [sqrt_one_over_2]])
+
+
+def test_incremental_pcd_centered():
+    eigenvectors, eigenvalues, mean_vector = \
+        principal_component_decomposition(large_samples_data_matrix[:6])
+    output = incremental_principal_component_decomposition(
+        large_samples_data_matrix[6:], eigenvectors, eigenvalues, 6,
+        mean_vector=mean_vector)
+    eigenvectors, eigenvalues, mean_vector, n_samples = output
+    assert_almost_equal(np.abs(eigenvectors),
+                        np.abs(centered_eigenvectors_s))
+    assert_almost_equal(eigenvalues, eigenvalues_centered_no_bias_s)
+    assert_almost_equal(mean_vector, mean_vector_s)
+    assert_almost_equal(n_samples, 10)
+
+
+def test_randomized_pcd_centered():
+    output = randomized_principal_component_decomposition(
+        large_samples_data_matrix, 2, random_state=0)
+    eigenvectors, eigenvalues, mean_vector = output
+    assert_almost_equal(np.abs(eigenvectors),
+                        np.abs(centered_eigenvectors_s))
+    assert_almost_equal(eigenvalues, eigenvalues_centered_no_bias_s)
+    assert_almost_equal(mean_vector, mean_vector_s)
@@ -1,6 +1,10 @@
+from itertools import chain
 import numpy as np
 from scipy.linalg.blas import dgemm
-from menpo.math import principal_component_decomposition
+from menpo.math import (eigenvalue_decomposition,
+                        principal_component_decomposition,
+                        incremental_principal_component_decomposition,
+                        randomized_principal_component_decomposition)
 from menpo.model.base import MeanInstanceLinearModel
 
 
@@ -23,6 +27,22 @@ class PCAModel(MeanInstanceLinearModel):
     bias: bool, optional
         When True (False by default) a biased estimator of the covariance
         matrix is used. See notes.
+    method : {'eigen', 'randomized'}, optional
+        If 'eigen' (the default) the full covariance (or Gram) matrix is
+        eigen-decomposed with :map:`principal_component_decomposition`. If
+        'randomized', only the first ``n_components`` components are found
+        with :map:`randomized_principal_component_decomposition`, which is
+        much cheaper for very high dimensional data. The variance of the
+        components that are not found is kept as if the model had been
+        trimmed, so the variance ratios and noise variance are unaffected.
+    n_components : int, optional
+        The number of components to find. Required if ``method`` is
+        'randomized'.
+    n_oversamples : int, optional
+        The number of extra random directions used by the 'randomized'
+        method.
+    n_iter : int, optional
+        The number of power iterations used by the 'randomized' method.
 
     ..notes:
 
@@ -35,27 +55,137 @@ class PCAModel(MeanInstanceLinearModel):
     :math:`\frac{1}{N-1} \sum_i^N \mathbf{x}_i \mathbf{x}_i^T`
 
     """
-    def __init__(self, samples, centre=True, bias=False):
+    def __init__(self, samples, centre=True, bias=False, method='eigen',
+                 n_components=None, n_oversamples=10, n_iter=2):
+        if method not in ('eigen', 'randomized'):
+            raise ValueError("method must be 'eigen' or 'randomized'")
+        if method == 'randomized' and n_components is None:
+            raise ValueError("n_components is required by the randomized "
+                             "method")
         # build data matrix
         n_samples = len(samples)
-        n_features = samples[0].n_parameters
-        data = np.zeros((n_samples, n_features))
-        for i, sample in enumerate(samples):
-            data[i] = sample.as_vector()
+        data = _data_matrix(samples)
 
         # compute pca
-        eigenvectors, eigenvalues, mean_vector = \
-            principal_component_decomposition(data, whiten=False,
-                                              centre=centre, bias=bias)
-
-        super(PCAModel, self).__init__(eigenvectors, mean_vector, samples[0])
+        if method == 'eigen':
+            eigenvectors, eigenvalues, mean_vector = \
+                principal_component_decomposition(data, whiten=False,
+                                                  centre=centre, bias=bias)
+        else:
+            # the data matrix is ours, so centre it in place
+            eigenvectors, eigenvalues, mean_vector = \
+                randomized_principal_component_decomposition(
+                    data, n_components, n_oversamples=n_oversamples,
+                    n_iter=n_iter, centre=centre, bias=bias, inplace=True)
+
+        self._set_decomposition(eigenvectors, eigenvalues, mean_vector,
+                                samples[0], n_samples, centre, bias)
+        if method == 'randomized':
+            # account for the variance of the components that were not found
+            # as though they had been trimmed
+            N = n_samples if bias else n_samples - 1.0
+            rank = min(n_samples - 1 if centre else n_samples, data.shape[1])
+            n_trimmed = rank - self.n_components
+            residual = (np.einsum('ij, ij', data, data) / N -
+                        self._eigenvalues.sum())
+            if n_trimmed > 0 and residual > self._eigenvalues[0] * 10**-10:
+                self._trimmed_eigenvalues = np.empty(n_trimmed)
+                self._trimmed_eigenvalues.fill(residual / n_trimmed)
+
+    def _set_decomposition(self, eigenvectors, eigenvalues, mean_vector,
+                           template_instance, n_samples, centre, bias):
+        super(PCAModel, self).__init__(eigenvectors, mean_vector,
+                                       template_instance)
         self.centred = centre
         self.biased = bias
+        self.n_samples = n_samples
         self._eigenvalues = eigenvalues
         # start the active components as all the components
         self._n_active_components = int(self.n_components)
         self._trimmed_eigenvalues = None
 
+    @classmethod
+    def from_generator(cls, samples, n_samples=None, centre=True, bias=False,
+                       chunk_size=1000):
+        r"""
+        Build a model from an iterable of samples (e.g. a generator) without
+        ever holding all of the samples, or their data matrix, in memory.
+
+        The samples are consumed once, ``chunk_size`` at a time. As in
+        :map:`principal_component_decomposition`, if there are fewer features
+        than samples the mean and covariance matrix are accumulated chunk by
+        chunk and then decomposed. Otherwise the PCA is computed on the
+        first chunk and updated with each following chunk as in
+        :meth:`increment`, as decomposing the Gram matrix would need a second
+        pass over the samples. Either way, the resulting model is equal to
+        one built from a list of the same samples (up to the sign of each
+        component).
+
+        Parameters
+        ----------
+        samples : iterable of :map:`Vectorizable`
+            The samples to build the model from.
+        n_samples : int, optional
+            The number of samples. Only used to decide whether to accumulate
+            the covariance matrix. If ``None``, ``len(samples)`` is used if
+            available, otherwise the PCA is updated chunk by chunk.
+        centre : bool, optional
+            When True (True by default) PCA is performed after mean centering
+            the data. If False the data is assumed to be centred, and the
+            mean will be 0.
+        bias: bool, optional
+            When True (False by default) a biased estimator of the covariance
+            matrix is used.
+        chunk_size : int, optional
+            The number of samples that are vectorized together.
+
+        Returns
+        -------
+        model : :map:`PCAModel`
+            The PCA model of the samples.
+
+        Raises
+        ------
+        ValueError
+            If ``samples`` is empty.
+        """
+        if n_samples is None:
+            try:
+                n_samples = len(samples)
+            except TypeError:
+                pass
+        samples = iter(samples)
+        try:
+            template_instance = next(samples)
+        except StopIteration:
+            raise ValueError("Cannot build a PCAModel from no samples")
+        n_features = template_instance.n_parameters
+        chunks = _data_matrix_chunks(chain([template_instance], samples),
+                                     n_features, chunk_size)
+        model = cls.__new__(cls)
+        if n_samples is not None and n_features < n_samples:
+            S, mean_vector, n_samples = _scatter_matrix(chunks, n_features,
+                                                        centre)
+            N = n_samples if bias else n_samples - 1.0
+            S /= N
+            # enforce symmetry, as in principal_component_decomposition
+            S = (S + S.T) / 2.0
+            eigenvectors, eigenvalues = eigenvalue_decomposition(S)
+            model._set_decomposition(eigenvectors.T, eigenvalues, mean_vector,
+                                     template_instance, n_samples, centre,
+                                     bias)
+        else:
+            data = next(chunks)
+            eigenvectors, eigenvalues, mean_vector = \
+                principal_component_decomposition(data, whiten=False,
+                                                  centre=centre, bias=bias)
+            model._set_decomposition(eigenvectors, eigenvalues, mean_vector,
+                                     template_instance, data.shape[0], centre,
+                                     bias)
+            for data in chunks:
+                model._increment_data(data)
+        return model
+
     @property
     def n_active_components(self):
         r"""
@@ -384,6 +514,65 @@ class PCAModel(MeanInstanceLinearModel):
             # make sure that the eigenvalues are trimmed too
             self._eigenvalues = self._eigenvalues[:self.n_active_components]
 
+    def increment(self, samples, forgetting_factor=1.0):
+        r"""
+        Update the mean, components and eigenvalues of this model in place
+        with a new batch of samples, without needing the samples the model
+        was originally built from. See
+        :map:`incremental_principal_component_decomposition` for details.
+
+        If the model has not been trimmed and ``forgetting_factor`` is
+        ``1.0``, the updated model is equal to one built from all of the
+        samples at once (up to the sign of each component).
+
+        Parameters
+        ----------
+        samples : list of :map:`Vectorizable`
+            List of new samples to update the model with.
+        forgetting_factor : float, optional
+            A factor in the range (0, 1] by which the contribution of the
+            samples the model has seen so far is down-weighted. Values
+            smaller than ``1.0`` let the model follow a changing
+            distribution.
+
+            Default: 1.0
+
+        Notes
+        -----
+        If the model has been trimmed, the trimmed components cannot take
+        part in the update. Their eigenvalues are rescaled to the new number
+        of samples so that they are still accounted for in the
+        :meth:`original_variance` and :meth:`noise_variance`.
+
+        The number of active components is kept, unless all components were
+        active, in which case all of the updated components are active.
+        """
+        self._increment_data(_data_matrix(samples),
+                             forgetting_factor=forgetting_factor)
+
+    def _increment_data(self, data, forgetting_factor=1.0):
+        n_samples = self.n_samples
+        all_active = self.n_active_components == self.n_components
+        eigenvectors, eigenvalues, mean_vector, self.n_samples = \
+            incremental_principal_component_decomposition(
+                data, self._components, self._eigenvalues, n_samples,
+                mean_vector=self.mean_vector if self.centred else None,
+                forgetting_factor=forgetting_factor, bias=self.biased)
+
+        if self._trimmed_eigenvalues is not None:
+            # the trimmed variance scales with the updated number of samples
+            if self.biased:
+                ratio = n_samples / self.n_samples
+            else:
+                ratio = (n_samples - 1.0) / (self.n_samples - 1.0)
+            self._trimmed_eigenvalues = (self._trimmed_eigenvalues *
+                                         forgetting_factor ** 2 * ratio)
+        self._components = eigenvectors
+        self._eigenvalues = eigenvalues
+        self.mean_vector = mean_vector
+        if all_active or self.n_active_components > self.n_components:
+            self._n_active_components = int(self.n_components)
+
     def distance_to_subspace(self, instance):
         """
         Returns a version of `instance` where all the basis of the model
@@ -529,3 +718,57 @@ class PCAModel(MeanInstanceLinearModel):
             ' - components shape:     {}\n'.format(
             self.n_components, self.components.shape)
         return str_out
+
+
+def _data_matrix(samples):
+    r"""
+    Build the ``(n_samples, n_features)`` data matrix of a list of
+    :map:`Vectorizable` samples.
+    """
+    data = np.zeros((len(samples), samples[0].n_parameters))
+    for i, sample in enumerate(samples):
+        data[i] = sample.as_vector()
+    return data
+
+
+def _data_matrix_chunks(samples, n_features, chunk_size):
+    r"""
+    Yields the ``(n_chunk_samples, n_features)`` data matrices of
+    consecutive chunks of an iterable of :map:`Vectorizable` samples. The
+    same buffer is reused for every chunk.
+    """
+    data = np.empty((chunk_size, n_features))
+    i = 0
+    for sample in samples:
+        data[i] = sample.as_vector()
+        i += 1
+        if i == chunk_size:
+            yield data
+            i = 0
+    if i > 0:
+        yield data[:i]
+
+
+def _scatter_matrix(chunks, n_features, centre):
+    r"""
+    Accumulates the ``(n_features, n_features)`` scatter matrix, the mean and
+    the number of samples of an iterable of data matrices. The scatter of
+    each chunk is taken about its own mean, and corrected for the difference
+    between the means as they are combined.
+    """
+    S = np.zeros((n_features, n_features))
+    mean_vector = np.zeros(n_features)
+    n_samples = 0
+    for data in chunks:
+        n_chunk = data.shape[0]
+        if centre:
+            chunk_mean = np.mean(data, axis=0)
+            data = data - chunk_mean
+        S += dgemm(alpha=1.0, a=data.T, b=data.T, trans_b=True)
+        if centre:
+            ratio = float(n_chunk) / (n_samples + n_chunk)
+            delta = chunk_mean - mean_vector
+            S += (n_samples * ratio) * np.outer(delta, delta)
+            mean_vector += ratio * delta
+        n_samples += n_chunk
+    return S, mean_vector, n_samples
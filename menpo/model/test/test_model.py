@@ -198,3 +198,103 @@ def test_pca_orthogonalize_against_with_less_active_components():
     # number of active components must remain the same
     assert_equal(pca_model.n_active_components, 5)
 
+
+
+def test_pca_increment_centred():
+    samples = [PointCloud(np.random.randn(10)) for _ in range(20)]
+    model = PCAModel(samples)
+    inc_model = PCAModel(samples[:10])
+    inc_model.increment(samples[10:])
+    assert_equal(inc_model.n_samples, 20)
+    assert_equal(inc_model.n_components, model.n_components)
+    assert_allclose(inc_model.mean_vector, model.mean_vector)
+    assert_allclose(inc_model.eigenvalues, model.eigenvalues)
+    # components are equal up to their sign
+    assert_allclose(np.abs(np.sum(inc_model.components * model.components,
+                                  axis=1)), 1)
+
+
+def test_pca_increment_noncentred_biased():
+    samples = [PointCloud(np.random.randn(30)) for _ in range(20)]
+    model = PCAModel(samples, centre=False, bias=True)
+    inc_model = PCAModel(samples[:5], centre=False, bias=True)
+    inc_model.increment(samples[5:12])
+    inc_model.increment(samples[12:])
+    assert_allclose(inc_model.mean_vector, 0)
+    assert_allclose(inc_model.eigenvalues, model.eigenvalues)
+    assert_allclose(np.abs(np.sum(inc_model.components * model.components,
+                                  axis=1)), 1)
+
+
+def test_pca_increment_keeps_active_components():
+    samples = [PointCloud(np.random.randn(10)) for _ in range(20)]
+    model = PCAModel(samples[:10])
+    model.n_active_components = 3
+    model.increment(samples[10:], forgetting_factor=0.5)
+    assert_equal(model.n_active_components, 3)
+    assert_equal(model.n_samples, 15)
+
+
+@raises(ValueError)
+def test_pca_increment_forgetting_factor_out_of_range():
+    samples = [PointCloud(np.random.randn(10)) for _ in range(20)]
+    model = PCAModel(samples[:10])
+    model.increment(samples[10:], forgetting_factor=1.5)
+
+
+def test_pca_from_generator_covariance():
+    samples = [PointCloud(np.random.randn(10)) for _ in range(30)]
+    model = PCAModel(samples)
+    gen_model = PCAModel.from_generator((s for s in samples), n_samples=30,
+                                        chunk_size=7)
+    assert_equal(gen_model.n_samples, 30)
+    assert_allclose(gen_model.mean_vector, model.mean_vector)
+    assert_allclose(gen_model.eigenvalues, model.eigenvalues)
+    assert_allclose(np.abs(np.sum(gen_model.components * model.components,
+                                  axis=1)), 1)
+
+
+def test_pca_from_generator_unknown_n_samples():
+    samples = [PointCloud(np.random.randn(40)) for _ in range(12)]
+    model = PCAModel(samples, bias=True)
+    gen_model = PCAModel.from_generator((s for s in samples), bias=True,
+                                        chunk_size=5)
+    assert_equal(gen_model.n_components, model.n_components)
+    assert_allclose(gen_model.mean_vector, model.mean_vector)
+    assert_allclose(gen_model.eigenvalues, model.eigenvalues)
+    assert_allclose(np.abs(np.sum(gen_model.components * model.components,
+                                  axis=1)), 1)
+
+
+@raises(ValueError)
+def test_pca_from_generator_empty():
+    PCAModel.from_generator(iter([]))
+
+
+def test_pca_randomized_low_rank():
+    basis = np.random.randn(4, 60)
+    samples = [PointCloud(np.dot(np.random.randn(4), basis).reshape([-1, 2]))
+               for _ in range(30)]
+    model = PCAModel(samples)
+    rand_model = PCAModel(samples, method='randomized', n_components=4)
+    assert_equal(rand_model.n_components, 4)
+    assert_allclose(rand_model.mean_vector, model.mean_vector)
+    assert_allclose(rand_model.eigenvalues, model.eigenvalues[:4])
+    assert_allclose(np.abs(np.sum(rand_model.components *
+                                  model.components[:4], axis=1)), 1)
+
+
+def test_pca_randomized_variance():
+    samples = [PointCloud(np.random.randn(10)) for _ in range(30)]
+    model = PCAModel(samples)
+    rand_model = PCAModel(samples, method='randomized', n_components=3)
+    assert_equal(rand_model.n_components, 3)
+    # the variance of the components that were not found is kept
+    assert_allclose(rand_model.original_variance(), model.original_variance())
+    assert(rand_model.noise_variance() > 0)
+
+
+@raises(ValueError)
+def test_pca_randomized_requires_n_components():
+    samples = [PointCloud(np.random.randn(10)) for _ in range(10)]
+    PCAModel(samples, method='randomized')
@@ -29,4 +29,44 @@ def is_same_array(a, b):
         return b.base is a
 
     # Fallthough, they are either the same array or they aren't!
-    return a is b
\ No newline at end of file
+    return a is b
+
+class RecordingThreadPool(object):
+    """
+    A stand-in for :class:`multiprocessing.pool.ThreadPool` that runs each job
+    as soon as it is submitted, recording the largest number of jobs that were
+    pending (submitted, but whose results had not been taken) at once. Used to
+    test that the prefetching of imports and exports is bounded.
+
+    Parameters
+    ----------
+    n_workers : int
+        The number of workers (ignored).
+    """
+    # the largest number of pending jobs of any pool since it was last reset
+    max_pending = 0
+
+    def __init__(self, n_workers):
+        self.pending = []
+
+    def apply_async(self, f, args=(), kwds=None):
+        value = f(*args, **(kwds or {}))
+        result = _RecordedResult(self, value)
+        self.pending.append(result)
+        RecordingThreadPool.max_pending = max(RecordingThreadPool.max_pending,
+                                              len(self.pending))
+        return result
+
+    def terminate(self):
+        pass
+
+
+class _RecordedResult(object):
+
+    def __init__(self, pool, value):
+        self.pool = pool
+        self.value = value
+
+    def get(self):
+        self.pool.pending.remove(self)
+        return self.value
@@ -1,6 +1,7 @@
 from .base import Transform, TransformChain
 from .homogeneous import *
 from .thinplatesplines import ThinPlateSplines
-from .piecewiseaffine import PiecewiseAffine
+from .piecewiseaffine import PiecewiseAffine, TemplatePWA
 from .rbf import R2LogR2RBF, R2LogRRBF
-from .groupalign.procrustes import GeneralizedProcrustesAnalysis
+from .groupalign.procrustes import (GeneralizedProcrustesAnalysis,
+                                   BatchGeneralizedProcrustesAnalysis)
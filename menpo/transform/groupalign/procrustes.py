@@ -1,6 +1,7 @@
 import numpy as np
 
-from menpo.transform import AlignmentSimilarity, UniformScale, Translation
+from menpo.transform import (AlignmentSimilarity, UniformScale, Translation,
+                             Affine, batch_procrustes_alignment)
 from .base import MultipleAlignment
 
 mean_pointcloud = None  # to avoid circular imports
@@ -106,3 +107,167 @@ class GeneralizedProcrustesAnalysis(MultipleAlignment):
         else:
             return ('Failed to converge after %d iterations with av. error '
                     '%f' % (self.n_iterations, self.mean_alignment_error()))
+
+
+class BatchGeneralizedProcrustesAnalysis(MultipleAlignment):
+    r"""
+    Class for aligning multiple source shapes between them, computed on a
+    single ``(n_sources, n_points, n_dims)`` array.
+
+    The alignment is equal to that of :map:`GeneralizedProcrustesAnalysis`,
+    but each iteration aligns all of the sources at once with
+    :func:`batch_procrustes_alignment` in an explicit loop, rather than
+    recursing and updating a :map:`AlignmentSimilarity` per source. The
+    sources are aligned in chunks, so that the temporary memory needed is
+    bounded whatever the number of sources. :map:`AlignmentSimilarity`
+    transforms are only built if :attr:`transforms` is accessed.
+
+    Parameters
+    ----------
+    sources : list of :map:`PointCloud` or ``(n_sources, n_points, n_dims)`` `ndarray`
+        The shapes to be aligned.
+
+    target : :map:`PointCloud`, optional
+        The target :map:`PointCloud` to align each source to.
+        If None, then the mean of the sources is used.
+
+    tolerance : `float`, optional
+        The alignment has converged once the norm of the change in the
+        target between iterations falls below this value.
+
+    max_iterations : `int`, optional
+        The maximum number of iterations to perform.
+
+    chunk_size : `int`, optional
+        The number of sources that are aligned at once.
+
+    Raises
+    -------
+    ValueError
+        Need at least two sources to align
+    """
+    def __init__(self, sources, target=None, tolerance=1e-6,
+                 max_iterations=100, chunk_size=10000):
+        global PointCloud
+        if PointCloud is None:
+            from menpo.shape import PointCloud
+        if not isinstance(sources, np.ndarray):
+            sources = np.array([s.points for s in sources])
+        if len(sources) < 2 and target is None:
+            raise ValueError("Need at least two sources to align")
+        self.points = np.require(sources, dtype=np.float64,
+                                 requirements=['C'])
+        self.n_sources, self.n_points, self.n_dims = self.points.shape
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.chunk_size = chunk_size
+        self.h_matrices = np.empty([self.n_sources, self.n_dims + 1,
+                                    self.n_dims + 1])
+        self.aligned_points = np.empty_like(self.points)
+        self.target_deltas = []
+        self.alignment_errors = []
+        self._sources = None
+        self._transforms = None
+        if target is None:
+            initial_target = PointCloud(self.points.mean(axis=0))
+        else:
+            initial_target = target
+        self.initial_target_scale = initial_target.norm()
+        self.n_iterations = 1
+        self.converged = self._iterative_procrustes(initial_target.points)
+        if target is None:
+            self.target = PointCloud(self._aligned_target, copy=False)
+        else:
+            self.target = initial_target
+
+    def _align(self, target):
+        r"""
+        Aligns every source to the target, updating the homogeneous matrices
+        and aligned points, and returns the mean alignment error.
+        """
+        total_error = 0.
+        for start in range(0, self.n_sources, self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            h_matrices = batch_procrustes_alignment(self.points[chunk],
+                                                    target)
+            self.h_matrices[chunk] = h_matrices
+            aligned = Affine.apply_h_matrices(h_matrices, self.points[chunk])
+            self.aligned_points[chunk] = aligned
+            aligned -= target
+            total_error += np.sqrt(np.einsum('nij, nij -> n', aligned,
+                                             aligned)).sum()
+        self._aligned_target = target
+        return total_error / self.n_sources
+
+    def _iterative_procrustes(self, target):
+        r"""
+        Iteratively calculates a procrustes alignment.
+        """
+        self.alignment_errors.append(self._align(target))
+        while self.n_iterations <= self.max_iterations:
+            new_tgt = self.aligned_points.mean(axis=0)
+            # rescale the new target to be the same size as the original
+            # about it's centre
+            centre = new_tgt.mean(axis=0)
+            new_tgt -= centre
+            new_tgt *= self.initial_target_scale / np.linalg.norm(new_tgt)
+            new_tgt += centre
+            # check to see if we have converged yet
+            delta_target = np.linalg.norm(target - new_tgt)
+            self.target_deltas.append(delta_target)
+            if delta_target < self.tolerance:
+                return True
+            self.n_iterations += 1
+            self.alignment_errors.append(self._align(new_tgt))
+            target = new_tgt
+        return False
+
+    @property
+    def sources(self):
+        r"""
+        The sources, as a list of :map:`PointCloud` that share memory with
+        :attr:`points`.
+
+        :type: list of :map:`PointCloud`
+        """
+        if self._sources is None:
+            self._sources = [PointCloud(p, copy=False) for p in self.points]
+        return self._sources
+
+    @property
+    def transforms(self):
+        r"""
+        The :map:`AlignmentSimilarity` transforms that map each source
+        optimally to the final target. Built on first access.
+
+        :type: list of :map:`AlignmentSimilarity`
+        """
+        if self._transforms is None:
+            target = PointCloud(self._aligned_target, copy=False)
+            self._transforms = [AlignmentSimilarity(s, target)
+                                for s in self.sources]
+        return self._transforms
+
+    def mean_aligned_shape(self):
+        r"""
+        Returns the mean of the aligned shapes.
+
+        :type: PointCloud
+        """
+        return PointCloud(self._aligned_target)
+
+    def mean_alignment_error(self):
+        r"""
+        Returns the average error of the procrustes alignment.
+
+        :type: float
+        """
+        return self.alignment_errors[-1]
+
+    def __str__(self):
+        if self.converged:
+            return ('Converged after %d iterations with av. error %f'
+                    % (self.n_iterations, self.mean_alignment_error()))
+        else:
+            return ('Failed to converge after %d iterations with av. error '
+                    '%f' % (self.n_iterations, self.mean_alignment_error()))
@@ -1,6 +1,7 @@
 from .base import Homogeneous
 from .affine import Affine, AlignmentAffine
-from .similarity import Similarity, AlignmentSimilarity
+from .similarity import (Similarity, AlignmentSimilarity,
+                         batch_procrustes_alignment)
 from .rotation import Rotation, AlignmentRotation
 from .translation import Translation, AlignmentTranslation
 from .scale import Scale, NonUniformScale, UniformScale, AlignmentUniformScale
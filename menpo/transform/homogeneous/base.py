@@ -7,6 +7,43 @@ from menpo.transform.base import (Alignment, ComposableTransform,
                                   VComposable, VInvertible)
 
 
+def _batch_apply_h_matrices(h_matrices, points, affine=False):
+    r"""
+    Apply a stack of homogeneous matrices to a stack of point arrays.
+
+    Parameters
+    ----------
+    h_matrices : ``(N, n_dims + 1, n_dims + 1)`` `ndarray`
+        The homogeneous matrices. ``N`` may be ``1``, in which case the
+        single matrix is applied to every set of points.
+    points : ``(N, n_points, n_dims)`` `ndarray`
+        The points. ``N`` may be ``1``, in which case every matrix is applied
+        to the single set of points.
+    affine : `bool`, optional
+        If ``True`` the matrices are known to be affine, so the division by
+        the homogeneous coordinate is skipped.
+
+    Returns
+    -------
+    transformed : ``(N, n_points, n_dims_output)`` `ndarray`
+        The transformed points.
+    """
+    n_dims = points.shape[-1]
+    if h_matrices.shape[-1] != n_dims + 1:
+        raise ValueError("Trying to apply {}D transforms to {}D "
+                         "points".format(h_matrices.shape[-1] - 1, n_dims))
+    # the translation (last column) of every row of every matrix, then
+    # accumulate the contribution of each input dimension - a handful of
+    # vectorized operations, whatever the number of point sets
+    n = max(h_matrices.shape[0], points.shape[0])
+    h_y = h_matrices[:, None, :, -1] + np.zeros([n, points.shape[1], 1])
+    for j in range(n_dims):
+        h_y += h_matrices[:, None, :, j] * points[:, :, j, None]
+    if affine:
+        return h_y[..., :-1]
+    return h_y[..., :-1] / h_y[..., -1, None]
+
+
 class HomogFamilyAlignment(Alignment):
     r"""
     Simple subclass of Alignment that adds the ability to create a copy of an
@@ -217,6 +254,70 @@ class Homogeneous(ComposableTransform, Vectorizable, VComposable, VInvertible):
         # normalize and return
         return (h_y / h_y[:, -1][:, None])[:, :-1]
 
+    def apply_batch(self, points):
+        r"""
+        Apply this transform to a stack of point arrays at once.
+
+        Parameters
+        ----------
+        points : ``(N, n_points, n_dims)`` `ndarray`
+            ``N`` sets of points, e.g. a training set of shapes.
+
+        Returns
+        -------
+        transformed : ``(N, n_points, n_dims_output)`` `ndarray`
+            The transformed points.
+        """
+        return self.apply_h_matrices(self.h_matrix, points)
+
+    @classmethod
+    def apply_h_matrices(cls, h_matrices, points):
+        r"""
+        Apply a stack of transforms to a stack of point arrays with a single
+        vectorized kernel, without building a transform object per set of
+        points.
+
+        Calling this on a subclass (e.g. ``Affine.apply_h_matrices``)
+        asserts that all the matrices belong to that family, which allows for
+        a faster kernel (affine matrices do not need the homogeneous
+        division).
+
+        Parameters
+        ----------
+        h_matrices : ``(N, n_dims + 1, n_dims + 1)`` `ndarray` or list of :map:`Homogeneous`
+            The homogeneous matrices of the ``N`` transforms. A single
+            ``(n_dims + 1, n_dims + 1)`` matrix is applied to every set of
+            points.
+        points : ``(N, n_points, n_dims)`` `ndarray`
+            The ``N`` sets of points, the i'th of which is transformed by the
+            i'th matrix. A single ``(n_points, n_dims)`` set of points is
+            transformed by every matrix.
+
+        Returns
+        -------
+        transformed : ``(N, n_points, n_dims_output)`` `ndarray`
+            The transformed points.
+
+        Raises
+        ------
+        ValueError
+            If the number of matrices and point sets differ, or their
+            dimensionality does not match.
+        """
+        if not isinstance(h_matrices, np.ndarray):
+            h_matrices = np.array([t.h_matrix for t in h_matrices])
+        if h_matrices.ndim == 2:
+            h_matrices = h_matrices[None]
+        if points.ndim == 2:
+            points = points[None]
+        if (h_matrices.shape[0] != points.shape[0] and
+                1 not in (h_matrices.shape[0], points.shape[0])):
+            raise ValueError("Trying to apply {} transforms to {} sets of "
+                             "points".format(h_matrices.shape[0],
+                                             points.shape[0]))
+        return _batch_apply_h_matrices(h_matrices, points,
+                                       affine=issubclass(cls, Affine))
+
     def _as_vector(self):
         return self.h_matrix.ravel()
 
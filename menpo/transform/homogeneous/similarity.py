@@ -278,3 +278,79 @@ def procrustes_alignment(source, target, rotation=True):
     # finally, translate the target back
     p.compose_before_inplace(tgt_t.pseudoinverse())
     return p
+
+
+def batch_procrustes_alignment(sources, target, rotation=True,
+                               return_aligned=False):
+    r"""
+    Returns the similarity transforms that align each of a stack of sources
+    to a single target, computed with stacked linear algebra rather than by
+    building a :map:`Similarity` per source.
+
+    The ``i``'th result is equal to that of :func:`procrustes_alignment`
+    called with the ``i``'th source and the target.
+
+    Parameters
+    ----------
+    sources : ``(N, n_points, n_dims)`` `ndarray` or list of :map:`PointCloud`
+        The sources to be aligned.
+
+    target : :map:`PointCloud` or ``(n_points, n_dims)`` `ndarray`
+        The target that every source is aligned to.
+
+    rotation : `bool`, optional
+        If `True`, rotation is allowed in the Procrustes calculation. If
+        False, only scale and translation effects are used.
+
+    return_aligned : `bool`, optional
+        If `True`, the aligned sources are returned rather than the
+        homogeneous matrices of the alignments.
+
+    Returns
+    -------
+    h_matrices : ``(N, n_dims + 1, n_dims + 1)`` `ndarray`
+        The homogeneous matrices of the similarity transforms that optimally
+        align each source to the target. Only returned if not
+        ``return_aligned``.
+
+    aligned : ``(N, n_points, n_dims)`` `ndarray`
+        Each source aligned to the target. Only returned if
+        ``return_aligned``.
+
+    Raises
+    ------
+    ValueError
+        If the shape of the sources does not match that of the target.
+    """
+    if not isinstance(sources, np.ndarray):
+        sources = np.array([s.points for s in sources])
+    target = getattr(target, 'points', target)
+    if sources.ndim != 3 or sources.shape[1:] != target.shape:
+        raise ValueError("Trying to align sources of shape {} to a target of "
+                         "shape {}".format(sources.shape[1:], target.shape))
+    n_sources, _, n_dims = sources.shape
+    # centre everything...
+    src_centres = sources.mean(axis=1)
+    tgt_centre = target.mean(axis=0)
+    centred_srcs = sources - src_centres[:, None, :]
+    centred_tgt = target - tgt_centre
+    # ...and scale each source to the norm of the target
+    src_norms = np.sqrt(np.einsum('nij, nij -> n', centred_srcs,
+                                  centred_srcs))
+    scales = np.linalg.norm(centred_tgt) / src_norms
+    linear = scales[:, None, None] * np.eye(n_dims)
+    if rotation:
+        # the optimal rotation of each source from the SVD of its
+        # correlation with the target (scale does not affect the rotation)
+        correlations = np.einsum('pi, npj -> nij', centred_tgt, centred_srcs)
+        U, _, Vt = np.linalg.svd(correlations)
+        linear = np.einsum('n, nij, njk -> nik', scales, U, Vt)
+    h_matrices = np.zeros([n_sources, n_dims + 1, n_dims + 1])
+    h_matrices[:, :-1, :-1] = linear
+    h_matrices[:, :-1, -1] = (tgt_centre -
+                              np.einsum('nij, nj -> ni', linear, src_centres))
+    h_matrices[:, -1, -1] = 1
+    if return_aligned:
+        return Similarity.apply_h_matrices(h_matrices, sources)
+    else:
+        return h_matrices
@@ -1,2 +1,4 @@
 from .base import CachedPWA as PiecewiseAffine  # the default PWA caches
 from .base import TriangleContainmentError
+from .base import TemplatePWA
+from .base import triangle_index
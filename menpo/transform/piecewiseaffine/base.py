@@ -1,11 +1,15 @@
 import abc
+import itertools
 import numpy as np
 from copy import deepcopy
 from menpo.base import Copyable
 from menpo.transform.base import Alignment, Invertible, Transform
-from .fastpwa import CLookupPWA
+from .fastpwa import CLookupPWA, CTriangleIndex
 # TODO View is broken for PWA (TriangleContainmentError)
 
+# Source of unique tokens identifying the template cached on a TemplatePWA
+_template_tokens = itertools.count()
+
 
 class TriangleContainmentError(Exception):
     r"""
@@ -194,6 +198,33 @@ def barycentric_vectors(points, trilist):
     return x[0], x[1] - x[0], x[2] - x[0]
 
 
+def triangle_index(trimesh):
+    r"""
+    Build a spatial index over the triangles of a 2D :map:`TriMesh`, which
+    finds the containing triangle (and barycentric coordinates) of points in
+    near-constant time per point, regardless of the number of triangles.
+
+    Parameters
+    ----------
+    trimesh : :map:`TriMesh`
+        The 2D triangulation to index.
+
+    Returns
+    -------
+    index : :class:`CTriangleIndex`
+        The spatial index. ``index.index_alpha_beta(points)`` returns the
+        triangle index (-1 for points outside of every triangle), alpha and
+        beta for each of the (C-contiguous, float64) ``points``.
+    """
+    if trimesh.n_dims != 2:
+        raise ValueError("Can only index the triangles of a 2D TriMesh")
+    points_c = np.require(trimesh.points, dtype=np.float64,
+                          requirements=['C'])
+    trilist_c = np.require(trimesh.trilist, dtype=np.uint32,
+                           requirements=['C'])
+    return CTriangleIndex(points_c, trilist_c)
+
+
 # Note we inherit from Alignment first to get it's n_dims behavior
 class AbstractPWA(Alignment, Transform, Invertible):
     r"""
@@ -370,7 +401,10 @@ class CythonPWA(AbstractPWA):
 
     The apply method in this case involves dotting the triangle vectors with
     the values of alpha and beta found. The calculation of alpha and beta is
-     done in C, and a hash map is used to cache lookup values.
+     done in C, and a hash map is used to cache lookup values. Containing
+    triangles are found through a uniform grid over the source triangles
+    (see :attr:`triangle_index`), so the cost of a lookup does not grow with
+    the number of triangles.
 
     Parameters
     ----------
@@ -401,6 +435,22 @@ class CythonPWA(AbstractPWA):
                                requirements=['C'])
         # build the cython wrapped C object and store it locally
         self._fastpwa = CLookupPWA(source_c, trilist_c)
+        self._triangle_index = None
+
+    @property
+    def triangle_index(self):
+        r"""
+        A spatial index over the source triangles, which can be used for any
+        other containment queries against the source triangulation - see
+        :func:`triangle_index`. Unlike the lookups of this transform, its
+        lookups are not cached, so it can be queried with any number of
+        distinct points. It is built on first access.
+
+        :type: :class:`CTriangleIndex`
+        """
+        if self._triangle_index is None:
+            self._triangle_index = triangle_index(self.source)
+        return self._triangle_index
 
     def copy(self):
         new = Copyable.copy(self)
@@ -414,3 +464,148 @@ class CythonPWA(AbstractPWA):
             raise TriangleContainmentError(index < 0)
         else:
             return index, alpha, beta
+
+
+class TemplatePWA(CythonPWA):
+    r"""
+    A piecewise affine transformation specialised for repeatedly mapping a
+    fixed set of template points (for instance, the true pixels of a
+    reference frame) as the target changes.
+
+    The containing triangle and barycentric coordinates (alpha, beta) of
+    each template point depend only on the source, so they are computed
+    once in :meth:`set_template`. Applying the transform to the template is
+    then a single gather of the target triangle vectors followed by a
+    multiply-add with the cached barycentric coordinates.
+
+    The cache is identified by an explicit token that is returned by
+    :meth:`set_template` (and is available as :attr:`template_token`).
+    Passing this token to :meth:`apply` uses the cache - no comparison of
+    the points themselves is ever made. Calls to :meth:`apply` without a
+    token behave exactly as for :class:`CythonPWA`.
+
+    Parameters
+    ----------
+    source : :class:`menpo.shape.PointCloud` or :class:`menpo.shape.TriMesh`
+        The source points. If a TriMesh is provided, the triangulation on
+        the TriMesh is used. If a :class:`menpo.shape.PointCloud`
+        is provided, a Delaunay triangulation of the source is performed
+        automatically.
+    target : :class:`PointCloud`
+        The target points. Note that the trilist is entirely decided by
+        the source.
+    template_points : (K, 2) ndarray or :class:`PointCloud`, optional
+        If provided, :meth:`set_template` is called with these points.
+
+    Raises
+    ------
+    ValueError
+        Source and target must both be 2D.
+
+    TriangleContainmentError
+        All points to apply must be contained in a source triangle. Check
+        `error.points_outside_source_domain` to handle this case.
+    """
+    def __init__(self, source, target, template_points=None):
+        super(TemplatePWA, self).__init__(source, target)
+        self.template_token = None
+        self._template_index = None
+        self._template_alpha, self._template_beta = None, None
+        if template_points is not None:
+            self.set_template(template_points)
+
+    @property
+    def n_template_points(self):
+        r"""
+        The number of template points that are cached, or ``None`` if no
+        template has been set.
+
+        :type: int
+        """
+        if self._template_index is None:
+            return None
+        return self._template_index.shape[0]
+
+    def set_template(self, points):
+        r"""
+        Cache the containing triangle and barycentric coordinates of a set of
+        template points.
+
+        Parameters
+        ----------
+        points : (K, 2) ndarray or :class:`PointCloud`
+            The template points. All must be contained in a source triangle.
+
+        Returns
+        -------
+        token : int
+            The token identifying this template. Pass it to :meth:`apply`
+            (as ``template_token``) to map the template points.
+
+        Raises
+        ------
+        TriangleContainmentError
+            All `points` must be contained in a source triangle. Check
+            `error.points_outside_source_domain` to handle this case.
+        """
+        points = getattr(points, 'points', points)
+        index, alpha, beta = self.index_alpha_beta(points)
+        self._template_index = index
+        # store with a trailing axis ready for broadcasting in apply
+        self._template_alpha = alpha[:, None]
+        self._template_beta = beta[:, None]
+        self.template_token = next(_template_tokens)
+        return self.template_token
+
+    def apply_template(self):
+        r"""
+        Map the cached template points to the current target.
+
+        Returns
+        -------
+        transformed : (K, 2) ndarray
+            The transformed template points.
+        """
+        if self.template_token is None:
+            raise ValueError("No template has been set - call set_template "
+                             "first")
+        index = self._template_index
+        return (self.ti[index] +
+                self._template_alpha * self.tij[index] +
+                self._template_beta * self.tik[index])
+
+    def _apply(self, x, template_token=None, **kwargs):
+        """
+        Applies this transform to a new set of vectors.
+
+        Parameters
+        ----------
+        x : (K, 2) ndarray
+            Points to apply this transform to.
+        template_token : int, optional
+            If provided, ``x`` is taken to be the template points that were
+            passed to :meth:`set_template` when this token was returned, and
+            the cached barycentric coordinates are used.
+
+        Returns
+        -------
+        transformed : (K, 2) ndarray
+            The transformed array.
+
+        Raises
+        ------
+        ValueError
+            If ``template_token`` is not the token of the current template,
+            or ``x`` is not the same size as the template.
+        """
+        if template_token is None:
+            return CythonPWA._apply(self, x, **kwargs)
+        if template_token != self.template_token:
+            raise ValueError("template_token {} does not identify the "
+                             "current template ({})".format(
+                template_token, self.template_token))
+        if x.shape[0] != self.n_template_points:
+            raise ValueError("Expected the {} template points, got {} "
+                             "points".format(self.n_template_points,
+                                             x.shape[0]))
+        return self.apply_template()
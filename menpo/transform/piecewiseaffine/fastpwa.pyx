@@ -11,12 +11,18 @@ cdef extern from "./fastpwa/pwa.h":
     ctypedef struct AlphaBetaIndex:
         pass
 
+    ctypedef struct TriangleGrid:
+        pass
+
     TriangleCollection initTriangleCollection(double *vertices,
                                               unsigned int *trilist,
                                               unsigned int n_triangles)
 
+    TriangleGrid initTriangleGrid(TriangleCollection *tris)
+
     void arrayCachedAlphaBetaIndexForPoints(AlphaBetaIndex **hashMap,
                                       TriangleCollection *tris,
+                                      TriangleGrid *grid,
                                       double *points,
                                       unsigned int n_points, int *indexes,
                                       double *alphas, double *betas)
@@ -24,12 +30,36 @@ cdef extern from "./fastpwa/pwa.h":
                                       double *points,
                                       unsigned int n_points, int *indexes,
                                       double *alphas, double *betas)
+    void arrayGridAlphaBetaIndexForPoints(TriangleCollection *tris,
+                                          TriangleGrid *grid,
+                                          double *points,
+                                          unsigned int n_points,
+                                          int *indexes, double *alphas,
+                                          double *betas)
     void clearCacheAndDelete(AlphaBetaIndex **hashMap)
     void deleteTriangleCollection(TriangleCollection *tris)
+    void deleteTriangleGrid(TriangleGrid *grid)
+
 
-cdef class CLookupPWA:
+cdef class CTriangleIndex:
+    r"""
+    A spatial index over the triangles of a 2D triangulation.
+
+    A uniform grid over the bounding box of the triangles is built once, so
+    that finding the containing triangle of a point only involves testing
+    the few triangles that overlap its grid cell, rather than every
+    triangle. If a point lies in more than one triangle (on a shared edge)
+    the lowest triangle index is returned.
+
+    Parameters
+    ----------
+    points : (n_points, 2) C-contiguous float64 ndarray
+        The vertices of the triangulation.
+    trilist : (n_tris, 3) C-contiguous uint32 ndarray
+        The triangle list.
+    """
     cdef TriangleCollection tris
-    cdef AlphaBetaIndex *hashMap
+    cdef TriangleGrid grid
     cdef unsigned n_tris
     cdef object points
     cdef object trilist
@@ -37,14 +67,69 @@ cdef class CLookupPWA:
     def __cinit__(self,
                   double[:, ::1] points not None,
                   unsigned[:, ::1] trilist not None):
-        hashMap = NULL
         if points.shape[1] != 2:
-            raise Exception
+            raise ValueError("points must be of shape (n_points, 2)")
+        if trilist.shape[1] != 3:
+            raise ValueError("trilist must be of shape (n_tris, 3)")
         self.n_tris = trilist.shape[0]
         self.points = points
         self.trilist = trilist
-        self.tris =  initTriangleCollection(&points[0,0], &trilist[0,0],
-                                            trilist.shape[0])
+        self.tris = initTriangleCollection(&points[0, 0], &trilist[0, 0],
+                                           trilist.shape[0])
+        self.grid = initTriangleGrid(&self.tris)
+
+    def __dealloc__(self):
+        deleteTriangleGrid(&self.grid)
+        deleteTriangleCollection(&self.tris)
+
+    def __reduce__(self):
+        r"""
+        Implement the reduction protocol so this object is copyable/picklable
+        """
+        return self.__class__, (np.asarray(self.points),
+                                np.asarray(self.trilist))
+
+    def index_alpha_beta(self, double[:, ::1] points not None):
+        r"""
+        Find the containing triangle and barycentric coordinates of each
+        point.
+
+        Parameters
+        ----------
+        points : (K, 2) C-contiguous float64 ndarray
+            Points to test.
+
+        Returns
+        -------
+        tri_index : (K,) int32 ndarray
+            Index of the containing triangle of each point, or -1 if the
+            point is not contained in any triangle.
+        alpha : (K,) ndarray
+            Alpha for the containing triangle of each point.
+        beta : (K,) ndarray
+            Beta for the containing triangle of each point.
+        """
+        cdef cnp.ndarray[double, ndim=1, mode='c'] alphas = \
+            np.zeros(points.shape[0], dtype=np.float64)
+        cdef cnp.ndarray[double, ndim=1, mode='c'] betas = \
+            np.zeros(points.shape[0], dtype=np.float64)
+        cdef cnp.ndarray[int, ndim=1, mode='c'] indexes = \
+            np.zeros(points.shape[0], dtype=np.int32)
+        if points.shape[0] == 0:
+            return indexes, alphas, betas
+        arrayGridAlphaBetaIndexForPoints(&self.tris, &self.grid,
+                                         &points[0, 0], points.shape[0],
+                                         &indexes[0], &alphas[0], &betas[0])
+        return indexes, alphas, betas
+
+
+cdef class CLookupPWA(CTriangleIndex):
+    cdef AlphaBetaIndex *hashMap
+
+    def __cinit__(self,
+                  double[:, ::1] points not None,
+                  unsigned[:, ::1] trilist not None):
+        self.hashMap = NULL
 
     def _init_source_triangles(self,
                   double[:, ::1] points not None,
@@ -54,8 +139,11 @@ cdef class CLookupPWA:
             raise Exception
         elif points.shape[0] != self.n_tris:
             raise Exception
+        deleteTriangleGrid(&self.grid)
+        deleteTriangleCollection(&self.tris)
         self.tris =  initTriangleCollection(&points[0,0], &trilist[0,0],
                                             self.n_tris)
+        self.grid = initTriangleGrid(&self.tris)
 
     def _init_target_triangles(
             self, double[:, ::1] points not None,
@@ -64,16 +152,8 @@ cdef class CLookupPWA:
             &points[0, 0], &trilist[0, 0], trilist.shape[0])
 
     def __dealloc__(self):
-        deleteTriangleCollection(&self.tris)
         clearCacheAndDelete(&self.hashMap)
 
-    def __reduce__(self):
-        r"""
-        Implement the reduction protocol so this object is copyable/picklable
-        """
-        return self.__class__, (np.asarray(self.points),
-                                np.asarray(self.trilist))
-
     def index_alpha_beta(self, double[:, ::1] points not None):
         # create three c numpy arrays for storing our output into
         cdef cnp.ndarray[double, ndim=1, mode='c'] alphas = \
@@ -82,9 +162,11 @@ cdef class CLookupPWA:
             np.zeros(points.shape[0], dtype=np.float64)
         cdef cnp.ndarray[int, ndim=1, mode='c'] indexes = \
             np.zeros(points.shape[0], dtype=np.int32)
+        if points.shape[0] == 0:
+            return indexes, alphas, betas
         # fill the arrays with the C results
         arrayCachedAlphaBetaIndexForPoints(&self.hashMap, &self.tris,
-                                          &points[0,0],
+                                          &self.grid, &points[0,0],
                                      points.shape[0], &indexes[0],
                                      &alphas[0], &betas[0])
         return indexes, alphas, betas
@@ -14,13 +14,18 @@ int main(int argc, char** argv)
   AlphaBetaIndex *alphaBetaIndexHash = NULL;
   TriangleCollection tris = initTriangleCollection(vertices, trilist, 2);
   printf("Built a TrangleCollection with %u triangles\n", tris.n_triangles);
+  TriangleGrid grid = initTriangleGrid(&tris);
+  printf("Built a %ux%u TriangleGrid\n", grid.n_x, grid.n_y);
   double queryPoints [] = {0., 0.1,
                            0.2, 0.4};
   double alpha [2];
   double beta [2];
   int index [2];
-  arrayAlphaBetaIndexForPoints(&alphaBetaIndexHash, &tris, queryPoints, 2, index, alpha, beta);
-  arrayAlphaBetaIndexForPoints(&alphaBetaIndexHash, &tris, queryPoints, 2, index, alpha, beta);
+  arrayCachedAlphaBetaIndexForPoints(&alphaBetaIndexHash, &tris, &grid, queryPoints, 2, index, alpha, beta);
+  arrayCachedAlphaBetaIndexForPoints(&alphaBetaIndexHash, &tris, &grid, queryPoints, 2, index, alpha, beta);
+  printf("index=[%d, %d]\n", index[0], index[1]);
+  clearCacheAndDelete(&alphaBetaIndexHash);
+  deleteTriangleGrid(&grid);
   deleteTriangleCollection(&tris);
   return 0;
 }
@@ -1,7 +1,9 @@
 #include "pwa.h"
 
+#include <math.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include <string.h>
 #include "uthash.h"
 
 //
@@ -118,6 +120,177 @@ void containingTriangleAndAlphaBetaForPoint(TriangleCollection *tris, Point p,
   }
 }
 
+//
+// ----- TRIANGLEGRID -----
+//
+// (fmin/fmax are C99, which not all of our compilers support)
+static double minDouble(double a, double b)
+{
+  return a < b ? a : b;
+}
+
+static double maxDouble(double a, double b)
+{
+  return a > b ? a : b;
+}
+
+static unsigned int gridCellX(TriangleGrid *grid, double x)
+{
+  double c = floor((x - grid->min_x) * grid->inv_cell_width);
+  if (c < 0) {
+    return 0;
+  } else if (c >= grid->n_x) {
+    return grid->n_x - 1;
+  }
+  return (unsigned int)c;
+}
+
+static unsigned int gridCellY(TriangleGrid *grid, double y)
+{
+  double c = floor((y - grid->min_y) * grid->inv_cell_height);
+  if (c < 0) {
+    return 0;
+  } else if (c >= grid->n_y) {
+    return grid->n_y - 1;
+  }
+  return (unsigned int)c;
+}
+
+static void triangleBounds(Triangle t, double pad, double *min_x, double *min_y,
+                           double *max_x, double *max_y)
+{
+  *min_x = minDouble(t.i.x, minDouble(t.j.x, t.k.x)) - pad;
+  *min_y = minDouble(t.i.y, minDouble(t.j.y, t.k.y)) - pad;
+  *max_x = maxDouble(t.i.x, maxDouble(t.j.x, t.k.x)) + pad;
+  *max_y = maxDouble(t.i.y, maxDouble(t.j.y, t.k.y)) + pad;
+}
+
+TriangleGrid initTriangleGrid(TriangleCollection *tris)
+{
+  unsigned int i, x, y, n_cells, x0, x1, y0, y1;
+  double t_min_x, t_min_y, t_max_x, t_max_y, width, height, pad;
+  unsigned int *fill;
+  TriangleGrid grid;
+  grid.n_x = 1;
+  grid.n_y = 1;
+  grid.min_x = grid.min_y = 0;
+  grid.max_x = grid.max_y = -1;  // empty - nothing can be contained
+  grid.inv_cell_width = grid.inv_cell_height = 0;
+  if (tris->n_triangles > 0) {
+    triangleBounds(tris->triangles[0], 0, &grid.min_x, &grid.min_y,
+                   &grid.max_x, &grid.max_y);
+  }
+  for (i = 1; i < tris->n_triangles; i++) {
+    triangleBounds(tris->triangles[i], 0, &t_min_x, &t_min_y, &t_max_x, &t_max_y);
+    grid.min_x = minDouble(grid.min_x, t_min_x);
+    grid.min_y = minDouble(grid.min_y, t_min_y);
+    grid.max_x = maxDouble(grid.max_x, t_max_x);
+    grid.max_y = maxDouble(grid.max_y, t_max_y);
+  }
+  width = grid.max_x - grid.min_x;
+  height = grid.max_y - grid.min_y;
+  // pad the triangle bounds a little so that points that pass the
+  // containment test through rounding are still found in a neighbouring cell
+  pad = 1e-9 * maxDouble(width, height);
+  grid.min_x -= pad;
+  grid.min_y -= pad;
+  grid.max_x += pad;
+  grid.max_y += pad;
+  width += 2 * pad;
+  height += 2 * pad;
+  // aim for roughly one cell per triangle, split in proportion to the extent
+  if (tris->n_triangles > 1 && width > 0 && height > 0) {
+    grid.n_x = (unsigned int)ceil(sqrt(tris->n_triangles * width / height));
+    grid.n_x = grid.n_x < 1 ? 1 : (grid.n_x > 4096 ? 4096 : grid.n_x);
+    grid.n_y = (unsigned int)ceil((double)tris->n_triangles / grid.n_x);
+    grid.n_y = grid.n_y < 1 ? 1 : (grid.n_y > 4096 ? 4096 : grid.n_y);
+  }
+  if (width > 0) {
+    grid.inv_cell_width = grid.n_x / width;
+  }
+  if (height > 0) {
+    grid.inv_cell_height = grid.n_y / height;
+  }
+  n_cells = grid.n_x * grid.n_y;
+  // count the triangles overlapping each cell, then build the offsets
+  grid.cellOffsets = (unsigned int *)calloc(n_cells + 1, sizeof(unsigned int));
+  for (i = 0; i < tris->n_triangles; i++) {
+    triangleBounds(tris->triangles[i], pad, &t_min_x, &t_min_y, &t_max_x, &t_max_y);
+    x0 = gridCellX(&grid, t_min_x);
+    x1 = gridCellX(&grid, t_max_x);
+    y0 = gridCellY(&grid, t_min_y);
+    y1 = gridCellY(&grid, t_max_y);
+    for (y = y0; y <= y1; y++) {
+      for (x = x0; x <= x1; x++) {
+        grid.cellOffsets[y * grid.n_x + x + 1]++;
+      }
+    }
+  }
+  for (i = 0; i < n_cells; i++) {
+    grid.cellOffsets[i + 1] += grid.cellOffsets[i];
+  }
+  // fill the cells - triangles are visited in order, so each cell's list
+  // is sorted and the first containing triangle matches the linear scan
+  grid.cellTriangles = (unsigned int *)malloc(
+      (grid.cellOffsets[n_cells] + 1) * sizeof(unsigned int));
+  fill = (unsigned int *)malloc(n_cells * sizeof(unsigned int));
+  memcpy(fill, grid.cellOffsets, n_cells * sizeof(unsigned int));
+  for (i = 0; i < tris->n_triangles; i++) {
+    triangleBounds(tris->triangles[i], pad, &t_min_x, &t_min_y, &t_max_x, &t_max_y);
+    x0 = gridCellX(&grid, t_min_x);
+    x1 = gridCellX(&grid, t_max_x);
+    y0 = gridCellY(&grid, t_min_y);
+    y1 = gridCellY(&grid, t_max_y);
+    for (y = y0; y <= y1; y++) {
+      for (x = x0; x <= x1; x++) {
+        grid.cellTriangles[fill[y * grid.n_x + x]++] = i;
+      }
+    }
+  }
+  free(fill);
+  return grid;
+}
+
+void deleteTriangleGrid(TriangleGrid *grid)
+{
+  free(grid->cellOffsets);
+  free(grid->cellTriangles);
+}
+
+void gridContainingTriangleAndAlphaBetaForPoint(TriangleCollection *tris, TriangleGrid *grid,
+                                                Point p, int *index, double *alpha, double *beta)
+{
+  unsigned int c, t;
+  *index = -1; // no matching triangle
+  *alpha = 0;
+  *beta = 0;
+  // (this form of the test is also false for NaN coordinates)
+  if (!(p.x >= grid->min_x && p.x <= grid->max_x &&
+        p.y >= grid->min_y && p.y <= grid->max_y)) {
+    return;
+  }
+  c = gridCellY(grid, p.y) * grid->n_x + gridCellX(grid, p.x);
+  for (t = grid->cellOffsets[c]; t < grid->cellOffsets[c + 1]; t++) {
+    alphaBetaForTriangle(tris->triangles[grid->cellTriangles[t]], p, alpha, beta);
+    if (*alpha >= 0 && *beta >= 0 && *alpha + *beta <= 1.0) {
+      *index = (int)grid->cellTriangles[t];
+      return;
+    }
+  }
+}
+
+void arrayGridAlphaBetaIndexForPoints(TriangleCollection *tris, TriangleGrid *grid,
+                                      double *points, unsigned int n_points,
+                                      int *indexes, double *alphas, double *betas)
+{
+  unsigned int i;
+  for (i = 0; i < n_points; i++) {
+    Point queryPoint = initPoint(points + i * 2);
+    gridContainingTriangleAndAlphaBetaForPoint(tris, grid, queryPoint,
+                                               indexes + i, alphas + i, betas + i);
+  }
+}
+
 //
 // ----- HASHMAP -----
 //
@@ -143,7 +316,8 @@ void addAlphaBetaIndexToCache(AlphaBetaIndex **hash, Point queryPoint, int index
   HASH_ADD(hh, *hash, queryPoint, sizeof(Point), result);
 }
 
-void cachedAlphaBetaIndexForPointInTriangleCollection(AlphaBetaIndex **hash, TriangleCollection *tris, Point point,
+void cachedAlphaBetaIndexForPointInTriangleCollection(AlphaBetaIndex **hash, TriangleCollection *tris,
+                                                      TriangleGrid *grid, Point point,
                                                       int *index, double *alpha, double *beta)
 {
   // check to see if the point is in the hashmap
@@ -156,19 +330,20 @@ void cachedAlphaBetaIndexForPointInTriangleCollection(AlphaBetaIndex **hash, Tri
   } else {
     //printf("cache miss\n");
     // no entry in the cache - calculate the alpha/beta and cache it
-    containingTriangleAndAlphaBetaForPoint(tris, point, index, alpha, beta);
+    gridContainingTriangleAndAlphaBetaForPoint(tris, grid, point, index, alpha, beta);
     addAlphaBetaIndexToCache(hash, point, *index, *alpha, *beta);
   }
 }
 
-void arrayCachedAlphaBetaIndexForPoints(AlphaBetaIndex **hash, TriangleCollection *tris, double *points, unsigned int n_points,
+void arrayCachedAlphaBetaIndexForPoints(AlphaBetaIndex **hash, TriangleCollection *tris, TriangleGrid *grid,
+                                  double *points, unsigned int n_points,
                                   int *indexes, double *alphas, double *betas)
 {
   unsigned int i;
   for (i = 0; i < n_points; i++) {
     // build a point object
     Point queryPoint = initPoint(points + i * 2);
-    cachedAlphaBetaIndexForPointInTriangleCollection(hash, tris, queryPoint,
+    cachedAlphaBetaIndexForPointInTriangleCollection(hash, tris, grid, queryPoint,
                                                      indexes + i, alphas + i, betas + i);
   }
 }
@@ -33,6 +33,29 @@ void deleteTriangleCollection(TriangleCollection *tris);
 void containingTriangleAndAlphaBetaForPoint(TriangleCollection *tris, Point p,
                                            int *index, double *alpha, double *beta);
 
+// A uniform grid over the bounding box of a TriangleCollection. Each cell
+// stores (in ascending order) the indices of the triangles whose bounding
+// boxes overlap it, so only a handful of triangles have to be tested for
+// each query point. The triangles of cell c are
+// cellTriangles[cellOffsets[c]:cellOffsets[c + 1]].
+typedef struct {
+  double min_x;
+  double min_y;
+  double max_x;
+  double max_y;
+  double inv_cell_width;
+  double inv_cell_height;
+  unsigned int n_x;
+  unsigned int n_y;
+  unsigned int *cellOffsets;
+  unsigned int *cellTriangles;
+} TriangleGrid;
+
+TriangleGrid initTriangleGrid(TriangleCollection *tris);
+void deleteTriangleGrid(TriangleGrid *grid);
+void gridContainingTriangleAndAlphaBetaForPoint(TriangleCollection *tris, TriangleGrid *grid,
+                                                Point p, int *index, double *alpha, double *beta);
+
 typedef struct {
   Point queryPoint;
   double alpha;
@@ -44,14 +67,18 @@ typedef struct {
 AlphaBetaIndex* retrieveAlphaBetaFromCache(AlphaBetaIndex **hash, Point queryPoint);
 // should only be called after retrieveAlphaBetaFromCache has returned NULL
 void addAlphaBetaIndexToCache(AlphaBetaIndex **hash, Point queryPoint, int index, double alpha, double beta);
-void cachedAlphaBetaIndexForPointInTriangleCollection(AlphaBetaIndex **hash, TriangleCollection *tris, Point point,
+void cachedAlphaBetaIndexForPointInTriangleCollection(AlphaBetaIndex **hash, TriangleCollection *tris,
+                                                      TriangleGrid *grid, Point point,
                                                       int *index, double *alpha, double *beta);
 void arrayCachedAlphaBetaIndexForPoints(AlphaBetaIndex **hash, TriangleCollection *tris,
-                                  double *points, unsigned int n_points,
+                                  TriangleGrid *grid, double *points, unsigned int n_points,
                                   int *indexes, double *alphas, double *betas);
 void arrayAlphaBetaIndexForPoints(TriangleCollection *tris,
                                   double *points, unsigned int n_points,
                                   int *indexes, double *alphas, double *betas);
+void arrayGridAlphaBetaIndexForPoints(TriangleCollection *tris, TriangleGrid *grid,
+                                      double *points, unsigned int n_points,
+                                      int *indexes, double *alphas, double *betas);
 void arrayMapForPointsAndTargetPoints(AlphaBetaIndex **hash, TriangleCollection *sourceTris,
                                   TriangleCollection *targetTris, double *points, unsigned int n_points,
                                   double *mappedPoints);
@@ -2,7 +2,9 @@ import numpy as np
 from numpy.testing import assert_allclose, assert_almost_equal
 from nose.tools import raises
 
-from menpo.transform import Similarity
+from menpo.shape import PointCloud
+from menpo.transform import (Similarity, AlignmentSimilarity,
+                             batch_procrustes_alignment)
 
 
 def test_basic_2d_similarity():
@@ -82,3 +84,29 @@ def test_similarity_identity_2d():
 def test_similarity_identity_3d():
     assert_allclose(Similarity.identity(3).h_matrix,
                     np.eye(4))
+
+
+def test_batch_procrustes_alignment():
+    sources = np.random.randn(5, 10, 2)
+    target = PointCloud(np.random.randn(10, 2))
+    h_matrices = batch_procrustes_alignment(sources, target)
+    aligned = batch_procrustes_alignment(sources, target, return_aligned=True)
+    for source, h, a in zip(sources, h_matrices, aligned):
+        t = AlignmentSimilarity(PointCloud(source), target)
+        assert_allclose(h, t.h_matrix)
+        assert_allclose(a, t.aligned_source().points)
+
+
+def test_batch_procrustes_alignment_no_rotation_3d():
+    sources = [PointCloud(p) for p in np.random.randn(3, 8, 3)]
+    target = np.random.randn(8, 3)
+    h_matrices = batch_procrustes_alignment(sources, target, rotation=False)
+    for source, h in zip(sources, h_matrices):
+        t = AlignmentSimilarity(source, PointCloud(target), rotation=False)
+        assert_allclose(h, t.h_matrix)
+
+
+@raises(ValueError)
+def test_batch_procrustes_alignment_mismatched_shape():
+    batch_procrustes_alignment(np.random.randn(3, 8, 2),
+                               np.random.randn(7, 2))
@@ -537,3 +537,44 @@ def test_homogeneous_from_vector_inplace():
     e[2, 2] = 1
     h.from_vector_inplace(e.ravel())
     assert_allclose(h.h_matrix, e)
+
+
+def test_homogeneous_apply_h_matrices():
+    h_matrices = np.tile(np.eye(3), [4, 1, 1])
+    h_matrices[:, :2, :] += np.random.rand(4, 2, 3)
+    h_matrices[:, 2, :2] = np.random.rand(4, 2) * 0.1
+    points = np.random.rand(4, 10, 2)
+    batched = Homogeneous.apply_h_matrices(h_matrices, points)
+    for h, p, b in zip(h_matrices, points, batched):
+        assert_allclose(b, Homogeneous(h).apply(p))
+
+
+def test_affine_apply_h_matrices():
+    transforms = [Similarity.identity(2), Rotation.identity(2),
+                  Translation(np.array([1., 2.])), UniformScale(2., 2)]
+    points = np.random.rand(4, 10, 2)
+    batched = Affine.apply_h_matrices(transforms, points)
+    for t, p, b in zip(transforms, points, batched):
+        assert_allclose(b, t.apply(p))
+
+
+def test_apply_h_matrices_broadcasts_points():
+    h_matrices = np.tile(np.eye(4), [3, 1, 1])
+    h_matrices[:, :3, 3] = np.arange(9).reshape([3, 3])
+    points = np.random.rand(10, 3)
+    batched = Affine.apply_h_matrices(h_matrices, points)
+    assert_equal(batched.shape, (3, 10, 3))
+    for h, b in zip(h_matrices, batched):
+        assert_allclose(b, Affine(h).apply(points))
+
+
+def test_apply_batch():
+    t = Translation(np.array([1., 2.]))
+    points = np.random.rand(5, 10, 2)
+    assert_allclose(t.apply_batch(points), points + np.array([1., 2.]))
+
+
+@raises(ValueError)
+def test_apply_h_matrices_mismatched_n():
+    Affine.apply_h_matrices(np.tile(np.eye(3), [3, 1, 1]),
+                            np.random.rand(2, 4, 2))
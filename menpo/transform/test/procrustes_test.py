@@ -2,7 +2,8 @@ import numpy as np
 from numpy.testing import assert_allclose
 
 from menpo.shape import PointCloud
-from menpo.transform import GeneralizedProcrustesAnalysis
+from menpo.transform import (GeneralizedProcrustesAnalysis,
+                             BatchGeneralizedProcrustesAnalysis)
 
 
 def test_procrustes_no_target():
@@ -56,3 +57,56 @@ def test_procrustes_with_target():
     mean = np.array([[2.0, -0.5], [4.5, 1.8], [6.0, 0.5], [3.5, -1.8]])
     assert_allclose(np.around(gpa.mean_aligned_shape().points, decimals=1),
                     mean)
+
+
+def test_batch_procrustes_matches_procrustes():
+    src_1 = PointCloud(np.array([[1.0, 1.0], [1.0, -1.0],
+                                 [-1.0, -1.0], [-1.0, 1.0]]))
+    src_2 = PointCloud(np.array([[2.0, 0.0], [4.0, 2.0],
+                                 [6.0, 0.0], [4.0, -2.0]]))
+    src_3 = PointCloud(np.array([[-0.5, -1.5], [2.5, -1.5],
+                                 [2.8, -2.5], [-0.2, -2.5]]))
+    gpa = GeneralizedProcrustesAnalysis([src_1, src_2, src_3])
+    batch_gpa = BatchGeneralizedProcrustesAnalysis([src_1, src_2, src_3],
+                                                   chunk_size=2)
+    assert(batch_gpa.converged is True)
+    assert(batch_gpa.n_iterations == gpa.n_iterations)
+    assert(len(batch_gpa.target_deltas) == batch_gpa.n_iterations)
+    assert(batch_gpa._transforms is None)
+    assert_allclose(batch_gpa.initial_target_scale, gpa.initial_target_scale)
+    assert_allclose(batch_gpa.mean_alignment_error(),
+                    gpa.mean_alignment_error())
+    assert_allclose(batch_gpa.target.points, gpa.target.points)
+    for t, batch_t, h, aligned in zip(gpa.transforms, batch_gpa.transforms,
+                                      batch_gpa.h_matrices,
+                                      batch_gpa.aligned_points):
+        assert_allclose(batch_t.h_matrix, t.h_matrix)
+        assert_allclose(h, t.h_matrix)
+        assert_allclose(aligned, t.aligned_source().points)
+
+
+def test_batch_procrustes_with_target():
+    sources = np.array([[[1.0, 1.0], [1.0, -1.0], [-1.0, -1.0], [-1.0, 1.0]],
+                        [[-0.5, -1.5], [2.5, -1.5], [2.8, -2.5],
+                         [-0.2, -2.5]]])
+    src_trg = PointCloud(np.array([[2.0, 0.0], [4.0, 2.0],
+                                   [6.0, 0.0], [4.0, -2.0]]))
+    gpa = BatchGeneralizedProcrustesAnalysis(sources, target=src_trg)
+    assert(gpa.converged is True)
+    assert(gpa.n_iterations == 2)
+    assert(gpa.n_sources == 2)
+    assert(gpa.target is src_trg)
+    assert(np.round(gpa.mean_alignment_error() * 100) == 93.)
+    mean = np.array([[2.0, -0.5], [4.5, 1.8], [6.0, 0.5], [3.5, -1.8]])
+    assert_allclose(np.around(gpa.mean_aligned_shape().points, decimals=1),
+                    mean)
+
+
+def test_batch_procrustes_max_iterations():
+    sources = np.random.randn(10, 5, 2)
+    gpa = BatchGeneralizedProcrustesAnalysis(sources, tolerance=0,
+                                             max_iterations=3)
+    assert(gpa.converged is False)
+    assert(gpa.n_iterations == 4)
+    assert(len(gpa.target_deltas) == 3)
+    assert(len(gpa.alignment_errors) == 4)
@@ -1,7 +1,10 @@
+import numpy as np
 import menpo
-from numpy.testing import assert_equal
+from nose.tools import raises
+from numpy.testing import assert_equal, assert_allclose
 from menpo.transform.piecewiseaffine.base import (CythonPWA, CachedPWA,
-                                                  PythonPWA)
+                                                  TemplatePWA,
+                                                  PythonPWA, triangle_index)
 
 b = menpo.io.import_builtin_asset('breakingbad.jpg').as_masked()
 b.crop_to_landmarks_proportion_inplace(0.1)
@@ -40,3 +43,63 @@ def test_cached_pwa_forgets_cache():
     # should clear cache and be fine
     r2 = cached_pwa.apply(points)
     assert_equal(r1, r2)
+
+
+def test_template_pwa_same_as_python_pwa():
+    target = tgt.copy()
+    target.points[:3] += 1.5
+    template = TemplatePWA(src, target, template_points=points)
+    python = PythonPWA(src, target)
+    assert_equal(template.apply(points,
+                                template_token=template.template_token),
+                 python.apply(points))
+    assert_equal(template.apply(points), python.apply(points))
+
+
+def test_template_pwa_follows_target():
+    template = TemplatePWA(src, tgt)
+    token = template.set_template(points)
+    target = tgt.copy()
+    target.points[5:10] -= 2.0
+    template.set_target(target)
+    assert_equal(template.apply(points, template_token=token),
+                 PythonPWA(src, target).apply(points))
+
+
+@raises(ValueError)
+def test_template_pwa_stale_token():
+    template = TemplatePWA(src, tgt)
+    token = template.set_template(points)
+    template.set_template(points[40:60])
+    template.apply(points, template_token=token)
+
+
+def test_triangle_index_same_as_python_pwa():
+    python = PythonPWA(src, tgt)
+    index, alpha, beta = triangle_index(python.source).index_alpha_beta(
+        np.ascontiguousarray(points, dtype=np.float64))
+    p_index, p_alpha, p_beta = python.index_alpha_beta(points)
+    assert_equal(index >= 0, True)
+    # points on shared edges may be assigned to either triangle, but they
+    # must map to the same place
+    assert_allclose(python.apply(points),
+                    python.ti[index] + alpha[:, None] * python.tij[index] +
+                    beta[:, None] * python.tik[index])
+
+
+def test_triangle_index_outside_points():
+    python = PythonPWA(src, tgt)
+    outside = np.array([[-1000., -1000.], [np.nan, 0.]])
+    index, _, _ = triangle_index(python.source).index_alpha_beta(outside)
+    assert_equal(index, -1)
+
+
+def test_cython_pwa_triangle_index_is_uncached_grid():
+    from menpo.transform.piecewiseaffine.fastpwa import CTriangleIndex
+    cython = CythonPWA(src, tgt)
+    index = cython.triangle_index
+    assert type(index) is CTriangleIndex
+    assert cython.triangle_index is index
+    t_index, _, _ = index.index_alpha_beta(
+        np.ascontiguousarray(points, dtype=np.float64))
+    assert_equal(t_index, cython.index_alpha_beta(points)[0])
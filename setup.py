@@ -1,6 +1,7 @@
 import os
 import sys
 from setuptools import setup, find_packages
+from setuptools.command.build_ext import build_ext
 import versioneer
 
 
@@ -20,7 +21,8 @@ else:
                       'menpo/transform/piecewiseaffine/fastpwa.pyx',
                       'menpo/feature/windowiterator.pyx',
                       'menpo/external/skimage/_warps_cy.pyx',
-                      'menpo/image/extract_patches.pyx']
+                      'menpo/image/extract_patches.pyx',
+                      'menpo/image/rasterize.pyx']
 
     cython_exts = cythonize(cython_modules, quiet=True)
     include_dirs = [np.get_include()]
@@ -36,6 +38,24 @@ else:
     if sys.version_info.major == 2:
         install_requires.append('pathlib==1.0')
 
+# The window iterator splits its windows across threads with OpenMP, which
+# each compiler enables with its own flag (without it the loops run serially)
+openmp_modules = ['menpo.feature.windowiterator']
+openmp_flags = {'msvc': ['/openmp']}
+
+
+class OpenMPBuildExt(build_ext):
+
+    def build_extensions(self):
+        flags = openmp_flags.get(self.compiler.compiler_type, ['-fopenmp'])
+        for ext in self.extensions:
+            if ext.name in openmp_modules:
+                ext.extra_compile_args = ext.extra_compile_args + flags
+                if self.compiler.compiler_type != 'msvc':
+                    ext.extra_link_args = ext.extra_link_args + flags
+        build_ext.build_extensions(self)
+
+
 # Versioneer allows us to automatically generate versioning from
 # our git tagging system which makes releases simpler.
 versioneer.VCS = 'git'
@@ -44,9 +64,12 @@ versioneer.versionfile_build = 'menpo/_version.py'
 versioneer.tag_prefix = 'v'  # tags are like v1.2.0
 versioneer.parentdir_prefix = 'menpo-'  # dirname like 'menpo-v1.2.0'
 
+cmdclass = versioneer.get_cmdclass()
+cmdclass['build_ext'] = OpenMPBuildExt
+
 setup(name='menpo',
       version=versioneer.get_version(),
-      cmdclass=versioneer.get_cmdclass(),
+      cmdclass=cmdclass,
       description='iBUG Facial Modelling Toolkit',
       author='James Booth',
       author_email='james.booth08@imperial.ac.uk',